@@ -15,6 +15,7 @@
 
 import enum
 import hashlib
+from functools import lru_cache
 
 FAMILY_NAME = 'b4e'
 FAMILY_VERSION = '1.2'
@@ -25,9 +26,17 @@ PORTFOLIO_PREFIX = '010'
 CLASS_PREFIX = '011'
 RECORD_PREFIX = '100'
 JOB_PREFIX = '101'
+RECORD_ARCHIVE_PREFIX = '110'
+
+# old record versions are archived in chunks of this many versions
+RECORD_ARCHIVE_CHUNK_SIZE = 16
 
 ENVIRONMENT_ADDRESS = NAMESPACE + str(10 ** 64)[1:]
 
+# public keys and ids are rehashed for every address built from them,
+# bulk uploads reuse the same manager and class keys thousands of times
+HASH_CACHE_SIZE = 16384
+
 
 @enum.unique
 class AddressSpace(enum.IntEnum):
@@ -39,6 +48,7 @@ class AddressSpace(enum.IntEnum):
     ENVIRONMENT = 5
 
     JOB = 6
+    RECORD_ARCHIVE = 7
 
     OTHER_FAMILY = 100
 
@@ -47,48 +57,89 @@ def get_environment_address():
     return ENVIRONMENT_ADDRESS
 
 
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def _hash(value):
+    return hashlib.sha512(value.encode('utf-8')).hexdigest()
+
+
 def get_actor_address(public_key):
-    return NAMESPACE + ACTOR_PREFIX + hashlib.sha512(
-        public_key.encode('utf-8')).hexdigest()[:61]
+    return NAMESPACE + ACTOR_PREFIX + _hash(public_key)[:61]
 
 
 def get_voting_address(public_key):
-    return NAMESPACE + VOTING_PREFIX + hashlib.sha512(
-        public_key.encode('utf-8')).hexdigest()[:61]
+    return NAMESPACE + VOTING_PREFIX + _hash(public_key)[:61]
 
 
 def get_class_address(class_id, institution_public_key):
-    institution_prefix = hashlib.sha512(
-        institution_public_key.encode('utf-8')).hexdigest()[-10:]
-    return NAMESPACE + CLASS_PREFIX + institution_prefix + hashlib.sha512(
-        class_id.encode('utf-8')).hexdigest()[:51]
+    institution_prefix = _hash(institution_public_key)[-10:]
+    return NAMESPACE + CLASS_PREFIX + institution_prefix + _hash(class_id)[:51]
 
 
 def get_record_address(record_id, owner_public_key, manager_public_key):
-    owner_prefix = hashlib.sha512(
-        owner_public_key.encode('utf-8')).hexdigest()[-10:]
-    manager_prefix = hashlib.sha512(
-        manager_public_key.encode('utf-8')).hexdigest()[-10:]
+    owner_prefix = _hash(owner_public_key)[-10:]
+    manager_prefix = _hash(manager_public_key)[-10:]
     return NAMESPACE + RECORD_PREFIX + owner_prefix + manager_prefix \
-           + hashlib.sha512(record_id.encode('utf-8')).hexdigest()[:41]
+           + _hash(record_id)[:41]
+
+
+def get_owner_record_prefix(owner_public_key):
+    """Returns the address prefix shared by every record of an owner,
+    whoever manages it.
+    """
+    return NAMESPACE + RECORD_PREFIX + _hash(owner_public_key)[-10:]
 
 
 def get_portfolio_address(id, owner_public_key, manager_public_key):
-    owner_prefix = hashlib.sha512(
-        owner_public_key.encode('utf-8')).hexdigest()[-10:]
-    manager_prefix = hashlib.sha512(
-        manager_public_key.encode('utf-8')).hexdigest()[-20:]
+    owner_prefix = _hash(owner_public_key)[-10:]
+    manager_prefix = _hash(manager_public_key)[-20:]
     return NAMESPACE + PORTFOLIO_PREFIX + owner_prefix + manager_prefix \
-           + hashlib.sha512(id.encode('utf-8')).hexdigest()[:31]
+           + _hash(id)[:31]
 
 
 def get_job_address(job_id, company_public_key, candidate_public_key):
-    company_prefix = hashlib.sha512(
-        company_public_key.encode('utf-8')).hexdigest()[-10:]
-    candidate_prefix = hashlib.sha512(
-        candidate_public_key.encode('utf-8')).hexdigest()[-20:]
+    company_prefix = _hash(company_public_key)[-10:]
+    candidate_prefix = _hash(candidate_public_key)[-20:]
     return NAMESPACE + JOB_PREFIX + company_prefix + candidate_prefix \
-           + hashlib.sha512(job_id.encode('utf-8')).hexdigest()[:31]
+           + _hash(job_id)[:31]
+
+
+def get_record_archive_prefix(record_id, owner_public_key, manager_public_key):
+    record_address = get_record_address(record_id, owner_public_key, manager_public_key)
+    return NAMESPACE + RECORD_ARCHIVE_PREFIX + _hash(record_address)[:53]
+
+
+def get_record_archive_address(record_id, owner_public_key, manager_public_key, chunk):
+    return get_record_archive_prefix(record_id, owner_public_key, manager_public_key) \
+           + '{:08x}'.format(chunk)
+
+
+def get_actor_addresses(public_keys):
+    return [get_actor_address(public_key) for public_key in public_keys]
+
+
+def get_class_addresses(class_ids, institution_public_key):
+    prefix = NAMESPACE + CLASS_PREFIX + _hash(institution_public_key)[-10:]
+    return [prefix + _hash(class_id)[:51] for class_id in class_ids]
+
+
+def get_record_addresses(record_ids, owner_public_keys, manager_public_key):
+    """Returns the record address of each (record_id, owner_public_key)
+    pair, all managed by manager_public_key.
+    """
+    manager_prefix = _hash(manager_public_key)[-10:]
+    return [NAMESPACE + RECORD_PREFIX + _hash(owner_public_key)[-10:] + manager_prefix
+            + _hash(record_id)[:41]
+            for record_id, owner_public_key in zip(record_ids, owner_public_keys)]
+
+
+def get_portfolio_addresses(ids, owner_public_keys, manager_public_key):
+    """Returns the portfolio address of each (id, owner_public_key) pair,
+    all managed by manager_public_key.
+    """
+    manager_prefix = _hash(manager_public_key)[-20:]
+    return [NAMESPACE + PORTFOLIO_PREFIX + _hash(owner_public_key)[-10:] + manager_prefix
+            + _hash(id)[:31]
+            for id, owner_public_key in zip(ids, owner_public_keys)]
 
 
 def get_address_type(address):
@@ -110,6 +161,8 @@ def get_address_type(address):
         return AddressSpace.PORTFOLIO
     if infix == JOB_PREFIX:
         return AddressSpace.JOB
+    if infix == RECORD_ARCHIVE_PREFIX:
+        return AddressSpace.RECORD_ARCHIVE
     return AddressSpace.OTHER_FAMILY
 
 
@@ -117,8 +170,7 @@ def is_owner(record_address, owner_public_key):
     infix = record_address[6:9]
     if infix != RECORD_PREFIX:
         return False
-    if record_address[9:19] == hashlib.sha512(
-            owner_public_key.encode('utf-8')).hexdigest()[-10:]:
+    if record_address[9:19] == _hash(owner_public_key)[-10:]:
         return True
     return False
 
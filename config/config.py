@@ -9,7 +9,12 @@ class Config:
 class SawtoothConfig:
     REST_API = 'http://localhost:8008'
     VALIDATOR_TCP = 'tcp://localhost:4004'
-    MAX_BATCH_SIZE = 1000
+    # batches are packed in row order up to this many transactions and bytes
+    MAX_BATCH_SIZE = 100
+    MAX_BATCH_BYTES = 1024 * 1024
+    SUBMIT_WINDOW = 8
+    STREAM_CHUNK_SIZE = 500
+    STREAM_CHUNKS_IN_FLIGHT = 2
 
 
 class ElasticSearchConfig:
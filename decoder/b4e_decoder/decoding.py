@@ -23,12 +23,14 @@ from protobuf.b4e_protobuf.b4e_environment_pb2 import B4EEnvironmentContainer
 from protobuf.b4e_protobuf.voting_pb2 import VotingContainer
 from protobuf.b4e_protobuf.class_pb2 import ClassContainer
 from protobuf.b4e_protobuf.record_pb2 import RecordContainer
+from protobuf.b4e_protobuf.record_pb2 import RecordArchiveContainer
 from protobuf.b4e_protobuf.portfolio_pb2 import PortfolioContainer
 from protobuf.b4e_protobuf.job_pb2 import JobContainer
 
 CONTAINERS = {
     AddressSpace.ACTOR: ActorContainer,
     AddressSpace.RECORD: RecordContainer,
+    AddressSpace.RECORD_ARCHIVE: RecordArchiveContainer,
     AddressSpace.PORTFOLIO: PortfolioContainer,
     AddressSpace.CLASS: ClassContainer,
     AddressSpace.VOTING: VotingContainer,
@@ -61,6 +63,34 @@ def deserialize_data(address, data):
     return data_type, [_convert_proto_to_dict(pb) for pb in entries]
 
 
+def get_record_archive_addresses(record):
+    """Returns the archive addresses holding the versions of a decoded
+    record that are no longer kept on the record itself, oldest first.
+
+    Args:
+        record (dict): A record as returned by deserialize_data
+    """
+    archived = record.get('version_count', 0) - len(record.get('versions', []))
+    return [addresser.get_record_archive_address(record['record_id'],
+                                                 record['owner_public_key'],
+                                                 record['manager_public_key'],
+                                                 chunk)
+            for chunk in range(max(archived, 0) // addresser.RECORD_ARCHIVE_CHUNK_SIZE)]
+
+
+def merge_record_versions(record, archives):
+    """Returns the full version history of a decoded record.
+
+    Args:
+        record (dict): A record as returned by deserialize_data
+        archives (list): The decoded RecordArchive entries of the record
+    """
+    versions = []
+    for archive in sorted(archives, key=lambda archive: archive['chunk']):
+        versions.extend(archive['versions'])
+    return versions + list(record['versions'])
+
+
 def _parse_proto(proto_class, data):
     deserialized = proto_class()
     deserialized.ParseFromString(data)
@@ -0,0 +1,356 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Offline throughput benchmark for B4EHandler.
+
+Drives B4EHandler.apply against an in-memory stand-in for the validator
+context, so the handler hot paths can be measured without the validator
+stack. Run it from the repository root, next to list_ministry_public_key:
+
+    bin/b4e-tp-benchmark --institutions 4 --students 500
+"""
+
+import argparse
+import collections
+import hashlib
+import json
+import sys
+import time
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf import processor_pb2
+from sawtooth_sdk.protobuf import state_context_pb2
+from sawtooth_sdk.protobuf import transaction_pb2
+
+from addressing.b4e_addressing import addresser
+
+from protobuf.b4e_protobuf import payload_pb2
+
+from processor.b4e_tp.handler.handler import B4EHandler
+from processor.b4e_tp.payload import DATA_FIELDS
+
+CLASS_CREDIT = 3
+
+ACTION_NAMES = {value: name for name, value in payload_pb2.B4EPayload.Action.items()}
+
+
+class InMemoryContext(object):
+    """Dict-backed stand-in for sawtooth_sdk.processor.context.Context
+    which counts state calls and the bytes moved through them.
+    """
+
+    def __init__(self, store):
+        self._store = store
+        self.get_calls = 0
+        self.set_calls = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def get_state(self, addresses, timeout=None):
+        self.get_calls += 1
+        entries = []
+        for address in addresses:
+            data = self._store.get(address)
+            if data is not None:
+                self.bytes_read += len(data)
+                entries.append(state_context_pb2.TpStateEntry(address=address, data=data))
+        return entries
+
+    def set_state(self, entries, timeout=None):
+        self.set_calls += 1
+        for address, data in entries.items():
+            self.bytes_written += len(data)
+            self._store[address] = data
+        return list(entries.keys())
+
+    def delete_state(self, addresses, timeout=None):
+        for address in addresses:
+            self._store.pop(address, None)
+        return addresses
+
+    def add_receipt_data(self, data, timeout=None):
+        pass
+
+    def add_event(self, event_type, attributes=None, data=None, timeout=None):
+        pass
+
+
+class ActionStats(object):
+    def __init__(self):
+        self.count = 0
+        self.invalid = 0
+        self.seconds = 0.0
+        self.get_calls = 0
+        self.set_calls = 0
+        self.payload_bytes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+
+def _public_key(*seed):
+    return '02' + hashlib.sha256('/'.join(str(s) for s in seed).encode('utf-8')).hexdigest()
+
+
+def _ministry_public_key():
+    with open("list_ministry_public_key") as fp:
+        return fp.readline().strip()
+
+
+def _transaction(signer_public_key, action, data, timestamp):
+    payload = payload_pb2.B4EPayload(action=action, timestamp=timestamp)
+    getattr(payload, DATA_FIELDS[action]).CopyFrom(data)
+    payload_bytes = payload.SerializeToString()
+    header = transaction_pb2.TransactionHeader(
+        family_name=addresser.FAMILY_NAME,
+        family_version=addresser.FAMILY_VERSION,
+        inputs=[addresser.NAMESPACE],
+        outputs=[addresser.NAMESPACE],
+        signer_public_key=signer_public_key,
+        payload_sha512=hashlib.sha512(payload_bytes).hexdigest())
+    signature = hashlib.sha512(payload_bytes + signer_public_key.encode('utf-8')).hexdigest()
+    return processor_pb2.TpProcessRequest(header=header, payload=payload_bytes, signature=signature)
+
+
+class Workload(object):
+    """Generates the transactions of each phase of a deployment: the
+    environment, institution onboarding and voting, then per institution
+    teachers, edu programs, classes, subjects and certificates.
+    """
+
+    def __init__(self, institutions, teachers, students, classes, bulk_subjects=False):
+        self.ministry = _ministry_public_key()
+        self.institutions = [_public_key('institution', i) for i in range(institutions)]
+        self.teachers = teachers
+        self.students = students
+        self.classes = classes
+        self.bulk_subjects = bulk_subjects
+
+    def _teacher(self, institution, i):
+        return _public_key(institution, 'teacher', i)
+
+    def _student(self, institution, i):
+        return _public_key(institution, 'student', i)
+
+    def phases(self):
+        return [
+            ('environment', self.environment),
+            ('institutions', self.create_institutions),
+            ('voting', self.vote_institutions),
+            ('teachers', self.create_teachers),
+            ('edu programs', self.create_edu_programs),
+            ('classes', self.create_classes),
+            ('subjects', self.create_subjects),
+            ('certificates', self.create_certs),
+        ]
+
+    def environment(self, timestamp):
+        return [_transaction(self.ministry, payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT,
+                             payload_pb2.SetB4EEnvironmentAction(timestamp=timestamp), timestamp)]
+
+    def create_institutions(self, timestamp):
+        return [_transaction(institution, payload_pb2.B4EPayload.CREATE_INSTITUTION,
+                             payload_pb2.CreateActorAction(id='institution-%d' % i,
+                                                           data=json.dumps({'name': 'Institution %d' % i})),
+                             timestamp)
+                for i, institution in enumerate(self.institutions)]
+
+    def vote_institutions(self, timestamp):
+        return [_transaction(self.ministry, payload_pb2.B4EPayload.VOTE,
+                             payload_pb2.VoteAction(elector_public_key=institution, accept=True),
+                             timestamp)
+                for institution in self.institutions]
+
+    def create_teachers(self, timestamp):
+        return [_transaction(institution, payload_pb2.B4EPayload.CREATE_TEACHER,
+                             payload_pb2.CreateTeacherAction(id='teacher-%d' % i,
+                                                             teacher_public_key=self._teacher(institution, i),
+                                                             data=json.dumps({'name': 'Teacher %d' % i})),
+                             timestamp)
+                for institution in self.institutions
+                for i in range(self.teachers)]
+
+    def create_edu_programs(self, timestamp):
+        edu_program = json.dumps({'eduProgramId': 'edu', 'name': 'Engineer',
+                                  'totalCredit': CLASS_CREDIT * self.classes, 'minYear': 0, 'maxYear': 5})
+        return [_transaction(institution, payload_pb2.B4EPayload.CREATE_EDU_PROGRAM,
+                             payload_pb2.CreatePortfolioAction(id='edu',
+                                                               owner_public_key=self._student(institution, i),
+                                                               portfolio_type=payload_pb2.EDU_PROGRAM,
+                                                               data=edu_program),
+                             timestamp)
+                for institution in self.institutions
+                for i in range(self.students)]
+
+    def create_classes(self, timestamp):
+        return [_transaction(institution, payload_pb2.B4EPayload.CREATE_CLASS,
+                             payload_pb2.CreateClassAction(
+                                 class_id='class-%d' % c,
+                                 subject_id='subject-%d' % c,
+                                 credit=CLASS_CREDIT,
+                                 teacher_public_key=self._teacher(institution, c % self.teachers),
+                                 student_public_keys=[self._student(institution, i) for i in range(self.students)]),
+                             timestamp)
+                for institution in self.institutions
+                for c in range(self.classes)]
+
+    def create_subjects(self, timestamp):
+        if self.bulk_subjects:
+            return self.create_class_subjects(timestamp)
+        return [_transaction(self._teacher(institution, c % self.teachers), payload_pb2.B4EPayload.CREATE_SUBJECT,
+                             payload_pb2.CreateRecordAction(owner_public_key=self._student(institution, i),
+                                                            manager_public_key=institution,
+                                                            record_id='class-%d' % c,
+                                                            record_type=payload_pb2.SUBJECT,
+                                                            portfolio_id='edu',
+                                                            cipher='cipher-%d-%d' % (c, i),
+                                                            hash=hashlib.sha256(b'%d-%d' % (c, i)).hexdigest()),
+                             timestamp)
+                for institution in self.institutions
+                for c in range(self.classes)
+                for i in range(self.students)]
+
+    def create_class_subjects(self, timestamp):
+        return [_transaction(self._teacher(institution, c % self.teachers), payload_pb2.B4EPayload.CREATE_SUBJECTS,
+                             payload_pb2.CreateSubjectsAction(
+                                 manager_public_key=institution,
+                                 class_id='class-%d' % c,
+                                 subjects=[payload_pb2.CreateSubjectsAction.Subject(
+                                     owner_public_key=self._student(institution, i),
+                                     portfolio_id='edu',
+                                     cipher='cipher-%d-%d' % (c, i),
+                                     hash=hashlib.sha256(b'%d-%d' % (c, i)).hexdigest())
+                                     for i in range(self.students)]),
+                             timestamp)
+                for institution in self.institutions
+                for c in range(self.classes)]
+
+    def create_certs(self, timestamp):
+        return [_transaction(institution, payload_pb2.B4EPayload.CREATE_CERT,
+                             payload_pb2.CreateRecordAction(owner_public_key=self._student(institution, i),
+                                                            manager_public_key=institution,
+                                                            record_id='edu',
+                                                            record_type=payload_pb2.CERTIFICATE,
+                                                            portfolio_id='edu',
+                                                            cipher='cert-%d' % i,
+                                                            hash=hashlib.sha256(b'cert-%d' % i).hexdigest()),
+                             timestamp)
+                for institution in self.institutions
+                for i in range(self.students)]
+
+
+def run(workload, handler=None, store=None):
+    """Applies every phase of the workload in order and returns the
+    per-action stats, keyed by payload action.
+    """
+    handler = handler or B4EHandler()
+    store = {} if store is None else store
+    stats = collections.OrderedDict()
+    for name, phase in workload.phases():
+        # transactions are built per phase so their timestamps stay within
+        # the handler's sync tolerance however long earlier phases took
+        for transaction in phase(int(time.time())):
+            action = payload_pb2.B4EPayload.FromString(transaction.payload).action
+            action_stats = stats.setdefault(action, ActionStats())
+            context = InMemoryContext(store)
+            start = time.perf_counter()
+            try:
+                handler.apply(transaction, context)
+            except InvalidTransaction:
+                action_stats.invalid += 1
+            action_stats.seconds += time.perf_counter() - start
+            action_stats.count += 1
+            action_stats.get_calls += context.get_calls
+            action_stats.set_calls += context.set_calls
+            action_stats.payload_bytes += len(transaction.payload)
+            action_stats.bytes_read += context.bytes_read
+            action_stats.bytes_written += context.bytes_written
+    return stats
+
+
+def format_report(stats):
+    rows = [('action', 'txns', 'invalid', 'tps', 'get/txn', 'set/txn',
+             'payload B/txn', 'read B/txn', 'written B/txn')]
+    total_count = 0
+    total_seconds = 0.0
+    for action, s in stats.items():
+        total_count += s.count
+        total_seconds += s.seconds
+        rows.append((ACTION_NAMES.get(action, str(action)),
+                     str(s.count),
+                     str(s.invalid),
+                     '%.1f' % (s.count / s.seconds if s.seconds else 0),
+                     '%.2f' % (s.get_calls / s.count),
+                     '%.2f' % (s.set_calls / s.count),
+                     '%.0f' % (s.payload_bytes / s.count),
+                     '%.0f' % (s.bytes_read / s.count),
+                     '%.0f' % (s.bytes_written / s.count)))
+    rows.append(('TOTAL', str(total_count), str(sum(s.invalid for s in stats.values())),
+                 '%.1f' % (total_count / total_seconds if total_seconds else 0),
+                 '', '', '', '', ''))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(cell.rjust(width) if i else cell.ljust(width)
+                               for i, (cell, width) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawTextHelpFormatter)
+
+    parser.add_argument(
+        '--institutions',
+        type=int,
+        default=2,
+        help='Number of institutions to onboard')
+
+    parser.add_argument(
+        '--teachers',
+        type=int,
+        default=2,
+        help='Number of teachers per institution')
+
+    parser.add_argument(
+        '--students',
+        type=int,
+        default=200,
+        help='Number of students per institution')
+
+    parser.add_argument(
+        '--classes',
+        type=int,
+        default=3,
+        help='Number of classes per institution, every student attends each')
+
+    parser.add_argument(
+        '--bulk-subjects',
+        action='store_true',
+        help='Issue the grades of each class in one CREATE_SUBJECTS transaction')
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+    workload = Workload(institutions=opts.institutions,
+                        teachers=max(opts.teachers, 1),
+                        students=opts.students,
+                        classes=opts.classes,
+                        bulk_subjects=opts.bulk_subjects)
+    stats = run(workload)
+    print(format_report(stats))
+    if any(s.invalid for s in stats.values()):
+        sys.exit(1)
@@ -21,19 +21,47 @@ from addressing.b4e_addressing import addresser
 
 from protobuf.b4e_protobuf import payload_pb2
 
+from processor.b4e_tp import metrics
 from processor.b4e_tp.payload import B4EPayload
 from processor.b4e_tp.state.state import B4EState
 
 from processor.b4e_tp.handler import actor_handler, \
     class_handler, portfolio_handler, record_handler, \
     voting_handler, validator, b4e_environment_handler, \
-    company_handler, job_handler
+    company_handler, job_handler, prefetch_handler
 
 import logging
+import time
 
 SYNC_TOLERANCE = 60 * 5
 LOGGER = logging.getLogger(__name__)
 
+ACTION_HANDLERS = {
+    payload_pb2.B4EPayload.CREATE_ACTOR: actor_handler.create_actor,
+    payload_pb2.B4EPayload.CREATE_INSTITUTION: actor_handler.create_institution,
+    payload_pb2.B4EPayload.CREATE_TEACHER: actor_handler.create_teacher,
+    payload_pb2.B4EPayload.CREATE_EDU_PROGRAM: portfolio_handler.create_edu_program,
+    payload_pb2.B4EPayload.CREATE_CLASS: class_handler.create_class,
+    payload_pb2.B4EPayload.CREATE_VOTING: voting_handler.create_voting,
+    payload_pb2.B4EPayload.VOTE: voting_handler.vote,
+    payload_pb2.B4EPayload.CREATE_RECORD: record_handler.create_record,
+    payload_pb2.B4EPayload.CREATE_CERT: record_handler.create_cert,
+    payload_pb2.B4EPayload.CREATE_SUBJECT: record_handler.create_subject,
+    payload_pb2.B4EPayload.UPDATE_RECORD: record_handler.update_record,
+    payload_pb2.B4EPayload.MODIFY_SUBJECT: record_handler.modify_subject,
+    payload_pb2.B4EPayload.MODIFY_CERT: record_handler.modify_cert,
+    payload_pb2.B4EPayload.REVOKE_CERT: record_handler.revoke_cert,
+    payload_pb2.B4EPayload.REACTIVE_CERT: record_handler.reactive_cert,
+    payload_pb2.B4EPayload.UPDATE_ACTOR_PROFILE: actor_handler.update_actor_profile,
+    payload_pb2.B4EPayload.REJECT_INSTITUTION: actor_handler.reject_institution,
+    payload_pb2.B4EPayload.ACTIVE_INSTITUTION: actor_handler.active_institution,
+    payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT: b4e_environment_handler.set_b4e_environment,
+    payload_pb2.B4EPayload.CREATE_COMPANY: company_handler.create_company,
+    payload_pb2.B4EPayload.JOB_BEGIN: job_handler.job_begin,
+    payload_pb2.B4EPayload.JOB_END: job_handler.job_end,
+    payload_pb2.B4EPayload.CREATE_SUBJECTS: record_handler.create_subjects,
+}
+
 
 class B4EHandler(TransactionHandler):
 
@@ -50,143 +78,36 @@ class B4EHandler(TransactionHandler):
         return [addresser.NAMESPACE]
 
     def apply(self, transaction, context):
+        start = time.time()
+        action = None
+        try:
+            payload = B4EPayload(transaction.payload)
+            action = payload.action
+            self._apply(transaction, payload, context)
+        except InvalidTransaction:
+            metrics.observe_transaction(action, 'invalid', time.time() - start)
+            raise
+        except Exception:
+            metrics.observe_transaction(action, 'error', time.time() - start)
+            raise
+        metrics.observe_transaction(action, 'valid', time.time() - start)
+
+    def _apply(self, transaction, payload, context):
         header = transaction.header
-        payload = B4EPayload(transaction.payload)
         state = B4EState(context)
 
         validator.validate_timestamp(payload.timestamp)
 
-        if payload.action == payload_pb2.B4EPayload.CREATE_ACTOR:
-            actor_handler.create_actor(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_INSTITUTION:
-            actor_handler.create_institution(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_TEACHER:
-            actor_handler.create_teacher(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_EDU_PROGRAM:
-            portfolio_handler.create_edu_program(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_CLASS:
-            class_handler.create_class(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_VOTING:
-            voting_handler.create_voting(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.VOTE:
-            voting_handler.vote(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_RECORD:
-            record_handler.create_record(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_CERT:
-            record_handler.create_cert(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_SUBJECT:
-            record_handler.create_subject(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.UPDATE_RECORD:
-            record_handler.update_record(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.MODIFY_SUBJECT:
-            record_handler.modify_subject(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.MODIFY_CERT:
-            record_handler.modify_cert(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.REVOKE_CERT:
-            record_handler.revoke_cert(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.REACTIVE_CERT:
-            record_handler.reactive_cert(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.UPDATE_ACTOR_PROFILE:
-            actor_handler.update_actor_profile(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.REJECT_INSTITUTION:
-            actor_handler.reject_institution(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.ACTIVE_INSTITUTION:
-            actor_handler.active_institution(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT:
-            b4e_environment_handler.set_b4e_environment(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.CREATE_COMPANY:
-            company_handler.create_company(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.JOB_BEGIN:
-            job_handler.job_begin(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        elif payload.action == payload_pb2.B4EPayload.JOB_END:
-            job_handler.job_end(
-                state=state,
-                public_key=header.signer_public_key,
-                transaction_id=transaction.signature,
-                payload=payload)
-        else:
+        state.prefetch(prefetch_handler.get_read_set(
+            header.signer_public_key, payload, header.inputs))
+
+        handle = ACTION_HANDLERS.get(payload.action)
+        if handle is None:
             raise InvalidTransaction('Unhandled action')
+
+        handle(state=state,
+               public_key=header.signer_public_key,
+               transaction_id=transaction.signature,
+               payload=payload)
+
+        state.flush()
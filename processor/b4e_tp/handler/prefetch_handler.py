@@ -0,0 +1,134 @@
+from addressing.b4e_addressing import addresser
+from protobuf.b4e_protobuf import payload_pb2
+
+
+def _signer_actor(public_key, data):
+    return [addresser.get_actor_address(public_key)]
+
+
+def _create_institution(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_voting_address(public_key)]
+
+
+def _create_teacher(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_actor_address(data.teacher_public_key)]
+
+
+def _create_edu_program(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_portfolio_address(data.id, data.owner_public_key, public_key)]
+
+
+def _create_class(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_class_address(data.class_id, public_key)]
+
+
+def _create_voting(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_actor_address(data.elector_public_key),
+            addresser.get_voting_address(data.elector_public_key),
+            addresser.get_voting_address(public_key)]
+
+
+def _vote(public_key, data):
+    return [addresser.get_voting_address(data.elector_public_key),
+            addresser.get_actor_address(data.elector_public_key),
+            addresser.get_actor_address(public_key),
+            addresser.ENVIRONMENT_ADDRESS]
+
+
+def _create_record(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_record_address(data.record_id, data.owner_public_key, data.manager_public_key)]
+
+
+def _create_cert(public_key, data):
+    return _create_record(public_key, data) + [
+        addresser.get_portfolio_address(data.portfolio_id, data.owner_public_key, data.manager_public_key)]
+
+
+def _create_subject(public_key, data):
+    return _create_cert(public_key, data) + [
+        addresser.get_class_address(data.record_id, data.manager_public_key)]
+
+
+def _create_subjects(public_key, data):
+    owner_public_keys = [subject.owner_public_key for subject in data.subjects]
+    return [addresser.get_actor_address(public_key),
+            addresser.get_class_address(data.class_id, data.manager_public_key)] \
+        + addresser.get_record_addresses([data.class_id] * len(owner_public_keys),
+                                         owner_public_keys, data.manager_public_key) \
+        + addresser.get_portfolio_addresses([subject.portfolio_id for subject in data.subjects],
+                                            owner_public_keys, data.manager_public_key)
+
+
+def _modify_record(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_record_address(data.record_id, data.owner_public_key, data.manager_public_key),
+            addresser.get_class_address(data.record_id, data.manager_public_key)]
+
+
+def _change_status_cert(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_record_address(data.record_id, data.owner_public_key, public_key),
+            addresser.get_class_address(data.record_id, public_key)]
+
+
+def _environment(public_key, data):
+    return [addresser.ENVIRONMENT_ADDRESS]
+
+
+def _job(public_key, data):
+    return [addresser.get_actor_address(public_key),
+            addresser.get_job_address(data.job_id, data.company_public_key, data.candidate_public_key)]
+
+
+# addresses each action reads, as a function of the signer and payload data
+READ_SETS = {
+    payload_pb2.B4EPayload.CREATE_ACTOR: _signer_actor,
+    payload_pb2.B4EPayload.CREATE_INSTITUTION: _create_institution,
+    payload_pb2.B4EPayload.CREATE_TEACHER: _create_teacher,
+    payload_pb2.B4EPayload.CREATE_EDU_PROGRAM: _create_edu_program,
+    payload_pb2.B4EPayload.CREATE_CLASS: _create_class,
+    payload_pb2.B4EPayload.CREATE_VOTING: _create_voting,
+    payload_pb2.B4EPayload.VOTE: _vote,
+    payload_pb2.B4EPayload.CREATE_RECORD: _create_record,
+    payload_pb2.B4EPayload.CREATE_CERT: _create_cert,
+    payload_pb2.B4EPayload.CREATE_SUBJECT: _create_subject,
+    payload_pb2.B4EPayload.UPDATE_RECORD: _signer_actor,
+    payload_pb2.B4EPayload.MODIFY_SUBJECT: _modify_record,
+    payload_pb2.B4EPayload.MODIFY_CERT: _modify_record,
+    payload_pb2.B4EPayload.REVOKE_CERT: _change_status_cert,
+    payload_pb2.B4EPayload.REACTIVE_CERT: _change_status_cert,
+    payload_pb2.B4EPayload.UPDATE_ACTOR_PROFILE: _signer_actor,
+    payload_pb2.B4EPayload.REJECT_INSTITUTION: _signer_actor,
+    payload_pb2.B4EPayload.ACTIVE_INSTITUTION: _signer_actor,
+    payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT: _environment,
+    payload_pb2.B4EPayload.CREATE_COMPANY: _signer_actor,
+    payload_pb2.B4EPayload.JOB_BEGIN: _job,
+    payload_pb2.B4EPayload.JOB_END: _job,
+    payload_pb2.B4EPayload.CREATE_SUBJECTS: _create_subjects,
+}
+
+
+def get_read_set(public_key, payload, inputs):
+    """Returns the addresses the action will read, restricted to those
+    covered by the transaction inputs so the batched get_state call is
+    never rejected by the validator.
+    """
+    read_set = READ_SETS.get(payload.action)
+    if read_set is None:
+        return []
+
+    addresses = []
+    seen = set()
+    for address in read_set(public_key, payload.data):
+        if address in seen:
+            continue
+        seen.add(address)
+        if any(address.startswith(prefix) for prefix in inputs):
+            addresses.append(address)
+    return addresses
@@ -107,17 +107,57 @@ def create_subject(state, public_key, transaction_id, payload):
     if state.get_record(record_id, owner_public_key, manager_public_key):
         raise InvalidTransaction("Record has been existed")
 
-    class_ = state.get_class(payload.data.record_id, manager_public_key)
+    class_ = _get_issuer_class(state, public_key, record_id, manager_public_key)
+
+    _add_subject(state, transaction_id, payload.timestamp, class_, class_.student_public_keys,
+                 record_id, manager_public_key, payload.data)
+
+
+def create_subjects(state, public_key, transaction_id, payload):
+    actor = state.get_actor(public_key)
+    _check_is_valid_actor(actor)
+    class_id = payload.data.class_id
+    manager_public_key = payload.data.manager_public_key
+
+    class_ = _get_issuer_class(state, public_key, class_id, manager_public_key)
+
+    if not payload.data.subjects:
+        raise InvalidTransaction("No subject to create")
+
+    student_public_keys = set(class_.student_public_keys)
+    for i, subject in enumerate(payload.data.subjects):
+        try:
+            _add_subject(state, transaction_id, payload.timestamp, class_, student_public_keys,
+                         class_id, manager_public_key, subject)
+        except InvalidTransaction as e:
+            raise InvalidTransaction("Subject {} of student {}: {}".format(i, subject.owner_public_key, e))
+
+
+def _get_issuer_class(state, public_key, class_id, manager_public_key):
+    class_ = state.get_class(class_id, manager_public_key)
     if not class_:
         raise InvalidTransaction("Class doesn't exist!")
 
     if public_key != class_.teacher_public_key:
         raise InvalidTransaction("Invalid issuer for this class")
+    return class_
 
-    if owner_public_key not in class_.student_public_keys:
+
+def _add_subject(state, transaction_id, timestamp, class_, student_public_keys,
+                 record_id, manager_public_key, subject):
+    """Records the grade of one student of the class and adds the class
+    credit to the student's edu program. subject carries owner_public_key,
+    portfolio_id, cipher and hash.
+    """
+    owner_public_key = subject.owner_public_key
+
+    if state.get_record(record_id, owner_public_key, manager_public_key):
+        raise InvalidTransaction("Record has been existed")
+
+    if owner_public_key not in student_public_keys:
         raise InvalidTransaction("Invalid issuer for this student in the class")
 
-    portfolio = state.get_portfolio(id=payload.data.portfolio_id,
+    portfolio = state.get_portfolio(id=subject.portfolio_id,
                                     owner_public_key=owner_public_key,
                                     manager_public_key=manager_public_key)
     if not portfolio or not portfolio.portfolio_data[-1]:
@@ -133,16 +173,26 @@ def create_subject(state, public_key, transaction_id, payload):
         edu_program_data['currentCredit'] += class_.credit
 
     if not edu_program_data.get("startTimestamp"):
-        edu_program_data["startTimestamp"] = payload.timestamp
+        edu_program_data["startTimestamp"] = timestamp
     if not edu_program_data.get("latestTimestamp"):
-        edu_program_data["latestTimestamp"] = payload.timestamp
-    elif edu_program_data.get("latestTimestamp") < payload.timestamp:
-        edu_program_data["latestTimestamp"] = payload.timestamp
+        edu_program_data["latestTimestamp"] = timestamp
+    elif edu_program_data.get("latestTimestamp") < timestamp:
+        edu_program_data["latestTimestamp"] = timestamp
 
-    record_type = record_pb2.Record.SUBJECT
-    _create_record_with_type(state, transaction_id, payload, record_type)
+    record_data = record_pb2.Record.RecordData(portfolio_id=subject.portfolio_id,
+                                               cipher=subject.cipher,
+                                               hash=subject.hash,
+                                               record_status=record_pb2.Record.CREATED,
+                                               timestamp=timestamp,
+                                               transaction_id=transaction_id)
+    record = record_pb2.Record(owner_public_key=owner_public_key,
+                               manager_public_key=manager_public_key,
+                               record_id=record_id,
+                               record_type=record_pb2.Record.SUBJECT,
+                               versions=[record_data])
+    state.set_record(record)
 
-    state.update_portfolio_data(payload.data.portfolio_id, owner_public_key, manager_public_key,
+    state.update_portfolio_data(subject.portfolio_id, owner_public_key, manager_public_key,
                                 json.dumps(edu_program_data))
 
 
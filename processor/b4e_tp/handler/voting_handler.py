@@ -1,6 +1,7 @@
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
 from processor.b4e_tp.handler.actor_handler import _check_is_valid_actor
+from processor.b4e_tp.state.voting_state import find_voter
 from protobuf.b4e_protobuf import actor_pb2
 from protobuf.b4e_protobuf import record_pb2
 from protobuf.b4e_protobuf import payload_pb2
@@ -62,6 +63,11 @@ def _get_voting_type(i):
     return switch(i)
 
 
+def _has_voted(voting, public_key):
+    _, found = find_voter(voting.voter_index, public_key)
+    return found
+
+
 def vote(state, public_key, transaction_id, payload):
     close_vote_timestamp = 0
     voting = state.get_voting(payload.data.elector_public_key)
@@ -72,9 +78,8 @@ def vote(state, public_key, transaction_id, payload):
     if public_key == voting.elector_public_key:
         raise InvalidTransaction("You can't vote for yourself")
 
-    for vote in voting.vote:
-        if vote.issuer_public_key == public_key:
-            raise InvalidTransaction("Issuer has voted!")
+    if _has_voted(voting, public_key):
+        raise InvalidTransaction("Issuer has voted!")
 
     env = state.get_b4e_environment()
     if not env:
@@ -111,16 +116,9 @@ def vote(state, public_key, transaction_id, payload):
     if actor.role != actor_pb2.Actor.INSTITUTION:
         raise InvalidTransaction("Actor must be INSTITUTION")
 
-    election = voting.vote
-    accept = 0
-    reject = 0
+    accept = voting.accept_count
+    reject = voting.reject_count
     total = env.institution_number + 1
-    # count accept and reject voted
-    for voted in election:
-        if voted.accept:
-            accept += 1
-        else:
-            reject += 1
     # add voted
     if payload.data.accept:
         accept += 1
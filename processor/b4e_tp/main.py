@@ -14,13 +14,21 @@
 # -----------------------------------------------------------------------------
 
 import argparse
+import logging
+import multiprocessing
+import signal
 import sys
 
 from sawtooth_sdk.processor.core import TransactionProcessor
 from sawtooth_sdk.processor.log import init_console_logging
 
+from processor.b4e_tp import metrics
 from processor.b4e_tp.handler.handler import B4EHandler
 
+LOGGER = logging.getLogger(__name__)
+
+SHUTDOWN_TIMEOUT = 10
+
 
 def parse_args(args):
     parser = argparse.ArgumentParser(
@@ -37,18 +45,45 @@ def parse_args(args):
         default=0,
         help='Increase output sent to stderr')
 
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Number of transaction processor processes to start')
+
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=0,
+        help='Serve Prometheus metrics on this local port, disabled if 0.\n'
+             'With several workers, worker i uses metrics-port + i')
+
+    parser.add_argument(
+        '--metrics-host',
+        default='127.0.0.1',
+        help='Interface the metrics endpoint binds to')
+
     return parser.parse_args(args)
 
 
-def main(args=None):
-    if args is None:
-        args = sys.argv[1:]
-    opts = parse_args(args)
-    processor = None
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def start_metrics(host, port):
+    if not port:
+        return
     try:
-        init_console_logging(verbose_level=opts.verbose)
+        metrics.start_http_server(port, host)
+    except OSError as err:
+        LOGGER.warning("Could not serve metrics on %s:%s: %s", host, port, err)
 
-        processor = TransactionProcessor(url=opts.connect)
+
+def run_processor(url, metrics_host='127.0.0.1', metrics_port=0):
+    processor = None
+    start_metrics(metrics_host, metrics_port)
+    try:
+        processor = TransactionProcessor(url=url)
         handler = B4EHandler()
         processor.add_handler(handler)
         processor.start()
@@ -61,6 +96,55 @@ def main(args=None):
             processor.stop()
 
 
+def _run_worker(url, metrics_host, metrics_port):
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    run_processor(url, metrics_host, metrics_port)
+
+
+def run_workers(url, workers, metrics_host='127.0.0.1', metrics_port=0):
+    # handler modules (and the ministry key list) are already imported, so
+    # every forked worker inherits them instead of loading them again
+    context = multiprocessing.get_context('fork')
+    processes = []
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        for i in range(workers):
+            process = context.Process(target=_run_worker,
+                                      args=(url, metrics_host,
+                                            metrics_port + i if metrics_port else 0),
+                                      name='b4e-tp-{}'.format(i))
+            process.start()
+            processes.append(process)
+            LOGGER.info("Started worker %s (pid %s)", process.name, process.pid)
+
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(SHUTDOWN_TIMEOUT)
+            if process.is_alive():
+                LOGGER.warning("Worker %s did not stop, killing it", process.name)
+                process.kill()
+                process.join()
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+    init_console_logging(verbose_level=opts.verbose)
+
+    if opts.workers > 1:
+        run_workers(opts.connect, opts.workers, opts.metrics_host, opts.metrics_port)
+    else:
+        run_processor(opts.connect, opts.metrics_host, opts.metrics_port)
+
+
 if __name__ == '__main__':
     try:
 
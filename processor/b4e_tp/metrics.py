@@ -0,0 +1,205 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Processor metrics, exposed in the Prometheus text format.
+
+Each processor process keeps its own registry, so with --workers every
+worker serves its metrics on its own port.
+"""
+
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+from addressing.b4e_addressing import addresser
+
+from protobuf.b4e_protobuf import payload_pb2
+
+LOGGER = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+ACTION_NAMES = {value: name for name, value in payload_pb2.B4EPayload.Action.items()}
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, value)
+                          for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, int):
+        return str(value)
+    return repr(value)
+
+
+class Counter(object):
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def expose(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} counter'.format(self.name)]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append('{}{} {}'.format(
+                self.name, _format_labels(self.label_names, labels), _format_value(value)))
+        return lines
+
+
+class Histogram(object):
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per bucket counts (last one is +Inf), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def expose(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation),
+                 '# TYPE {} histogram'.format(self.name)]
+        with self._lock:
+            values = sorted((labels, (list(counts), total))
+                            for labels, (counts, total) in self._values.items())
+        label_names = self.label_names + ('le',)
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append('{}_bucket{} {}'.format(
+                    self.name,
+                    _format_labels(label_names, labels + (_format_value(bound),)),
+                    cumulative))
+            lines.append('{}_sum{} {}'.format(
+                self.name, _format_labels(self.label_names, labels), _format_value(total)))
+            lines.append('{}_count{} {}'.format(
+                self.name, _format_labels(self.label_names, labels), cumulative))
+        return lines
+
+
+APPLY_LATENCY = Histogram(
+    'b4e_tp_apply_seconds',
+    'Time spent in B4EHandler.apply per transaction',
+    ('action',))
+TRANSACTIONS = Counter(
+    'b4e_tp_transactions_total',
+    'Transactions applied, by action and result (valid, invalid, error)',
+    ('action', 'result'))
+STATE_CALL_LATENCY = Histogram(
+    'b4e_tp_state_call_seconds',
+    'Latency of each get_state/set_state call to the validator',
+    ('call',))
+STATE_BYTES = Counter(
+    'b4e_tp_state_bytes_total',
+    'State bytes read from and written to the validator, by address space',
+    ('direction', 'address_space'))
+
+METRICS = (APPLY_LATENCY, TRANSACTIONS, STATE_CALL_LATENCY, STATE_BYTES)
+
+
+def _action_name(action):
+    if action is None:
+        return 'UNKNOWN'
+    return ACTION_NAMES.get(action, str(action))
+
+
+def _address_space(address):
+    return addresser.get_address_type(address).name.lower()
+
+
+def observe_transaction(action, result, seconds):
+    action = _action_name(action)
+    APPLY_LATENCY.observe(seconds, (action,))
+    TRANSACTIONS.inc((action, result))
+
+
+def observe_get_state(seconds, entries):
+    STATE_CALL_LATENCY.observe(seconds, ('get_state',))
+    for entry in entries:
+        STATE_BYTES.inc(('read', _address_space(entry.address)), len(entry.data))
+
+
+def observe_set_state(seconds, entries):
+    STATE_CALL_LATENCY.observe(seconds, ('set_state',))
+    for address, data in entries.items():
+        STATE_BYTES.inc(('written', _address_space(address)), len(data))
+
+
+def expose():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.expose())
+    return '\n'.join(lines) + '\n'
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = expose().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        LOGGER.debug("metrics: " + format, *args)
+
+
+class _MetricsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start_http_server(port, host='127.0.0.1'):
+    """Serves the metrics of this process on http://host:port/metrics from
+    a daemon thread and returns the server.
+    """
+    server = _MetricsServer((host, port), _MetricsRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name='b4e-tp-metrics')
+    thread.daemon = True
+    thread.start()
+    LOGGER.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return server
@@ -18,11 +18,40 @@ from sawtooth_sdk.processor.exceptions import InvalidTransaction
 from protobuf.b4e_protobuf import payload_pb2
 
 
+# payload field carrying the data of each action
+DATA_FIELDS = {
+    payload_pb2.B4EPayload.CREATE_ACTOR: 'create_actor',
+    payload_pb2.B4EPayload.CREATE_INSTITUTION: 'create_institution',
+    payload_pb2.B4EPayload.CREATE_TEACHER: 'create_teacher',
+    payload_pb2.B4EPayload.CREATE_EDU_PROGRAM: 'create_edu_program',
+    payload_pb2.B4EPayload.CREATE_CLASS: 'create_class',
+    payload_pb2.B4EPayload.CREATE_VOTING: 'create_voting',
+    payload_pb2.B4EPayload.VOTE: 'vote',
+    payload_pb2.B4EPayload.CREATE_RECORD: 'create_record',
+    payload_pb2.B4EPayload.CREATE_CERT: 'create_cert',
+    payload_pb2.B4EPayload.CREATE_SUBJECT: 'create_subject',
+    payload_pb2.B4EPayload.UPDATE_RECORD: 'update_record',
+    payload_pb2.B4EPayload.MODIFY_SUBJECT: 'modify_subject',
+    payload_pb2.B4EPayload.MODIFY_CERT: 'modify_cert',
+    payload_pb2.B4EPayload.REVOKE_CERT: 'revoke_cert',
+    payload_pb2.B4EPayload.REACTIVE_CERT: 'reactive_cert',
+    payload_pb2.B4EPayload.UPDATE_ACTOR_PROFILE: 'update_actor_profile',
+    payload_pb2.B4EPayload.REJECT_INSTITUTION: 'reject_institution',
+    payload_pb2.B4EPayload.ACTIVE_INSTITUTION: 'active_institution',
+    payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT: 'set_b4e_environment',
+    payload_pb2.B4EPayload.CREATE_COMPANY: 'create_company',
+    payload_pb2.B4EPayload.JOB_BEGIN: 'job_begin',
+    payload_pb2.B4EPayload.JOB_END: 'job_end',
+    payload_pb2.B4EPayload.CREATE_SUBJECTS: 'create_subjects',
+}
+
+
 class B4EPayload(object):
 
     def __init__(self, payload):
         self._transaction = payload_pb2.B4EPayload()
         self._transaction.ParseFromString(payload)
+        self._data = None
 
     @property
     def action(self):
@@ -30,96 +59,12 @@ class B4EPayload(object):
 
     @property
     def data(self):
-        if self._transaction.HasField('create_actor') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_ACTOR:
-            return self._transaction.create_actor
-        if self._transaction.HasField('create_institution') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_INSTITUTION:
-            return self._transaction.create_institution
-        if self._transaction.HasField('create_teacher') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_TEACHER:
-            return self._transaction.create_teacher
-        if self._transaction.HasField('create_edu_program') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_EDU_PROGRAM:
-            return self._transaction.create_edu_program
-        if self._transaction.HasField('create_class') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_CLASS:
-            return self._transaction.create_class
-        if self._transaction.HasField('create_voting') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_VOTING:
-            return self._transaction.create_voting
-        if self._transaction.HasField('vote') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.VOTE:
-            return self._transaction.vote
-        if self._transaction.HasField('create_record') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_RECORD:
-            return self._transaction.create_record
-        if self._transaction.HasField('create_cert') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_CERT:
-            return self._transaction.create_cert
-        if self._transaction.HasField('create_subject') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_SUBJECT:
-            return self._transaction.create_subject
-        if self._transaction.HasField('update_record') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.UPDATE_RECORD:
-            return self._transaction.update_record
-        if self._transaction.HasField('modify_subject') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.MODIFY_SUBJECT:
-            return self._transaction.modify_subject
-        if self._transaction.HasField('modify_cert') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.MODIFY_CERT:
-            return self._transaction.modify_cert
-        if self._transaction.HasField('revoke_cert') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.REVOKE_CERT:
-            return self._transaction.revoke_cert
-        if self._transaction.HasField('reactive_cert') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.REACTIVE_CERT:
-            return self._transaction.reactive_cert
-        if self._transaction.HasField('update_actor_profile') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.UPDATE_ACTOR_PROFILE:
-            return self._transaction.update_actor_profile
-        if self._transaction.HasField('reject_institution') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.REJECT_INSTITUTION:
-            return self._transaction.reject_institution
-        if self._transaction.HasField('active_institution') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.ACTIVE_INSTITUTION:
-            return self._transaction.active_institution
-        if self._transaction.HasField('set_b4e_environment') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.SET_B4E_ENVIRONMENT:
-            return self._transaction.set_b4e_environment
-        if self._transaction.HasField('create_company') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.CREATE_COMPANY:
-            return self._transaction.create_company
-        if self._transaction.HasField('job_begin') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.JOB_BEGIN:
-            return self._transaction.job_begin
-        if self._transaction.HasField('job_end') and \
-                self._transaction.action == \
-                payload_pb2.B4EPayload.JOB_END:
-            return self._transaction.job_end
-
-        raise InvalidTransaction('Action does not match payload data')
+        if self._data is None:
+            field = DATA_FIELDS.get(self._transaction.action)
+            if field is None or not self._transaction.HasField(field):
+                raise InvalidTransaction('Action does not match payload data')
+            self._data = getattr(self._transaction, field)
+        return self._data
 
     @property
     def timestamp(self):
@@ -10,14 +10,10 @@ from protobuf.b4e_protobuf import voting_pb2
 def get_class(self, class_id, institution_public_key):
     try:
         address = addresser.get_class_address(class_id, institution_public_key)
-        state_entries = self._context.get_state(
-            addresses=[address], timeout=self._timeout)
-        if state_entries:
-            container = class_pb2.ClassContainer()
-            container.ParseFromString(state_entries[0].data)
-            for class_ in container.entries:
-                if class_.class_id == class_id:
-                    return class_
+        container = self._get_container(address, class_pb2.ClassContainer)
+        for class_ in container.entries:
+            if class_.class_id == class_id:
+                return class_
 
         return None
     except Exception as e:
@@ -27,16 +23,7 @@ def get_class(self, class_id, institution_public_key):
 
 def set_class(self, class_):
     class_address = addresser.get_class_address(class_.class_id, class_.institution_public_key)
-    container = class_pb2.ClassContainer()
-
-    state_entries = self._context.get_state(
-        addresses=[class_address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
+    container = self._get_container(class_address, class_pb2.ClassContainer)
 
     container.entries.extend([class_])
-    data = container.SerializeToString()
-
-    updated_state = {}
-    updated_state[class_address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    self._set_container(class_address, container)
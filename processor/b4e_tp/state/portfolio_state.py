@@ -11,15 +11,11 @@ from protobuf.b4e_protobuf import portfolio_pb2
 def get_portfolio(self, id, owner_public_key, manager_public_key):
     try:
         address = addresser.get_portfolio_address(id, owner_public_key, manager_public_key)
-        state_entries = self._context.get_state(
-            addresses=[address], timeout=self._timeout)
-        if state_entries:
-            container = portfolio_pb2.PortfolioContainer()
-            container.ParseFromString(state_entries[0].data)
-            for portfolio in container.entries:
-                if portfolio.id == id and portfolio.owner_public_key == owner_public_key \
-                        and portfolio.manager_public_key == manager_public_key:
-                    return portfolio
+        container = self._get_container(address, portfolio_pb2.PortfolioContainer)
+        for portfolio in container.entries:
+            if portfolio.id == id and portfolio.owner_public_key == owner_public_key \
+                    and portfolio.manager_public_key == manager_public_key:
+                return portfolio
 
         return None
     except Exception as e:
@@ -30,36 +26,21 @@ def get_portfolio(self, id, owner_public_key, manager_public_key):
 def create_edu_program(self, portfolio):
     address = addresser.get_portfolio_address(portfolio.id, portfolio.owner_public_key, portfolio.manager_public_key)
 
-    container = portfolio_pb2.PortfolioContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
+    container = self._get_container(address, portfolio_pb2.PortfolioContainer)
 
     container.entries.extend([portfolio])
-    data = container.SerializeToString()
-
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    self._set_container(address, container)
 
 
 def update_data(self, id, owner_public_key,
                 manager_public_key, new_data):
     address = addresser.get_portfolio_address(id, owner_public_key, manager_public_key)
-    container = portfolio_pb2.PortfolioContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
-        for portfolio in container.entries:
-            if portfolio.id == id \
-                    and portfolio.owner_public_key == owner_public_key \
-                    and portfolio.manager_public_key == manager_public_key:
-                portfolio_data = portfolio.portfolio_data[-1]
-                portfolio_data.data = new_data
-
-    data = container.SerializeToString()
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    container = self._get_container(address, portfolio_pb2.PortfolioContainer)
+    for portfolio in container.entries:
+        if portfolio.id == id \
+                and portfolio.owner_public_key == owner_public_key \
+                and portfolio.manager_public_key == manager_public_key:
+            portfolio_data = portfolio.portfolio_data[-1]
+            portfolio_data.data = new_data
+
+    self._set_container(address, container)
@@ -7,14 +7,10 @@ from protobuf.b4e_protobuf import record_pb2
 def get_record(self, record_id, owner_public_key, manager_public_key):
     try:
         address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
-        state_entries = self._context.get_state(
-            addresses=[address], timeout=self._timeout)
-        if state_entries:
-            container = record_pb2.RecordContainer()
-            container.ParseFromString(state_entries[0].data)
-            for record in container.entries:
-                if record.record_id == record_id and record.owner_public_key == owner_public_key and record.manager_public_key == manager_public_key:
-                    return record
+        container = self._get_container(address, record_pb2.RecordContainer)
+        for record in container.entries:
+            if record.record_id == record_id and record.owner_public_key == owner_public_key and record.manager_public_key == manager_public_key:
+                return record
 
         return None
     except Exception as e:
@@ -25,99 +21,100 @@ def get_record(self, record_id, owner_public_key, manager_public_key):
 def set_record(self, record):
     address = addresser.get_record_address(record.record_id, record.owner_public_key, record.manager_public_key)
 
-    container = record_pb2.RecordContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
+    container = self._get_container(address, record_pb2.RecordContainer)
 
+    record.version_count = len(record.versions)
     container.entries.extend([record])
-    data = container.SerializeToString()
-
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    self._set_container(address, container)
+
+
+def _append_version(self, record, new_data):
+    """Appends new_data to the record and moves full chunks of older
+    versions to the record archive, so the record keeps at most
+    RECORD_ARCHIVE_CHUNK_SIZE versions however often it is updated.
+    """
+    chunk_size = addresser.RECORD_ARCHIVE_CHUNK_SIZE
+    if record.version_count < len(record.versions):
+        # record written before version_count existed
+        record.version_count = len(record.versions)
+
+    record.versions.extend([new_data])
+    record.version_count += 1
+
+    archived = record.version_count - len(record.versions)
+    while len(record.versions) > chunk_size:
+        chunk = archived // chunk_size
+        archive = record_pb2.RecordArchive(owner_public_key=record.owner_public_key,
+                                           manager_public_key=record.manager_public_key,
+                                           record_id=record.record_id,
+                                           chunk=chunk,
+                                           versions=record.versions[:chunk_size])
+        address = addresser.get_record_archive_address(record.record_id, record.owner_public_key,
+                                                       record.manager_public_key, chunk)
+        # each chunk is written once, when it is full, so it is never read back
+        self._set_container(address, record_pb2.RecordArchiveContainer(entries=[archive]))
+        del record.versions[:chunk_size]
+        archived += chunk_size
 
 
 def update_record(self, record_id, owner_public_key,
                   manager_public_key, cipher, hash_data,
                   status, timestamp, transaction_id):
     address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
-    container = record_pb2.RecordContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
-        for record in container.entries:
-            if record.record_id == record_id:
-                pre_data = record.versions[-1]
-                new_data = record_pb2.Record.RecordData(
-                    protfolio_id=pre_data.portfolio,
-                    cipher=cipher,
-                    hash=hash_data,
-                    record_status=status,
-                    timestamp=timestamp,
-                    transaction_id=transaction_id
-                )
-                record.versions.extend([new_data])
-
-    data = container.SerializeToString()
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    container = self._get_container(address, record_pb2.RecordContainer)
+    for record in container.entries:
+        if record.record_id == record_id:
+            pre_data = record.versions[-1]
+            new_data = record_pb2.Record.RecordData(
+                portfolio_id=pre_data.portfolio_id,
+                cipher=cipher,
+                hash=hash_data,
+                record_status=status,
+                timestamp=timestamp,
+                transaction_id=transaction_id
+            )
+            _append_version(self, record, new_data)
+
+    self._set_container(address, container)
 
 
 def modify_record(self, record_id, owner_public_key,
                   manager_public_key, cipher, hash_data,
                   timestamp, transaction_id):
     address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
-    container = record_pb2.RecordContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
-        for record in container.entries:
-            if record.record_id == record_id:
-                pre_data = record.versions[-1]
-                new_data = record_pb2.Record.RecordData(
-                    portfolio_id=pre_data.portfolio_id,
-                    cipher=cipher,
-                    hash=hash_data,
-                    record_status=pre_data.record_status,
-                    timestamp=timestamp,
-                    transaction_id=transaction_id
-                )
-                record.versions.extend([new_data])
-
-    data = container.SerializeToString()
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    container = self._get_container(address, record_pb2.RecordContainer)
+    for record in container.entries:
+        if record.record_id == record_id:
+            pre_data = record.versions[-1]
+            new_data = record_pb2.Record.RecordData(
+                portfolio_id=pre_data.portfolio_id,
+                cipher=cipher,
+                hash=hash_data,
+                record_status=pre_data.record_status,
+                timestamp=timestamp,
+                transaction_id=transaction_id
+            )
+            _append_version(self, record, new_data)
+
+    self._set_container(address, container)
 
 
 def update_status(self, record_id, owner_public_key,
                   manager_public_key, record_status,
                   timestamp, transaction_id):
     address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
-    container = record_pb2.RecordContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
-        for record in container.entries:
-            if record.record_id == record_id:
-                pre_data = record.versions[-1]
-                new_data = record_pb2.Record.RecordData(
-                    portfolio_id=pre_data.portfolio_id,
-                    cipher=pre_data.cipher,
-                    hash=pre_data.hash,
-                    record_status=record_status,
-                    timestamp=timestamp,
-                    transaction_id=transaction_id
-                )
-                record.versions.extend([new_data])
-
-    data = container.SerializeToString()
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    container = self._get_container(address, record_pb2.RecordContainer)
+    for record in container.entries:
+        if record.record_id == record_id:
+            pre_data = record.versions[-1]
+            new_data = record_pb2.Record.RecordData(
+                portfolio_id=pre_data.portfolio_id,
+                cipher=pre_data.cipher,
+                hash=pre_data.hash,
+                record_status=record_status,
+                timestamp=timestamp,
+                transaction_id=transaction_id
+            )
+            _append_version(self, record, new_data)
+
+    self._set_container(address, container)
@@ -14,20 +14,108 @@
 # -----------------------------------------------------------------------------
 
 
+from addressing.b4e_addressing import addresser
+
+from protobuf.b4e_protobuf import actor_pb2
+from protobuf.b4e_protobuf import b4e_environment_pb2
+from protobuf.b4e_protobuf import class_pb2
+from protobuf.b4e_protobuf import job_pb2
+from protobuf.b4e_protobuf import portfolio_pb2
+from protobuf.b4e_protobuf import record_pb2
+from protobuf.b4e_protobuf import voting_pb2
+
 from processor.b4e_tp.state import b4e_environment_state, \
     actor_state, class_state, record_state, voting_state, \
     portfolio_state, \
     job_state
 
+from processor.b4e_tp import metrics
+
 import logging
+import time
 
 LOGGER = logging.getLogger(__name__)
 
+CONTAINER_TYPES = {
+    addresser.AddressSpace.ACTOR: actor_pb2.ActorContainer,
+    addresser.AddressSpace.VOTING: voting_pb2.VotingContainer,
+    addresser.AddressSpace.PORTFOLIO: portfolio_pb2.PortfolioContainer,
+    addresser.AddressSpace.CLASS: class_pb2.ClassContainer,
+    addresser.AddressSpace.RECORD: record_pb2.RecordContainer,
+    addresser.AddressSpace.RECORD_ARCHIVE: record_pb2.RecordArchiveContainer,
+    addresser.AddressSpace.ENVIRONMENT: b4e_environment_pb2.B4EEnvironmentContainer,
+    addresser.AddressSpace.JOB: job_pb2.JobContainer,
+}
+
 
 class B4EState(object):
     def __init__(self, context, timeout=10):
         self._context = context
         self._timeout = timeout
+        # parsed containers keyed by address, kept for one apply()
+        self._containers = {}
+        self._dirty = set()
+
+    def _get_container(self, address, container_type):
+        """Returns the parsed container stored at address, fetching it from
+        the validator only the first time it is requested in this apply.
+        """
+        container = self._containers.get(address)
+        if container is None:
+            container = container_type()
+            state_entries = self._get_state([address])
+            if state_entries:
+                container.ParseFromString(state_entries[0].data)
+            self._containers[address] = container
+        return container
+
+    def prefetch(self, addresses):
+        """Loads every address not cached yet with one batched get_state
+        call. Addresses without state are cached as empty containers.
+        """
+        addresses = [address for address in addresses
+                     if address not in self._containers]
+        if not addresses:
+            return
+
+        state_entries = self._get_state(addresses)
+        data = {}
+        for entry in state_entries:
+            data[entry.address] = entry.data
+
+        for address in addresses:
+            container = CONTAINER_TYPES[addresser.get_address_type(address)]()
+            if address in data:
+                container.ParseFromString(data[address])
+            self._containers[address] = container
+
+    def _set_container(self, address, container):
+        self._containers[address] = container
+        self._dirty.add(address)
+
+    def flush(self):
+        """Writes every container modified during this apply in a single
+        set_state call.
+        """
+        if not self._dirty:
+            return
+        updated_state = {}
+        for address in self._dirty:
+            updated_state[address] = self._containers[address].SerializeToString()
+        self._set_state(updated_state)
+        self._dirty.clear()
+
+    def _get_state(self, addresses):
+        start = time.time()
+        state_entries = self._context.get_state(
+            addresses=addresses, timeout=self._timeout)
+        metrics.observe_get_state(time.time() - start, state_entries)
+        return state_entries
+
+    def _set_state(self, entries):
+        start = time.time()
+        self._context.set_state(entries, timeout=self._timeout)
+        metrics.observe_set_state(time.time() - start, entries)
 
     def get_b4e_environment(self):
         return b4e_environment_state.get(self)
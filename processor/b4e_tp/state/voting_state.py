@@ -1,3 +1,5 @@
+import hashlib
+
 from addressing.b4e_addressing import addresser
 
 from protobuf.b4e_protobuf import actor_pb2
@@ -7,21 +9,62 @@ from protobuf.b4e_protobuf import class_pb2
 from protobuf.b4e_protobuf import voting_pb2
 
 
+# bytes of the sha512 of an issuer public key kept per voter in Voting.voter_index
+VOTER_HASH_SIZE = 8
+
+
+def voter_hash(public_key):
+    return hashlib.sha512(public_key.encode('utf-8')).digest()[:VOTER_HASH_SIZE]
+
+
+def find_voter(voter_index, public_key):
+    """Returns (offset, found) of the hash of public_key in the sorted
+    voter index, offset being where it is or would be inserted.
+    """
+    key = voter_hash(public_key)
+    low, high = 0, len(voter_index) // VOTER_HASH_SIZE
+    while low < high:
+        middle = (low + high) // 2
+        if voter_index[middle * VOTER_HASH_SIZE:(middle + 1) * VOTER_HASH_SIZE] < key:
+            low = middle + 1
+        else:
+            high = middle
+    offset = low * VOTER_HASH_SIZE
+    return offset, voter_index[offset:offset + VOTER_HASH_SIZE] == key
+
+
+def _ensure_tally(voting):
+    """Fills the vote counters and sorted voter index of a voting written
+    before they existed, so they always agree with voting.vote.
+    """
+    if len(voting.voter_index) == len(voting.vote) * VOTER_HASH_SIZE:
+        return
+    # drops the voter key list written by earlier versions
+    voting.DiscardUnknownFields()
+    voting.accept_count = 0
+    voting.reject_count = 0
+    voting.voter_index = b''.join(sorted(voter_hash(vote.issuer_public_key) for vote in voting.vote))
+    for vote in voting.vote:
+        if vote.accept:
+            voting.accept_count += 1
+        else:
+            voting.reject_count += 1
+
+
 def get_voting(self, public_key):
     try:
         address = addresser.get_voting_address(public_key)
-        state_entries = self._context.get_state(
-            addresses=[address], timeout=self._timeout)
         latest_voting = None
         timestamp = -1
-        if state_entries:
-            container = voting_pb2.VotingContainer()
-            container.ParseFromString(state_entries[0].data)
-            for voting in container.entries:
-                if voting.elector_public_key == public_key:
-                    if voting.timestamp > timestamp:
-                        latest_voting = voting
-                        timestamp = voting.timestamp
+        container = self._get_container(address, voting_pb2.VotingContainer)
+        for voting in container.entries:
+            if voting.elector_public_key == public_key:
+                if voting.timestamp > timestamp:
+                    latest_voting = voting
+                    timestamp = voting.timestamp
+
+        if latest_voting is not None:
+            _ensure_tally(latest_voting)
 
         return latest_voting
     except Exception as e:
@@ -31,34 +74,27 @@ def get_voting(self, public_key):
 
 def set_voting(self, voting, public_key):
     voting_address = addresser.get_voting_address(public_key)
-    container = voting_pb2.VotingContainer()
-    state_entries = self._context.get_state(
-        addresses=[voting_address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
+    container = self._get_container(voting_address, voting_pb2.VotingContainer)
 
     container.entries.extend([voting])
-    data = container.SerializeToString()
-
-    updated_state = {}
-    updated_state[voting_address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    self._set_container(voting_address, container)
 
 
 def update_voting(self, elector_public_key, vote_result, vote, timestamp):
     address = addresser.get_voting_address(elector_public_key)
-    container = voting_pb2.VotingContainer()
-    state_entries = self._context.get_state(
-        addresses=[address], timeout=self._timeout)
-    if state_entries:
-        container.ParseFromString(state_entries[0].data)
-        for voting in container.entries:
-            if voting.elector_public_key == elector_public_key:
-                voting.vote.extend([vote])
-                voting.close_vote_timestamp = timestamp
-                voting.vote_result = vote_result
-
-    data = container.SerializeToString()
-    updated_state = {}
-    updated_state[address] = data
-    self._context.set_state(updated_state, timeout=self._timeout)
+    container = self._get_container(address, voting_pb2.VotingContainer)
+    for voting in container.entries:
+        if voting.elector_public_key == elector_public_key:
+            _ensure_tally(voting)
+            voting.vote.extend([vote])
+            if vote.accept:
+                voting.accept_count += 1
+            else:
+                voting.reject_count += 1
+            offset, _ = find_voter(voting.voter_index, vote.issuer_public_key)
+            voting.voter_index = (voting.voter_index[:offset] + voter_hash(vote.issuer_public_key)
+                                  + voting.voter_index[offset:])
+            voting.close_vote_timestamp = timestamp
+            voting.vote_result = vote_result
+
+    self._set_container(address, container)
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x1a\x62\x34\x65_protobuf/payload.proto\"\xd7\x0b\n\nB4EPayload\x12\"\n\x06\x61\x63tion\x18\x01 \x01(\x0e\x32\x12.B4EPayload.Action\x12(\n\x0c\x63reate_actor\x18\x02 \x01(\x0b\x32\x12.CreateActorAction\x12.\n\x12\x63reate_institution\x18\x03 \x01(\x0b\x32\x12.CreateActorAction\x12,\n\x0e\x63reate_teacher\x18\x04 \x01(\x0b\x32\x14.CreateTeacherAction\x12\x32\n\x12\x63reate_edu_program\x18\x05 \x01(\x0b\x32\x16.CreatePortfolioAction\x12(\n\x0c\x63reate_class\x18\x06 \x01(\x0b\x32\x12.CreateClassAction\x12*\n\rcreate_voting\x18\x07 \x01(\x0b\x32\x13.CreateVotingAction\x12\x19\n\x04vote\x18\x08 \x01(\x0b\x32\x0b.VoteAction\x12*\n\rcreate_record\x18\t \x01(\x0b\x32\x13.CreateRecordAction\x12(\n\x0b\x63reate_cert\x18\n \x01(\x0b\x32\x13.CreateRecordAction\x12+\n\x0e\x63reate_subject\x18\x0b \x01(\x0b\x32\x13.CreateRecordAction\x12*\n\rupdate_record\x18\x0c \x01(\x0b\x32\x13.UpdateRecordAction\x12+\n\x0emodify_subject\x18\r \x01(\x0b\x32\x13.ModifyRecordAction\x12(\n\x0bmodify_cert\x18\x0e \x01(\x0b\x32\x13.ModifyRecordAction\x12,\n\x0brevoke_cert\x18\x0f \x01(\x0b\x32\x17.ChangeStatusCertAction\x12.\n\rreactive_cert\x18\x10 \x01(\x0b\x32\x17.ChangeStatusCertAction\x12\x37\n\x14update_actor_profile\x18\x11 \x01(\x0b\x32\x19.UpdateActorProfileAction\x12\x34\n\x12reject_institution\x18\x12 \x01(\x0b\x32\x18.RejectInstitutionAction\x12\x34\n\x12\x61\x63tive_institution\x18\x13 \x01(\x0b\x32\x18.ActiveInstitutionAction\x12\x35\n\x13set_b4e_environment\x18\x14 \x01(\x0b\x32\x18.SetB4EEnvironmentAction\x12*\n\x0e\x63reate_company\x18\x16 \x01(\x0b\x32\x12.CreateActorAction\x12\"\n\tjob_begin\x18\x17 \x01(\x0b\x32\x0f.JobBeginAction\x12\x1e\n\x07job_end\x18\x18 \x01(\x0b\x32\r.JobEndAction\x12\x11\n\ttimestamp\x18\x15 \x01(\x04\"\xb4\x03\n\x06\x41\x63tion\x12\x10\n\x0c\x43REATE_ACTOR\x10\x00\x12\x16\n\x12\x43REATE_INSTITUTION\x10\x01\x12\x12\n\x0e\x43REATE_TEACHER\x10\x02\x12\x16\n\x12\x43REATE_EDU_PROGRAM\x10\x03\x12\x10\n\x0c\x43REATE_CLASS\x10\x04\x12\x11\n\rCREATE_VOTING\x10\x05\x12\x08\n\x04VOTE\x10\x06\x12\x11\n\rCREATE_RECORD\x10\x07\x12\x0f\n\x0b\x43REATE_CERT\x10\x08\x12\x12\n\x0e\x43REATE_SUBJECT\x10\t\x12\x11\n\rUPDATE_RECORD\x10\n\x12\x12\n\x0eMODIFY_SUBJECT\x10\x0b\x12\x0f\n\x0bMODIFY_CERT\x10\x0c\x12\x0f\n\x0bREVOKE_CERT\x10\r\x12\x11\n\rREACTIVE_CERT\x10\x0e\x12\x18\n\x14UPDATE_ACTOR_PROFILE\x10\x0f\x12\x16\n\x12REJECT_INSTITUTION\x10\x10\x12\x16\n\x12\x41\x43TIVE_INSTITUTION\x10\x11\x12\x12\n\x0e\x43REATE_COMPANY\x10\x13\x12\r\n\tJOB_BEGIN\x10\x14\x12\x0b\n\x07JOB_END\x10\x15\x12\x17\n\x13SET_B4E_ENVIRONMENT\x10\x12\"-\n\x11\x43reateActorAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"K\n\x13\x43reateTeacherAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1a\n\x12teacher_public_key\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"s\n\x15\x43reatePortfolioAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x18\n\x10owner_public_key\x18\x02 \x01(\t\x12&\n\x0eportfolio_type\x18\x03 \x01(\x0e\x32\x0e.PortfolioType\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\"\x82\x01\n\x11\x43reateClassAction\x12\x10\n\x08\x63lass_id\x18\x01 \x01(\t\x12\x12\n\nsubject_id\x18\x02 \x01(\t\x12\x0e\n\x06\x63redit\x18\x03 \x01(\x05\x12\x1a\n\x12teacher_public_key\x18\x04 \x01(\t\x12\x1b\n\x13student_public_keys\x18\x05 \x03(\t\"N\n\x12\x43reateVotingAction\x12\x1a\n\x12\x65lector_public_key\x18\x01 \x01(\t\x12\x1c\n\tvote_type\x18\x02 \x01(\x0e\x32\t.VoteType\"8\n\nVoteAction\x12\x1a\n\x12\x65lector_public_key\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63\x63\x65pt\x18\x02 \x01(\x08\"\xb3\x01\n\x12\x43reateRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12 \n\x0brecord_type\x18\x04 \x01(\x0e\x32\x0b.RecordType\x12\x14\n\x0cportfolio_id\x18\x05 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x06 \x01(\t\x12\x0c\n\x04hash\x18\x07 \x01(\t\"\x85\x01\n\x12UpdateRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\x12$\n\rrecord_status\x18\x06 \x01(\x0e\x32\r.RecordStatus\"{\n\x12ModifyRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\"E\n\x16\x43hangeStatusCertAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\t\"(\n\x18UpdateActorProfileAction\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\"9\n\x17RejectInstitutionAction\x12\x1e\n\x16institution_public_key\x18\x01 \x01(\t\"9\n\x17\x41\x63tiveInstitutionAction\x12\x1e\n\x16institution_public_key\x18\x01 \x01(\t\",\n\x17SetB4EEnvironmentAction\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\"x\n\x0eJobBeginAction\x12\x1a\n\x12\x63ompany_public_key\x18\x01 \x01(\t\x12\x1c\n\x14\x63\x61ndidate_public_key\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\"X\n\x0cJobEndAction\x12\x1a\n\x12\x63ompany_public_key\x18\x01 \x01(\t\x12\x1c\n\x14\x63\x61ndidate_public_key\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t* \n\rPortfolioType\x12\x0f\n\x0b\x45\x44U_PROGRAM\x10\x00*\"\n\x08VoteType\x12\n\n\x06\x41\x43TIVE\x10\x00\x12\n\n\x06REJECT\x10\x01*5\n\nRecordType\x12\x0b\n\x07SUBJECT\x10\x00\x12\x0f\n\x0b\x43\x45RTIFICATE\x10\x01\x12\t\n\x05OTHER\x10\x02*9\n\x0cRecordStatus\x12\x0b\n\x07\x43REATED\x10\x00\x12\x0b\n\x07REVOKED\x10\x01\x12\x0f\n\x0bREACTIVATED\x10\x02\x62\x06proto3')
+  serialized_pb=_b('\n\x1a\x62\x34\x65_protobuf/payload.proto\"\x9c\x0c\n\nB4EPayload\x12\"\n\x06\x61\x63tion\x18\x01 \x01(\x0e\x32\x12.B4EPayload.Action\x12(\n\x0c\x63reate_actor\x18\x02 \x01(\x0b\x32\x12.CreateActorAction\x12.\n\x12\x63reate_institution\x18\x03 \x01(\x0b\x32\x12.CreateActorAction\x12,\n\x0e\x63reate_teacher\x18\x04 \x01(\x0b\x32\x14.CreateTeacherAction\x12\x32\n\x12\x63reate_edu_program\x18\x05 \x01(\x0b\x32\x16.CreatePortfolioAction\x12(\n\x0c\x63reate_class\x18\x06 \x01(\x0b\x32\x12.CreateClassAction\x12*\n\rcreate_voting\x18\x07 \x01(\x0b\x32\x13.CreateVotingAction\x12\x19\n\x04vote\x18\x08 \x01(\x0b\x32\x0b.VoteAction\x12*\n\rcreate_record\x18\t \x01(\x0b\x32\x13.CreateRecordAction\x12(\n\x0b\x63reate_cert\x18\n \x01(\x0b\x32\x13.CreateRecordAction\x12+\n\x0e\x63reate_subject\x18\x0b \x01(\x0b\x32\x13.CreateRecordAction\x12*\n\rupdate_record\x18\x0c \x01(\x0b\x32\x13.UpdateRecordAction\x12+\n\x0emodify_subject\x18\r \x01(\x0b\x32\x13.ModifyRecordAction\x12(\n\x0bmodify_cert\x18\x0e \x01(\x0b\x32\x13.ModifyRecordAction\x12,\n\x0brevoke_cert\x18\x0f \x01(\x0b\x32\x17.ChangeStatusCertAction\x12.\n\rreactive_cert\x18\x10 \x01(\x0b\x32\x17.ChangeStatusCertAction\x12\x37\n\x14update_actor_profile\x18\x11 \x01(\x0b\x32\x19.UpdateActorProfileAction\x12\x34\n\x12reject_institution\x18\x12 \x01(\x0b\x32\x18.RejectInstitutionAction\x12\x34\n\x12\x61\x63tive_institution\x18\x13 \x01(\x0b\x32\x18.ActiveInstitutionAction\x12\x35\n\x13set_b4e_environment\x18\x14 \x01(\x0b\x32\x18.SetB4EEnvironmentAction\x12*\n\x0e\x63reate_company\x18\x16 \x01(\x0b\x32\x12.CreateActorAction\x12\"\n\tjob_begin\x18\x17 \x01(\x0b\x32\x0f.JobBeginAction\x12\x1e\n\x07job_end\x18\x18 \x01(\x0b\x32\r.JobEndAction\x12.\n\x0f\x63reate_subjects\x18\x19 \x01(\x0b\x32\x15.CreateSubjectsAction\x12\x11\n\ttimestamp\x18\x15 \x01(\x04\"\xc9\x03\n\x06\x41\x63tion\x12\x10\n\x0c\x43REATE_ACTOR\x10\x00\x12\x16\n\x12\x43REATE_INSTITUTION\x10\x01\x12\x12\n\x0e\x43REATE_TEACHER\x10\x02\x12\x16\n\x12\x43REATE_EDU_PROGRAM\x10\x03\x12\x10\n\x0c\x43REATE_CLASS\x10\x04\x12\x11\n\rCREATE_VOTING\x10\x05\x12\x08\n\x04VOTE\x10\x06\x12\x11\n\rCREATE_RECORD\x10\x07\x12\x0f\n\x0b\x43REATE_CERT\x10\x08\x12\x12\n\x0e\x43REATE_SUBJECT\x10\t\x12\x11\n\rUPDATE_RECORD\x10\n\x12\x12\n\x0eMODIFY_SUBJECT\x10\x0b\x12\x0f\n\x0bMODIFY_CERT\x10\x0c\x12\x0f\n\x0bREVOKE_CERT\x10\r\x12\x11\n\rREACTIVE_CERT\x10\x0e\x12\x18\n\x14UPDATE_ACTOR_PROFILE\x10\x0f\x12\x16\n\x12REJECT_INSTITUTION\x10\x10\x12\x16\n\x12\x41\x43TIVE_INSTITUTION\x10\x11\x12\x12\n\x0e\x43REATE_COMPANY\x10\x13\x12\r\n\tJOB_BEGIN\x10\x14\x12\x0b\n\x07JOB_END\x10\x15\x12\x13\n\x0f\x43REATE_SUBJECTS\x10\x16\x12\x17\n\x13SET_B4E_ENVIRONMENT\x10\x12\"-\n\x11\x43reateActorAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x02 \x01(\t\"K\n\x13\x43reateTeacherAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1a\n\x12teacher_public_key\x18\x02 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\t\"s\n\x15\x43reatePortfolioAction\x12\n\n\x02id\x18\x01 \x01(\t\x12\x18\n\x10owner_public_key\x18\x02 \x01(\t\x12&\n\x0eportfolio_type\x18\x03 \x01(\x0e\x32\x0e.PortfolioType\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\t\"\x82\x01\n\x11\x43reateClassAction\x12\x10\n\x08\x63lass_id\x18\x01 \x01(\t\x12\x12\n\nsubject_id\x18\x02 \x01(\t\x12\x0e\n\x06\x63redit\x18\x03 \x01(\x05\x12\x1a\n\x12teacher_public_key\x18\x04 \x01(\t\x12\x1b\n\x13student_public_keys\x18\x05 \x03(\t\"N\n\x12\x43reateVotingAction\x12\x1a\n\x12\x65lector_public_key\x18\x01 \x01(\t\x12\x1c\n\tvote_type\x18\x02 \x01(\x0e\x32\t.VoteType\"8\n\nVoteAction\x12\x1a\n\x12\x65lector_public_key\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63\x63\x65pt\x18\x02 \x01(\x08\"\xb3\x01\n\x12\x43reateRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12 \n\x0brecord_type\x18\x04 \x01(\x0e\x32\x0b.RecordType\x12\x14\n\x0cportfolio_id\x18\x05 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x06 \x01(\t\x12\x0c\n\x04hash\x18\x07 \x01(\t\"\xce\x01\n\x14\x43reateSubjectsAction\x12\x1a\n\x12manager_public_key\x18\x01 \x01(\t\x12\x10\n\x08\x63lass_id\x18\x02 \x01(\t\x12/\n\x08subjects\x18\x03 \x03(\x0b\x32\x1d.CreateSubjectsAction.Subject\x1aW\n\x07Subject\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x14\n\x0cportfolio_id\x18\x02 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x03 \x01(\t\x12\x0c\n\x04hash\x18\x04 \x01(\t\"\x85\x01\n\x12UpdateRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\x12$\n\rrecord_status\x18\x06 \x01(\x0e\x32\r.RecordStatus\"{\n\x12ModifyRecordAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\"E\n\x16\x43hangeStatusCertAction\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x11\n\trecord_id\x18\x02 \x01(\t\"(\n\x18UpdateActorProfileAction\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\t\"9\n\x17RejectInstitutionAction\x12\x1e\n\x16institution_public_key\x18\x01 \x01(\t\"9\n\x17\x41\x63tiveInstitutionAction\x12\x1e\n\x16institution_public_key\x18\x01 \x01(\t\",\n\x17SetB4EEnvironmentAction\x12\x11\n\ttimestamp\x18\x01 \x01(\x04\"x\n\x0eJobBeginAction\x12\x1a\n\x12\x63ompany_public_key\x18\x01 \x01(\t\x12\x1c\n\x14\x63\x61ndidate_public_key\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x04 \x01(\t\x12\x0c\n\x04hash\x18\x05 \x01(\t\"X\n\x0cJobEndAction\x12\x1a\n\x12\x63ompany_public_key\x18\x01 \x01(\t\x12\x1c\n\x14\x63\x61ndidate_public_key\x18\x02 \x01(\t\x12\x0e\n\x06job_id\x18\x03 \x01(\t* \n\rPortfolioType\x12\x0f\n\x0b\x45\x44U_PROGRAM\x10\x00*\"\n\x08VoteType\x12\n\n\x06\x41\x43TIVE\x10\x00\x12\n\n\x06REJECT\x10\x01*5\n\nRecordType\x12\x0b\n\x07SUBJECT\x10\x00\x12\x0f\n\x0b\x43\x45RTIFICATE\x10\x01\x12\t\n\x05OTHER\x10\x02*9\n\x0cRecordStatus\x12\x0b\n\x07\x43REATED\x10\x00\x12\x0b\n\x07REVOKED\x10\x01\x12\x0f\n\x0bREACTIVATED\x10\x02\x62\x06proto3')
 )
 
 _PORTFOLIOTYPE = _descriptor.EnumDescriptor(
@@ -36,8 +36,8 @@ _PORTFOLIOTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=2972,
-  serialized_end=3004,
+  serialized_start=3250,
+  serialized_end=3282,
 )
 _sym_db.RegisterEnumDescriptor(_PORTFOLIOTYPE)
 
@@ -59,8 +59,8 @@ _VOTETYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3006,
-  serialized_end=3040,
+  serialized_start=3284,
+  serialized_end=3318,
 )
 _sym_db.RegisterEnumDescriptor(_VOTETYPE)
 
@@ -86,8 +86,8 @@ _RECORDTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3042,
-  serialized_end=3095,
+  serialized_start=3320,
+  serialized_end=3373,
 )
 _sym_db.RegisterEnumDescriptor(_RECORDTYPE)
 
@@ -113,8 +113,8 @@ _RECORDSTATUS = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=3097,
-  serialized_end=3154,
+  serialized_start=3375,
+  serialized_end=3432,
 )
 _sym_db.RegisterEnumDescriptor(_RECORDSTATUS)
 
@@ -221,14 +221,18 @@ _B4EPAYLOAD_ACTION = _descriptor.EnumDescriptor(
       serialized_options=None,
       type=None),
     _descriptor.EnumValueDescriptor(
-      name='SET_B4E_ENVIRONMENT', index=21, number=18,
+      name='CREATE_SUBJECTS', index=21, number=22,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='SET_B4E_ENVIRONMENT', index=22, number=18,
       serialized_options=None,
       type=None),
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=1090,
-  serialized_end=1526,
+  serialized_start=1138,
+  serialized_end=1595,
 )
 _sym_db.RegisterEnumDescriptor(_B4EPAYLOAD_ACTION)
 
@@ -402,7 +406,14 @@ _B4EPAYLOAD = _descriptor.Descriptor(
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
     _descriptor.FieldDescriptor(
-      name='timestamp', full_name='B4EPayload.timestamp', index=23,
+      name='create_subjects', full_name='B4EPayload.create_subjects', index=23,
+      number=25, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='timestamp', full_name='B4EPayload.timestamp', index=24,
       number=21, type=4, cpp_type=4, label=1,
       has_default_value=False, default_value=0,
       message_type=None, enum_type=None, containing_type=None,
@@ -422,7 +433,7 @@ _B4EPAYLOAD = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=31,
-  serialized_end=1526,
+  serialized_end=1595,
 )
 
 
@@ -459,8 +470,8 @@ _CREATEACTORACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1528,
-  serialized_end=1573,
+  serialized_start=1597,
+  serialized_end=1642,
 )
 
 
@@ -504,8 +515,8 @@ _CREATETEACHERACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1575,
-  serialized_end=1650,
+  serialized_start=1644,
+  serialized_end=1719,
 )
 
 
@@ -556,8 +567,8 @@ _CREATEPORTFOLIOACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1652,
-  serialized_end=1767,
+  serialized_start=1721,
+  serialized_end=1836,
 )
 
 
@@ -615,8 +626,8 @@ _CREATECLASSACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1770,
-  serialized_end=1900,
+  serialized_start=1839,
+  serialized_end=1969,
 )
 
 
@@ -653,8 +664,8 @@ _CREATEVOTINGACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1902,
-  serialized_end=1980,
+  serialized_start=1971,
+  serialized_end=2049,
 )
 
 
@@ -691,8 +702,8 @@ _VOTEACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1982,
-  serialized_end=2038,
+  serialized_start=2051,
+  serialized_end=2107,
 )
 
 
@@ -764,8 +775,104 @@ _CREATERECORDACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2041,
-  serialized_end=2220,
+  serialized_start=2110,
+  serialized_end=2289,
+)
+
+
+_CREATESUBJECTSACTION_SUBJECT = _descriptor.Descriptor(
+  name='Subject',
+  full_name='CreateSubjectsAction.Subject',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='owner_public_key', full_name='CreateSubjectsAction.Subject.owner_public_key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='portfolio_id', full_name='CreateSubjectsAction.Subject.portfolio_id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='cipher', full_name='CreateSubjectsAction.Subject.cipher', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='hash', full_name='CreateSubjectsAction.Subject.hash', index=3,
+      number=4, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2411,
+  serialized_end=2498,
+)
+
+_CREATESUBJECTSACTION = _descriptor.Descriptor(
+  name='CreateSubjectsAction',
+  full_name='CreateSubjectsAction',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='manager_public_key', full_name='CreateSubjectsAction.manager_public_key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='class_id', full_name='CreateSubjectsAction.class_id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='subjects', full_name='CreateSubjectsAction.subjects', index=2,
+      number=3, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[_CREATESUBJECTSACTION_SUBJECT, ],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2292,
+  serialized_end=2498,
 )
 
 
@@ -823,8 +930,8 @@ _UPDATERECORDACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2223,
-  serialized_end=2356,
+  serialized_start=2501,
+  serialized_end=2634,
 )
 
 
@@ -882,8 +989,8 @@ _MODIFYRECORDACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2358,
-  serialized_end=2481,
+  serialized_start=2636,
+  serialized_end=2759,
 )
 
 
@@ -920,8 +1027,8 @@ _CHANGESTATUSCERTACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2483,
-  serialized_end=2552,
+  serialized_start=2761,
+  serialized_end=2830,
 )
 
 
@@ -951,8 +1058,8 @@ _UPDATEACTORPROFILEACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2554,
-  serialized_end=2594,
+  serialized_start=2832,
+  serialized_end=2872,
 )
 
 
@@ -982,8 +1089,8 @@ _REJECTINSTITUTIONACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2596,
-  serialized_end=2653,
+  serialized_start=2874,
+  serialized_end=2931,
 )
 
 
@@ -1013,8 +1120,8 @@ _ACTIVEINSTITUTIONACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2655,
-  serialized_end=2712,
+  serialized_start=2933,
+  serialized_end=2990,
 )
 
 
@@ -1044,8 +1151,8 @@ _SETB4EENVIRONMENTACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2714,
-  serialized_end=2758,
+  serialized_start=2992,
+  serialized_end=3036,
 )
 
 
@@ -1103,8 +1210,8 @@ _JOBBEGINACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2760,
-  serialized_end=2880,
+  serialized_start=3038,
+  serialized_end=3158,
 )
 
 
@@ -1148,8 +1255,8 @@ _JOBENDACTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=2882,
-  serialized_end=2970,
+  serialized_start=3160,
+  serialized_end=3248,
 )
 
 _B4EPAYLOAD.fields_by_name['action'].enum_type = _B4EPAYLOAD_ACTION
@@ -1175,10 +1282,13 @@ _B4EPAYLOAD.fields_by_name['set_b4e_environment'].message_type = _SETB4EENVIRONM
 _B4EPAYLOAD.fields_by_name['create_company'].message_type = _CREATEACTORACTION
 _B4EPAYLOAD.fields_by_name['job_begin'].message_type = _JOBBEGINACTION
 _B4EPAYLOAD.fields_by_name['job_end'].message_type = _JOBENDACTION
+_B4EPAYLOAD.fields_by_name['create_subjects'].message_type = _CREATESUBJECTSACTION
 _B4EPAYLOAD_ACTION.containing_type = _B4EPAYLOAD
 _CREATEPORTFOLIOACTION.fields_by_name['portfolio_type'].enum_type = _PORTFOLIOTYPE
 _CREATEVOTINGACTION.fields_by_name['vote_type'].enum_type = _VOTETYPE
 _CREATERECORDACTION.fields_by_name['record_type'].enum_type = _RECORDTYPE
+_CREATESUBJECTSACTION_SUBJECT.containing_type = _CREATESUBJECTSACTION
+_CREATESUBJECTSACTION.fields_by_name['subjects'].message_type = _CREATESUBJECTSACTION_SUBJECT
 _UPDATERECORDACTION.fields_by_name['record_status'].enum_type = _RECORDSTATUS
 DESCRIPTOR.message_types_by_name['B4EPayload'] = _B4EPAYLOAD
 DESCRIPTOR.message_types_by_name['CreateActorAction'] = _CREATEACTORACTION
@@ -1188,6 +1298,7 @@ DESCRIPTOR.message_types_by_name['CreateClassAction'] = _CREATECLASSACTION
 DESCRIPTOR.message_types_by_name['CreateVotingAction'] = _CREATEVOTINGACTION
 DESCRIPTOR.message_types_by_name['VoteAction'] = _VOTEACTION
 DESCRIPTOR.message_types_by_name['CreateRecordAction'] = _CREATERECORDACTION
+DESCRIPTOR.message_types_by_name['CreateSubjectsAction'] = _CREATESUBJECTSACTION
 DESCRIPTOR.message_types_by_name['UpdateRecordAction'] = _UPDATERECORDACTION
 DESCRIPTOR.message_types_by_name['ModifyRecordAction'] = _MODIFYRECORDACTION
 DESCRIPTOR.message_types_by_name['ChangeStatusCertAction'] = _CHANGESTATUSCERTACTION
@@ -1259,6 +1370,21 @@ CreateRecordAction = _reflection.GeneratedProtocolMessageType('CreateRecordActio
   ))
 _sym_db.RegisterMessage(CreateRecordAction)
 
+CreateSubjectsAction = _reflection.GeneratedProtocolMessageType('CreateSubjectsAction', (_message.Message,), dict(
+
+  Subject = _reflection.GeneratedProtocolMessageType('Subject', (_message.Message,), dict(
+    DESCRIPTOR = _CREATESUBJECTSACTION_SUBJECT,
+    __module__ = 'b4e_protobuf.payload_pb2'
+    # @@protoc_insertion_point(class_scope:CreateSubjectsAction.Subject)
+    ))
+  ,
+  DESCRIPTOR = _CREATESUBJECTSACTION,
+  __module__ = 'b4e_protobuf.payload_pb2'
+  # @@protoc_insertion_point(class_scope:CreateSubjectsAction)
+  ))
+_sym_db.RegisterMessage(CreateSubjectsAction)
+_sym_db.RegisterMessage(CreateSubjectsAction.Subject)
+
 UpdateRecordAction = _reflection.GeneratedProtocolMessageType('UpdateRecordAction', (_message.Message,), dict(
   DESCRIPTOR = _UPDATERECORDACTION,
   __module__ = 'b4e_protobuf.payload_pb2'
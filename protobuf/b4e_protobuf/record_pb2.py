@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x19\x62\x34\x65_protobuf/record.proto\"\xc8\x03\n\x06Record\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x19\n\x11issuer_public_key\x18\x02 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x03 \x01(\t\x12\x11\n\trecord_id\x18\x04 \x01(\t\x12\'\n\x0brecord_type\x18\x05 \x01(\x0e\x32\x12.Record.RecordType\x12$\n\x08versions\x18\x06 \x03(\x0b\x32\x12.Record.RecordData\x1a\x98\x01\n\nRecordData\x12\x14\n\x0cportfolio_id\x18\x01 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12+\n\rrecord_status\x18\x04 \x01(\x0e\x32\x14.Record.RecordStatus\x12\x11\n\ttimestamp\x18\x05 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x06 \x01(\t\"5\n\nRecordType\x12\x0f\n\x0b\x43\x45RTIFICATE\x10\x00\x12\x0b\n\x07SUBJECT\x10\x01\x12\t\n\x05OTHER\x10\x02\"9\n\x0cRecordStatus\x12\x0b\n\x07\x43REATED\x10\x00\x12\x0b\n\x07REVOKED\x10\x01\x12\x0f\n\x0bREACTIVATED\x10\x02\"+\n\x0fRecordContainer\x12\x18\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x07.Recordb\x06proto3')
+  serialized_pb=_b('\n\x19\x62\x34\x65_protobuf/record.proto\"\xdf\x03\n\x06Record\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x19\n\x11issuer_public_key\x18\x02 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x03 \x01(\t\x12\x11\n\trecord_id\x18\x04 \x01(\t\x12\'\n\x0brecord_type\x18\x05 \x01(\x0e\x32\x12.Record.RecordType\x12$\n\x08versions\x18\x06 \x03(\x0b\x32\x12.Record.RecordData\x12\x15\n\rversion_count\x18\x07 \x01(\r\x1a\x98\x01\n\nRecordData\x12\x14\n\x0cportfolio_id\x18\x01 \x01(\t\x12\x0e\n\x06\x63ipher\x18\x02 \x01(\t\x12\x0c\n\x04hash\x18\x03 \x01(\t\x12+\n\rrecord_status\x18\x04 \x01(\x0e\x32\x14.Record.RecordStatus\x12\x11\n\ttimestamp\x18\x05 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x06 \x01(\t\"5\n\nRecordType\x12\x0f\n\x0b\x43\x45RTIFICATE\x10\x00\x12\x0b\n\x07SUBJECT\x10\x01\x12\t\n\x05OTHER\x10\x02\"9\n\x0cRecordStatus\x12\x0b\n\x07\x43REATED\x10\x00\x12\x0b\n\x07REVOKED\x10\x01\x12\x0f\n\x0bREACTIVATED\x10\x02\"\x8d\x01\n\rRecordArchive\x12\x18\n\x10owner_public_key\x18\x01 \x01(\t\x12\x1a\n\x12manager_public_key\x18\x02 \x01(\t\x12\x11\n\trecord_id\x18\x03 \x01(\t\x12\r\n\x05\x63hunk\x18\x04 \x01(\r\x12$\n\x08versions\x18\x05 \x03(\x0b\x32\x12.Record.RecordData\"+\n\x0fRecordContainer\x12\x18\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x07.Record\"9\n\x16RecordArchiveContainer\x12\x1f\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0e.RecordArchiveb\x06proto3')
 )
 
 
@@ -45,8 +45,8 @@ _RECORD_RECORDTYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=374,
-  serialized_end=427,
+  serialized_start=397,
+  serialized_end=450,
 )
 _sym_db.RegisterEnumDescriptor(_RECORD_RECORDTYPE)
 
@@ -71,8 +71,8 @@ _RECORD_RECORDSTATUS = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=429,
-  serialized_end=486,
+  serialized_start=452,
+  serialized_end=509,
 )
 _sym_db.RegisterEnumDescriptor(_RECORD_RECORDSTATUS)
 
@@ -138,8 +138,8 @@ _RECORD_RECORDDATA = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=220,
-  serialized_end=372,
+  serialized_start=243,
+  serialized_end=395,
 )
 
 _RECORD = _descriptor.Descriptor(
@@ -191,6 +191,13 @@ _RECORD = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='version_count', full_name='Record.version_count', index=6,
+      number=7, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -206,7 +213,66 @@ _RECORD = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=30,
-  serialized_end=486,
+  serialized_end=509,
+)
+
+
+_RECORDARCHIVE = _descriptor.Descriptor(
+  name='RecordArchive',
+  full_name='RecordArchive',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='owner_public_key', full_name='RecordArchive.owner_public_key', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='manager_public_key', full_name='RecordArchive.manager_public_key', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='record_id', full_name='RecordArchive.record_id', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b("").decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='chunk', full_name='RecordArchive.chunk', index=3,
+      number=4, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='versions', full_name='RecordArchive.versions', index=4,
+      number=5, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=512,
+  serialized_end=653,
 )
 
 
@@ -236,8 +302,39 @@ _RECORDCONTAINER = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=488,
-  serialized_end=531,
+  serialized_start=655,
+  serialized_end=698,
+)
+
+
+_RECORDARCHIVECONTAINER = _descriptor.Descriptor(
+  name='RecordArchiveContainer',
+  full_name='RecordArchiveContainer',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='entries', full_name='RecordArchiveContainer.entries', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=700,
+  serialized_end=757,
 )
 
 _RECORD_RECORDDATA.fields_by_name['record_status'].enum_type = _RECORD_RECORDSTATUS
@@ -246,9 +343,13 @@ _RECORD.fields_by_name['record_type'].enum_type = _RECORD_RECORDTYPE
 _RECORD.fields_by_name['versions'].message_type = _RECORD_RECORDDATA
 _RECORD_RECORDTYPE.containing_type = _RECORD
 _RECORD_RECORDSTATUS.containing_type = _RECORD
+_RECORDARCHIVE.fields_by_name['versions'].message_type = _RECORD_RECORDDATA
 _RECORDCONTAINER.fields_by_name['entries'].message_type = _RECORD
+_RECORDARCHIVECONTAINER.fields_by_name['entries'].message_type = _RECORDARCHIVE
 DESCRIPTOR.message_types_by_name['Record'] = _RECORD
+DESCRIPTOR.message_types_by_name['RecordArchive'] = _RECORDARCHIVE
 DESCRIPTOR.message_types_by_name['RecordContainer'] = _RECORDCONTAINER
+DESCRIPTOR.message_types_by_name['RecordArchiveContainer'] = _RECORDARCHIVECONTAINER
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 Record = _reflection.GeneratedProtocolMessageType('Record', (_message.Message,), dict(
@@ -266,6 +367,13 @@ Record = _reflection.GeneratedProtocolMessageType('Record', (_message.Message,),
 _sym_db.RegisterMessage(Record)
 _sym_db.RegisterMessage(Record.RecordData)
 
+RecordArchive = _reflection.GeneratedProtocolMessageType('RecordArchive', (_message.Message,), dict(
+  DESCRIPTOR = _RECORDARCHIVE,
+  __module__ = 'b4e_protobuf.record_pb2'
+  # @@protoc_insertion_point(class_scope:RecordArchive)
+  ))
+_sym_db.RegisterMessage(RecordArchive)
+
 RecordContainer = _reflection.GeneratedProtocolMessageType('RecordContainer', (_message.Message,), dict(
   DESCRIPTOR = _RECORDCONTAINER,
   __module__ = 'b4e_protobuf.record_pb2'
@@ -273,5 +381,12 @@ RecordContainer = _reflection.GeneratedProtocolMessageType('RecordContainer', (_
   ))
 _sym_db.RegisterMessage(RecordContainer)
 
+RecordArchiveContainer = _reflection.GeneratedProtocolMessageType('RecordArchiveContainer', (_message.Message,), dict(
+  DESCRIPTOR = _RECORDARCHIVECONTAINER,
+  __module__ = 'b4e_protobuf.record_pb2'
+  # @@protoc_insertion_point(class_scope:RecordArchiveContainer)
+  ))
+_sym_db.RegisterMessage(RecordArchiveContainer)
+
 
 # @@protoc_insertion_point(module_scope)
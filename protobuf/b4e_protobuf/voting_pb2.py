@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=_b('\n\x19\x62\x34\x65_protobuf/voting.proto\"\xa5\x03\n\x06Voting\x12\x1c\n\x14publisher_public_key\x18\x01 \x01(\t\x12\x1a\n\x12\x65lector_public_key\x18\x02 \x01(\t\x12#\n\tvote_type\x18\x03 \x01(\x0e\x32\x10.Voting.VoteType\x12\x1a\n\x04vote\x18\x04 \x03(\x0b\x32\x0c.Voting.Vote\x12\'\n\x0bvote_result\x18\x05 \x01(\x0e\x32\x12.Voting.VoteResult\x12\x1c\n\x14\x63lose_vote_timestamp\x18\x06 \x01(\x04\x12\x11\n\ttimestamp\x18\x07 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x08 \x01(\t\x1a\\\n\x04Vote\x12\x19\n\x11issuer_public_key\x18\x01 \x01(\t\x12\x0e\n\x06\x61\x63\x63\x65pt\x18\x02 \x01(\x08\x12\x11\n\ttimestamp\x18\x03 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x04 \x01(\t\"\"\n\x08VoteType\x12\n\n\x06\x41\x43TIVE\x10\x00\x12\n\n\x06REJECT\x10\x01\",\n\nVoteResult\x12\x07\n\x03WIN\x10\x00\x12\x08\n\x04LOSE\x10\x01\x12\x0b\n\x07UNKNOWN\x10\x02\"+\n\x0fVotingContainer\x12\x18\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x07.Votingb\x06proto3')
+  serialized_pb=_b('\n\x19b4e_protobuf/voting.proto\"\xec\x03\n\x06Voting\x12\x1c\n\x14publisher_public_key\x18\x01 \x01(\t\x12\x1a\n\x12elector_public_key\x18\x02 \x01(\t\x12#\n\tvote_type\x18\x03 \x01(\x0e2\x10.Voting.VoteType\x12\x1a\n\x04vote\x18\x04 \x03(\x0b2\x0c.Voting.Vote\x12\'\n\x0bvote_result\x18\x05 \x01(\x0e2\x12.Voting.VoteResult\x12\x1c\n\x14close_vote_timestamp\x18\x06 \x01(\x04\x12\x11\n\ttimestamp\x18\x07 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x08 \x01(\t\x12\x14\n\x0caccept_count\x18\t \x01(\r\x12\x14\n\x0creject_count\x18\n \x01(\r\x12\x13\n\x0bvoter_index\x18\x0c \x01(\x0c\x1a\\\n\x04Vote\x12\x19\n\x11issuer_public_key\x18\x01 \x01(\t\x12\x0e\n\x06accept\x18\x02 \x01(\x08\x12\x11\n\ttimestamp\x18\x03 \x01(\x04\x12\x16\n\x0etransaction_id\x18\x04 \x01(\t\"\"\n\x08VoteType\x12\n\n\x06ACTIVE\x10\x00\x12\n\n\x06REJECT\x10\x01\",\n\nVoteResult\x12\x07\n\x03WIN\x10\x00\x12\x08\n\x04LOSE\x10\x01\x12\x0b\n\x07UNKNOWN\x10\x02J\x04\x08\x0b\x10\x0c\"+\n\x0fVotingContainer\x12\x18\n\x07entries\x18\x01 \x03(\x0b2\x07.Votingb\x06proto3')
 )
 
 
@@ -41,8 +41,8 @@ _VOTING_VOTETYPE = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=371,
-  serialized_end=405,
+  serialized_start=436,
+  serialized_end=470,
 )
 _sym_db.RegisterEnumDescriptor(_VOTING_VOTETYPE)
 
@@ -67,8 +67,8 @@ _VOTING_VOTERESULT = _descriptor.EnumDescriptor(
   ],
   containing_type=None,
   serialized_options=None,
-  serialized_start=407,
-  serialized_end=451,
+  serialized_start=472,
+  serialized_end=516,
 )
 _sym_db.RegisterEnumDescriptor(_VOTING_VOTERESULT)
 
@@ -120,8 +120,8 @@ _VOTING_VOTE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=277,
-  serialized_end=369,
+  serialized_start=342,
+  serialized_end=434,
 )
 
 _VOTING = _descriptor.Descriptor(
@@ -187,6 +187,27 @@ _VOTING = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='accept_count', full_name='Voting.accept_count', index=8,
+      number=9, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='reject_count', full_name='Voting.reject_count', index=9,
+      number=10, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='voter_index', full_name='Voting.voter_index', index=10,
+      number=12, type=12, cpp_type=9, label=1,
+      has_default_value=False, default_value=_b(""),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -202,7 +223,7 @@ _VOTING = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=30,
-  serialized_end=451,
+  serialized_end=522,
 )
 
 
@@ -232,8 +253,8 @@ _VOTINGCONTAINER = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=453,
-  serialized_end=496,
+  serialized_start=524,
+  serialized_end=567,
 )
 
 _VOTING_VOTE.containing_type = _VOTING
@@ -0,0 +1,193 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Asynchronous submission mode.
+
+A POST request sent with `?async=true` or `Prefer: respond-async` is run
+as a job. Once its batches are submitted to the validator the client gets
+202 with the job id, and the outcome is kept for /jobs/{job_id} and pushed
+on /jobs/events. Requests that fail or finish before anything is submitted,
+validation errors among them, are answered as usual.
+"""
+
+import asyncio
+import collections
+import contextvars
+import json
+import logging
+import time
+import uuid
+
+from aiohttp import web
+
+from rest_api.b4e_rest_api.errors import ApiBadRequest
+from rest_api.b4e_rest_api.errors import ApiCommitTimeout
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds a finished job is kept
+JOB_TTL = 3600
+# finished jobs kept at most
+MAX_JOBS = 100000
+
+PENDING = 'PENDING'
+SUBMITTED = 'SUBMITTED'
+COMMITTED = 'COMMITTED'
+INVALID = 'INVALID'
+TIMEOUT = 'TIMEOUT'
+FAILED = 'FAILED'
+
+# the job of the request being handled, if it runs in async mode
+current_job = contextvars.ContextVar('current_job', default=None)
+
+
+def mark_submitted():
+    """Called by the Messenger once every batch of a request is submitted."""
+    job = current_job.get()
+    if job is not None and not job.submitted.done():
+        job.status = SUBMITTED
+        job.submitted.set_result(None)
+
+
+class AsyncJob(object):
+    def __init__(self, method, path):
+        loop = asyncio.get_event_loop()
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.submitted = loop.create_future()
+        self.finished = loop.create_future()
+
+    def finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        if not self.finished.done():
+            self.finished.set_result(None)
+
+    def to_dict(self):
+        return {
+            'jobId': self.id,
+            'method': self.method,
+            'path': self.path,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'createdAt': self.created_at,
+            'finishedAt': self.finished_at
+        }
+
+
+class AsyncJobStore(object):
+    """In memory store of the async mode jobs. Finished jobs are dropped
+    JOB_TTL seconds after they finished, or oldest first beyond MAX_JOBS.
+    """
+
+    def __init__(self, ttl=JOB_TTL, max_jobs=MAX_JOBS):
+        self._ttl = ttl
+        self._max_jobs = max_jobs
+        self._jobs = collections.OrderedDict()
+
+    def create(self, method, path):
+        self._prune()
+        job = AsyncJob(method, path)
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def discard(self, job):
+        self._jobs.pop(job.id, None)
+
+    def _prune(self):
+        expired = time.time() - self._ttl
+        over = len(self._jobs) - self._max_jobs
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is None:
+                continue
+            if job.finished_at > expired and over <= 0:
+                break
+            del self._jobs[job_id]
+            over -= 1
+
+
+def wants_async(request):
+    if request.query.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+@web.middleware
+async def async_mode_middleware(request, handler):
+    if request.method != 'POST' or not wants_async(request):
+        return await handler(request)
+
+    store = request.app['async_jobs']
+    job = store.create(request.method, request.path)
+    task = asyncio.ensure_future(_run_job(job, handler, request))
+    await asyncio.wait([task, job.submitted], return_when=asyncio.FIRST_COMPLETED)
+    if task.done():
+        # nothing left to wait for, answer as a synchronous request
+        store.discard(job)
+        return task.result()
+
+    task.add_done_callback(_consume_exception)
+    return web.json_response(
+        {
+            'ok': True,
+            'msg': 'Transaction submitted',
+            'jobId': job.id,
+            'status': job.status
+        }, status=202)
+
+
+async def _run_job(job, handler, request):
+    current_job.set(job)
+    try:
+        response = await handler(request)
+    except ApiBadRequest as e:
+        job.finish(INVALID, error=e.message)
+        raise
+    except ApiCommitTimeout as e:
+        job.finish(TIMEOUT, error=e.message)
+        raise
+    except web.HTTPException as e:
+        job.finish(FAILED, error=e.text)
+        raise
+    except Exception as e:
+        job.finish(FAILED, error=str(e))
+        raise
+    # 207: only some transactions of a bulk request were committed
+    job.finish(FAILED if response.status == 207 else COMMITTED, result=_response_body(response))
+    return response
+
+
+def _response_body(response):
+    if isinstance(response, web.Response) and response.content_type == 'application/json':
+        return json.loads(response.text)
+    return None
+
+
+def _consume_exception(task):
+    # the outcome is recorded on the job, the client already had its answer
+    if not task.cancelled():
+        task.exception()
@@ -1,20 +1,315 @@
+import asyncio
 import base64
+import collections
+import dbm
 import json
 import logging
 
-import requests
+import aiohttp
 
-from decoder.b4e_decoder.decoding import deserialize_data
+from decoder.b4e_decoder.decoding import deserialize_data, get_record_archive_addresses, merge_record_versions
 from protobuf.b4e_protobuf import payload_pb2
+from sawtooth_rest_api.protobuf import transaction_receipt_pb2
 
-from config.config import SawtoothConfig
 from addressing.b4e_addressing import addresser
+from rest_api.b4e_rest_api.errors import ApiBadGateway
 from google.protobuf.json_format import MessageToDict
 import google
 
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_TIMEOUT = 10
+DEFAULT_CONNECTIONS = 32
+KEEPALIVE_TIMEOUT = 30
+STATE_PAGE_SIZE = 100
+DEFAULT_PAYLOAD_CACHE_SIZE = 10000
+DEFAULT_STATE_CACHE_SIZE = 10000
+DEFAULT_BLOCK_INDEX_SIZE = 100000
+# items a batch read may ask for, and upstream requests it runs at a time
+MAX_BATCH_READ_ITEMS = 200
+BATCH_READ_CONCURRENCY = 8
+
+
+class StateQueryError(Exception):
+    pass
+
+
+class SawtoothRestClient(object):
+    """Keep-alive connection pool to the Sawtooth REST API, shared by every
+    request handler. It is opened and closed with the aiohttp application.
+    """
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT, connections=DEFAULT_CONNECTIONS):
+        self._url = url
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._connections = connections
+        self._session = None
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(limit=self._connections,
+                                         keepalive_timeout=KEEPALIVE_TIMEOUT)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, path, params=None):
+        """Returns the decoded JSON body of a GET on the REST API, or None
+        if it answered 404. Raises ApiBadGateway if the call failed, timed
+        out or got any other answer.
+        """
+        try:
+            async with self._session.get(self._url + path, params=params) as response:
+                if response.status == 404:
+                    return None
+                if response.status != 200:
+                    raise ApiBadGateway("Sawtooth REST API answered {} for {}".format(response.status, path))
+                return json.loads(await response.read())
+        except asyncio.TimeoutError:
+            LOGGER.warning("Timed out fetching %s", path)
+            raise ApiBadGateway("Timed out fetching " + path)
+        except aiohttp.ClientError as e:
+            LOGGER.warning("Failed fetching %s: %s", path, e)
+            raise ApiBadGateway("Failed fetching " + path)
+        except ValueError:
+            raise ApiBadGateway("Sawtooth REST API sent invalid JSON for " + path)
+
+
+class PayloadCache(object):
+    """LRU cache of decoded transaction payloads keyed by transaction id.
+
+    The REST API only serves committed transactions, which never change, so
+    entries are never invalidated. When a path is given, entries evicted
+    from memory are kept in a dbm file there and read back on a miss.
+    """
+
+    def __init__(self, max_size=DEFAULT_PAYLOAD_CACHE_SIZE, path=None):
+        self._max_size = max_size
+        self._path = path
+        self._entries = collections.OrderedDict()
+        self._disk = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def open(self):
+        if self._path:
+            self._disk = dbm.open(self._path, 'c')
+
+    def close(self):
+        if self._disk is not None:
+            for transaction_id, data in self._entries.items():
+                self._disk[transaction_id] = json.dumps(data)
+            self._disk.close()
+            self._disk = None
+
+    def get(self, transaction_id):
+        data = self._entries.get(transaction_id)
+        if data is not None:
+            self._entries.move_to_end(transaction_id)
+            self.hits += 1
+            return data
+
+        if self._disk is not None:
+            raw = self._disk.get(transaction_id)
+            if raw is not None:
+                self.disk_hits += 1
+                data = json.loads(raw)
+                self._insert(transaction_id, data)
+                return data
+
+        self.misses += 1
+        return None
+
+    def put(self, transaction_id, data):
+        self._insert(transaction_id, data)
+
+    def _insert(self, transaction_id, data):
+        self._entries[transaction_id] = data
+        self._entries.move_to_end(transaction_id)
+        while len(self._entries) > self._max_size:
+            evicted_id, evicted = self._entries.popitem(last=False)
+            if self._disk is not None:
+                self._disk[evicted_id] = json.dumps(evicted)
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'maxSize': self._max_size,
+            'hits': self.hits,
+            'diskHits': self.disk_hits,
+            'misses': self.misses
+        }
+
+
+class StateCache(object):
+    """Decoded state entries keyed by address, kept until a block changes
+    them.
+
+    handle_events receives the block-commit and b4e state-delta events of
+    every new block. It drops the entries whose address changed, and drops
+    everything when a block does not follow the previous one, on a fork or
+    after missed blocks. reset is called when the event subscription fails
+    or is lost. Until events arrive, entries are only reused while the head
+    block is the one they were read at.
+    """
+
+    def __init__(self, max_size=DEFAULT_STATE_CACHE_SIZE):
+        self._max_size = max_size
+        # address -> (head block id it was read at, decoded state)
+        self._entries = collections.OrderedDict()
+        self.head = None
+        self.block_num = None
+
+    def handle_events(self, events):
+        for event in events:
+            if event.event_type == 'sawtooth/block-commit':
+                attributes = {attribute.key: attribute.value for attribute in event.attributes}
+                block_num = int(attributes['block_num'])
+                if self.block_num is None or block_num != self.block_num + 1:
+                    self._entries.clear()
+                self.head = attributes['block_id']
+                self.block_num = block_num
+            elif event.event_type == 'sawtooth/state-delta':
+                state_changes = transaction_receipt_pb2.StateChangeList()
+                state_changes.ParseFromString(event.data)
+                for state_change in state_changes.state_changes:
+                    self._entries.pop(state_change.address, None)
+
+    def reset(self):
+        self._entries.clear()
+        self.head = None
+        self.block_num = None
+
+    def get(self, address, head):
+        entry = self._entries.get(address)
+        if entry is None:
+            return None
+        if self.head is None and entry[0] != head:
+            # no events to invalidate with, only trust entries of this head
+            del self._entries[address]
+            return None
+        self._entries.move_to_end(address)
+        return entry[1]
+
+    def put(self, address, head, data):
+        if self.head is not None and head != self.head:
+            # read at another block than the one the events are at
+            return
+        self._entries[address] = (head, data)
+        self._entries.move_to_end(address)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+class BlockIndex(object):
+    """Index of (address, block id) -> id of the first transaction of the
+    block writing the address.
+
+    The events carry no transaction ids, so handle_events fetches once each
+    block whose state-delta touched the b4e namespace and indexes the
+    outputs of its transactions. Blocks committed before the server started
+    are indexed on their first lookup. Whole blocks are dropped oldest first
+    once more than max_size addresses are indexed.
+    """
+
+    def __init__(self, client, max_size=DEFAULT_BLOCK_INDEX_SIZE):
+        self._client = client
+        self._max_size = max_size
+        # block id -> {address: transaction id}
+        self._blocks = collections.OrderedDict()
+        self._size = 0
+        # block id -> future of the block being indexed
+        self._indexing = {}
+
+    def handle_events(self, events):
+        block_id = None
+        changed = False
+        for event in events:
+            if event.event_type == 'sawtooth/block-commit':
+                attributes = {attribute.key: attribute.value for attribute in event.attributes}
+                block_id = attributes['block_id']
+            elif event.event_type == 'sawtooth/state-delta':
+                changed = True
+        if block_id is not None and changed and self._max_size > 0:
+            self._index_block(block_id).add_done_callback(_log_index_failure)
+
+    async def get_transaction_id(self, block_id, address):
+        """Returns the id of the first transaction of the block writing the
+        address, None if there is none or the block does not exist. Raises
+        ApiBadGateway if the block could not be fetched.
+        """
+        addresses = self._blocks.get(block_id)
+        if addresses is None:
+            await self._index_block(block_id)
+            addresses = self._blocks.get(block_id)
+            if addresses is None:
+                return None
+        return addresses.get(address)
+
+    def _index_block(self, block_id):
+        future = self._indexing.get(block_id)
+        if future is None:
+            future = self._indexing[block_id] = asyncio.ensure_future(self._fetch_block(block_id))
+        return future
+
+    async def _fetch_block(self, block_id):
+        try:
+            block = await self._client.get("/blocks/" + str(block_id))
+            if block is None:
+                return
+            addresses = {}
+            try:
+                for batch in block['data']['batches']:
+                    for transaction in batch['transactions']:
+                        for address in transaction['header']['outputs']:
+                            addresses.setdefault(address, transaction['header_signature'])
+            except (KeyError, TypeError):
+                raise ApiBadGateway("Sawtooth REST API sent a malformed block " + str(block_id))
+            self._insert(block_id, addresses)
+        finally:
+            del self._indexing[block_id]
+
+    def _insert(self, block_id, addresses):
+        if block_id in self._blocks:
+            return
+        self._blocks[block_id] = addresses
+        self._size += len(addresses)
+        while self._size > self._max_size and len(self._blocks) > 1:
+            _, evicted = self._blocks.popitem(last=False)
+            self._size -= len(evicted)
+
+
+def _log_index_failure(future):
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        LOGGER.warning("Failed to index block: %s", getattr(error, 'message', error))
+
+
+async def get_head(client, cache):
+    """Returns the id of the head block, from the block-commit events when
+    they are received.
+    """
+    if cache.head is not None:
+        return cache.head
+    blocks = await client.get("/blocks", params={'limit': 1})
+    if blocks is None:
+        return None
+    return blocks.get('head')
+
+
+async def open_rest_client(app):
+    await app['sawtooth_rest'].open()
+    app['payload_cache'].open()
+
+
+async def close_rest_client(app):
+    await app['sawtooth_rest'].close()
+    app['payload_cache'].close()
+
 
 def enum_value_to_name(val):
     desc = payload_pb2.B4EPayload.Action.DESCRIPTOR
@@ -24,12 +319,10 @@ def enum_value_to_name(val):
     return None
 
 
-def get_data_from_transaction(transaction_id):
-    url = SawtoothConfig.REST_API + "/transactions/" + str(transaction_id)
-    response = requests.get(url)
-    if response.status_code == 200:
+async def _fetch_transaction_payload(client, transaction_id):
+    transaction_dict = await client.get("/transactions/" + str(transaction_id))
+    if transaction_dict is not None:
         try:
-            transaction_dict = json.loads(response.content)
             payload_string = transaction_dict['data']['payload']
             data_model = payload_pb2.B4EPayload()
             data_model.ParseFromString(base64.b64decode(payload_string))
@@ -41,18 +334,22 @@ def get_data_from_transaction(transaction_id):
             return None
 
 
-def get_record_transaction(transaction_id):
-    url = SawtoothConfig.REST_API + "/transactions/" + str(transaction_id)
+async def get_data_from_transaction(client, cache, transaction_id):
+    """Returns the decoded payload of a committed transaction, from the
+    cache when it was fetched before.
+    """
+    data = cache.get(transaction_id)
+    if data is None:
+        data = await _fetch_transaction_payload(client, transaction_id)
+        if data is not None:
+            cache.put(transaction_id, data)
+    return data
 
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            transaction_dict = json.loads(response.content)
-            payload_string = transaction_dict['data']['payload']
-            data_model = payload_pb2.B4EPayload()
-            data_model.ParseFromString(base64.b64decode(payload_string))
-            data = dict(MessageToDict(data_model))
 
+async def get_record_transaction(client, cache, transaction_id):
+    data = await get_data_from_transaction(client, cache, transaction_id)
+    if data is not None:
+        try:
             if data.get('createRecord'):
                 res = {
                     'ok': True,
@@ -91,22 +388,18 @@ def get_record_transaction(transaction_id):
     return {'ok': False, 'msg': 'Transaction  not found'}
 
 
-def get_payload_from_block(block_id, address):
-    url = SawtoothConfig.REST_API + "/blocks/" + str(block_id)
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            block = json.loads(response.content)
-            batches = block['data']['batches']
-            for batch in batches:
-
-                for transaction in batch['transactions']:
-                    tran = json.loads(json.dumps(transaction))
-
-                    if address in transaction['header']['outputs']:
-                        return transaction['payload']
+async def get_payload_from_block(client, index, block_id, address):
+    """Returns the payload of the first transaction of the block writing
+    the address, None if there is none.
+    """
+    transaction_id = await index.get_transaction_id(block_id, address)
+    if transaction_id is None:
+        return None
 
-            return None
+    transaction_dict = await client.get("/transactions/" + str(transaction_id))
+    if transaction_dict is not None:
+        try:
+            return transaction_dict['data']['payload']
 
         except Exception as e:
             print("err:", e)
@@ -125,14 +418,19 @@ def get_data_payload(payload_string):
         return {'msg': "err"}
 
 
-def get_state(sawtooth_address):
-    url = SawtoothConfig.REST_API + "/state/" + str(sawtooth_address)
-    response = requests.get(url)
-    if response.status_code == 200:
+async def get_state(client, cache, sawtooth_address, head=None):
+    if head is None:
+        head = await get_head(client, cache)
+    data = cache.get(sawtooth_address, head)
+    if data is not None:
+        return data
+
+    state_dict = await client.get("/state/" + str(sawtooth_address))
+    if state_dict is not None:
         try:
-            state_dict = json.loads(response.content)
             payload_string = state_dict['data']
-            data = deserialize_data(sawtooth_address, base64.b64decode(payload_string))[0]
+            data = deserialize_data(sawtooth_address, base64.b64decode(payload_string))[1]
+            cache.put(sawtooth_address, state_dict.get('head'), data)
 
             return data
 
@@ -141,6 +439,48 @@ def get_state(sawtooth_address):
             return {'msg': "err"}
 
 
+async def get_many(fetch, keys, concurrency=BATCH_READ_CONCURRENCY):
+    """Returns {key: (data, error)} for the distinct keys, running at most
+    `concurrency` fetches at a time. data is None when the key was not
+    found, error holds the message of a fetch that raised.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(key):
+        async with semaphore:
+            try:
+                return await fetch(key), None
+            except Exception as e:
+                error = getattr(e, 'message', None) or str(e)
+                LOGGER.warning(error)
+                return None, error
+
+    distinct = list(collections.OrderedDict.fromkeys(keys))
+    results = await asyncio.gather(*[fetch_one(key) for key in distinct])
+    return dict(zip(distinct, results))
+
+
+async def get_states(client, cache, addresses):
+    """Returns {address: (decoded state or None, error)}, every address
+    read at the same head block.
+    """
+    head = await get_head(client, cache)
+
+    async def fetch(address):
+        data = await get_state(client, cache, address, head)
+        if data == {'msg': "err"}:
+            raise StateQueryError("Failed to decode state at " + address)
+        return data
+
+    return await get_many(fetch, addresses)
+
+
+async def get_data_from_transactions(client, cache, transaction_ids):
+    """Returns {transaction id: (decoded payload or None, error)}."""
+    return await get_many(lambda transaction_id: get_data_from_transaction(client, cache, transaction_id),
+                          transaction_ids)
+
+
 def _parse_proto(proto_class, data):
     deserialized = proto_class()
     deserialized.ParseFromString(data)
@@ -173,43 +513,75 @@ def _convert_proto_to_dict(proto):
     return result
 
 
-def get_student_data(student_public_key):
-    url = SawtoothConfig.REST_API + "/state"
-    response = requests.get(url)
-    if response.status_code == 200:
-        try:
-            state_dict = json.loads(response.content)
-            # print(state_dict['data'])
-            cert = []
-            subjects = []
-            for state in state_dict['data']:
-                if addresser.is_owner(state['address'], student_public_key):
-                    deserialize = deserialize_data(state['address'], base64.b64decode(state['data']))[0]
-
-                    # get latest record data in record
-                    # latest_record_data = max(deserialize['record_data'], key=lambda obj: obj['timestamp'])
-                    record = {'address': state['address'], 'versions': []}
-
-                    for record_data in deserialize['versions']:
-                        record['versions'].append({
-                            'txid': record_data['transaction_id'],
-                            'timestamp': record_data['timestamp'],
-                            'type': record_data['record_status'],
-                            'cipher': record_data['cipher'],
-                            'hash': record_data['hash'],
-
-                        })
-                    if deserialize['record_type'] == 'CERTIFICATE':
-                        cert.append(record)
-                    elif deserialize['record_type'] == 'SUBJECT':
-                        subjects.append(record)
-
-            data = {'publicKeyHex': student_public_key,
-                    'certificate': cert,
-                    'subjects': subjects}
-            return data
+async def iter_state(client, address_prefix, limit=STATE_PAGE_SIZE):
+    """Yields (address, data) for every state entry under address_prefix,
+    fetching one page of the REST API at a time. Every page is read at the
+    head block of the first one, so the scan sees a single state root.
+    """
+    params = {'address': address_prefix, 'limit': limit}
+    while True:
+        page = await client.get("/state", params=params)
+        if page is None:
+            raise StateQueryError("Failed to list state under " + address_prefix)
+
+        for state in page['data']:
+            yield state['address'], base64.b64decode(state['data'])
+
+        next_position = page.get('paging', {}).get('next_position')
+        if not next_position:
+            return
+        params['head'] = page['head']
+        params['start'] = next_position
+
+
+async def _get_record_archives(client, record):
+    if not get_record_archive_addresses(record):
+        return []
+    prefix = addresser.get_record_archive_prefix(record['record_id'],
+                                                 record['owner_public_key'],
+                                                 record['manager_public_key'])
+    archives = []
+    async for address, data in iter_state(client, prefix):
+        archives.extend(deserialize_data(address, data)[1])
+    return archives
+
+
+async def get_student_data(client, student_public_key):
+    try:
+        cert = []
+        subjects = []
+        records = []
+        prefix = addresser.get_owner_record_prefix(student_public_key)
+        async for address, data in iter_state(client, prefix):
+            records.append((address, deserialize_data(address, data)[1][0]))
+
+        archives = await asyncio.gather(*[_get_record_archives(client, deserialize)
+                                          for _, deserialize in records])
+
+        for (address, deserialize), record_archives in zip(records, archives):
+            # get latest record data in record
+            # latest_record_data = max(deserialize['record_data'], key=lambda obj: obj['timestamp'])
+            record = {'address': address, 'versions': []}
+
+            for record_data in merge_record_versions(deserialize, record_archives):
+                record['versions'].append({
+                    'txid': record_data['transaction_id'],
+                    'timestamp': record_data['timestamp'],
+                    'type': record_data['record_status'],
+                    'cipher': record_data['cipher'],
+                    'hash': record_data['hash'],
+
+                })
+            if deserialize['record_type'] == 'CERTIFICATE':
+                cert.append(record)
+            elif deserialize['record_type'] == 'SUBJECT':
+                subjects.append(record)
+
+        data = {'publicKeyHex': student_public_key,
+                'certificate': cert,
+                'subjects': subjects}
+        return data
 
-        except Exception as e:
-            print("err:", e)
-            LOGGER.warning(e)
-            return {'msg': "err"}
+    except Exception as e:
+        LOGGER.warning(e)
+        return {'msg': "err"}
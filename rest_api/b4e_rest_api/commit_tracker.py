@@ -0,0 +1,227 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import asyncio
+import logging
+import time
+
+from sawtooth_rest_api.protobuf import client_batch_submit_pb2
+from sawtooth_rest_api.protobuf import client_event_pb2
+from sawtooth_rest_api.protobuf import events_pb2
+from sawtooth_rest_api.protobuf import validator_pb2
+
+from addressing.b4e_addressing.addresser import NAMESPACE
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds without a block commit event before the tracked batches are polled,
+# doubled after every poll that finds no batch done
+MIN_POLL_DELAY = 2
+MAX_POLL_DELAY = 30
+
+# seconds a batch may be reported UNKNOWN, while it is still on its way to
+# the validator that answers, before it is considered dropped
+UNKNOWN_GRACE = 10
+
+FINAL_STATUSES = (client_batch_submit_pb2.ClientBatchStatus.COMMITTED,
+                  client_batch_submit_pb2.ClientBatchStatus.INVALID)
+
+
+class CommitTracker(object):
+    """Resolves a future for every submitted batch once the validator reports
+    it committed or invalid, or still reports it unknown after UNKNOWN_GRACE
+    seconds.
+
+    The tracker subscribes to sawtooth/block-commit events, and to the
+    state-delta events of the b4e namespace, on the event connection of the
+    validator pool. When the pool fails over it subscribes again from the
+    last block seen, so the validator sends the events of the blocks
+    committed in between. On each new block it asks for the status of every
+    tracked batch and passes the events to the handlers added with
+    add_event_handler. The handlers added with add_reset_handler are called
+    when the subscription fails or the missed blocks cannot be replayed. If
+    no event arrives for a while the tracked batches are polled instead,
+    backing off up to MAX_POLL_DELAY.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._pool.add_failover_handler(self._resubscribe)
+        # batch id -> future resolved with its ClientBatchStatus
+        self._waiters = {}
+        # batch id -> time it was first reported UNKNOWN
+        self._unknown_since = {}
+        self._listener = None
+        self._event_handlers = []
+        self._reset_handlers = []
+        # id of the last block a block-commit event was received for
+        self._last_block_id = None
+
+    def add_event_handler(self, handler):
+        """Adds a handler called with the list of events of every block."""
+        self._event_handlers.append(handler)
+
+    def add_reset_handler(self, handler):
+        """Adds a handler called when events of some blocks may be missed."""
+        self._reset_handlers.append(handler)
+
+    async def start(self):
+        self._ensure_listener()
+        await self._subscribe()
+
+    async def _resubscribe(self):
+        # the listener is waiting on the connection that went down
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        self._ensure_listener()
+        await self._subscribe()
+
+    async def _subscribe(self):
+        block_sub = events_pb2.EventSubscription(event_type='sawtooth/block-commit')
+        delta_sub = events_pb2.EventSubscription(
+            event_type='sawtooth/state-delta',
+            filters=[events_pb2.EventFilter(
+                key='address',
+                match_string='^{}.*'.format(NAMESPACE),
+                filter_type=events_pb2.EventFilter.REGEX_ANY)])
+        request = client_event_pb2.ClientEventsSubscribeRequest(
+            subscriptions=[block_sub, delta_sub],
+            last_known_block_ids=[self._last_block_id] if self._last_block_id else [])
+        try:
+            validator_response = await self._pool.event_connection.send(
+                validator_pb2.Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+                request.SerializeToString())
+        except Exception as e:
+            LOGGER.warning('Block commit subscription failed, polling batch statuses: %s', e)
+            self._reset()
+            return
+        response = client_event_pb2.ClientEventsSubscribeResponse()
+        response.ParseFromString(validator_response.content)
+        if response.status == client_event_pb2.ClientEventsSubscribeResponse.UNKNOWN_BLOCK:
+            # the last block seen is not on the chain of this validator,
+            # the blocks in between cannot be replayed
+            LOGGER.warning('Block %s is unknown to the validator, subscribing from its head',
+                           self._last_block_id)
+            self._last_block_id = None
+            self._reset()
+            await self._subscribe()
+        elif response.status != client_event_pb2.ClientEventsSubscribeResponse.OK:
+            LOGGER.warning('Block commit subscription failed with status %s, polling batch statuses',
+                           client_event_pb2.ClientEventsSubscribeResponse.Status.Name(response.status))
+            self._reset()
+
+    def _reset(self):
+        for handler in self._reset_handlers:
+            try:
+                handler()
+            except Exception as e:
+                LOGGER.warning(e)
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+        request = client_event_pb2.ClientEventsUnsubscribeRequest()
+        try:
+            await self._pool.event_connection.send(
+                validator_pb2.Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST,
+                request.SerializeToString())
+        except Exception as e:
+            LOGGER.warning(e)
+
+    def track(self, batch_id):
+        """Returns a future resolved with the final ClientBatchStatus of the
+        batch. Batches must be tracked after they are submitted.
+        """
+        self._ensure_listener()
+        waiter = self._waiters.get(batch_id)
+        if waiter is None:
+            waiter = self._waiters[batch_id] = asyncio.get_event_loop().create_future()
+        return waiter
+
+    def forget(self, batch_id):
+        """Stops tracking a batch nobody waits for anymore."""
+        waiter = self._waiters.pop(batch_id, None)
+        if waiter is not None:
+            waiter.cancel()
+        self._unknown_since.pop(batch_id, None)
+        self._pool.forget(batch_id)
+
+    def _ensure_listener(self):
+        if self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def _listen(self):
+        delay = MIN_POLL_DELAY
+        while True:
+            try:
+                message = await asyncio.wait_for(self._pool.event_connection.receive(), delay)
+            except asyncio.TimeoutError:
+                if self._waiters and not await self._check_statuses():
+                    delay = min(delay * 2, MAX_POLL_DELAY)
+                else:
+                    delay = MIN_POLL_DELAY
+                continue
+
+            if message.message_type != validator_pb2.Message.CLIENT_EVENTS:
+                continue
+            delay = MIN_POLL_DELAY
+            self._handle_events(message.content)
+            if self._waiters:
+                await self._check_statuses()
+
+    def _handle_events(self, content):
+        event_list = events_pb2.EventList()
+        event_list.ParseFromString(content)
+        for event in event_list.events:
+            if event.event_type == 'sawtooth/block-commit':
+                for attribute in event.attributes:
+                    if attribute.key == 'block_id':
+                        self._last_block_id = attribute.value
+        for handler in self._event_handlers:
+            try:
+                handler(event_list.events)
+            except Exception as e:
+                LOGGER.warning(e)
+
+    async def _check_statuses(self):
+        """Resolves the tracked batches that are done and returns how many
+        there were.
+        """
+        try:
+            batch_statuses = await self._pool.batch_statuses(list(self._waiters))
+        except Exception as e:
+            LOGGER.warning(e)
+            return 0
+
+        done = 0
+        now = time.monotonic()
+        for batch_status in batch_statuses:
+            if batch_status.status == client_batch_submit_pb2.ClientBatchStatus.UNKNOWN:
+                since = self._unknown_since.setdefault(batch_status.batch_id, now)
+                if now - since < UNKNOWN_GRACE:
+                    continue
+            elif batch_status.status not in FINAL_STATUSES:
+                self._unknown_since.pop(batch_status.batch_id, None)
+                continue
+            self._unknown_since.pop(batch_status.batch_id, None)
+            self._pool.forget(batch_status.batch_id)
+            waiter = self._waiters.pop(batch_status.batch_id, None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(batch_status)
+                done += 1
+        return done
@@ -74,3 +74,14 @@ class ApiUnauthorized(_ApiError):
         self.status_code = 401
         self.message = 'Unauthorized: ' + message
         super().__init__()
+
+
+class ApiBadGateway(_ApiError):
+    def __init__(self, message):
+        self.status_code = 502
+        self.message = 'Bad Gateway: ' + message
+        super().__init__()
+
+
+class ApiCommitTimeout(ApiInternalError):
+    """Raised when submitted batches are not committed in time."""
@@ -16,6 +16,7 @@
 import argparse
 import asyncio
 import logging
+import multiprocessing
 import sys
 
 import aiohttp_cors
@@ -27,6 +28,7 @@ from sawtooth_sdk.processor.log import init_console_logging
 
 from aiohttp import web
 
+from rest_api.b4e_rest_api.route_handler.async_job_route_handler import AsyncJobRouteHandler
 from rest_api.b4e_rest_api.route_handler.job_route_handler import JobRouteHandler
 from rest_api.b4e_rest_api.route_handler.route_handler import RouteHandler
 from rest_api.b4e_rest_api.route_handler.actor_route_handler import ActorRouteHandler
@@ -35,8 +37,22 @@ from rest_api.b4e_rest_api.route_handler.class_route_handler import ClassRouteHa
 from rest_api.b4e_rest_api.route_handler.record_route_handler import RecordRouteHandler
 from rest_api.b4e_rest_api.route_handler.student_route_handler import StudentRouteHandler
 from rest_api.b4e_rest_api.route_handler.voting_route_handler import VotingRouteHandler
+from rest_api.b4e_rest_api.async_jobs import AsyncJobStore
+from rest_api.b4e_rest_api.async_jobs import async_mode_middleware
+from rest_api.b4e_rest_api.blockchain_get_data import SawtoothRestClient
+from rest_api.b4e_rest_api.blockchain_get_data import PayloadCache
+from rest_api.b4e_rest_api.blockchain_get_data import StateCache
+from rest_api.b4e_rest_api.blockchain_get_data import BlockIndex
+from rest_api.b4e_rest_api.blockchain_get_data import open_rest_client
+from rest_api.b4e_rest_api.blockchain_get_data import close_rest_client
+from rest_api.b4e_rest_api.blockchain_get_data import DEFAULT_TIMEOUT
+from rest_api.b4e_rest_api.blockchain_get_data import DEFAULT_CONNECTIONS
+from rest_api.b4e_rest_api.blockchain_get_data import DEFAULT_BLOCK_INDEX_SIZE
+from rest_api.b4e_rest_api.blockchain_get_data import DEFAULT_PAYLOAD_CACHE_SIZE
+from rest_api.b4e_rest_api.blockchain_get_data import DEFAULT_STATE_CACHE_SIZE
 from rest_api.b4e_rest_api.database import Database
 from rest_api.b4e_rest_api.messaging import Messenger
+from rest_api.b4e_rest_api.transaction_creation import signing
 
 from config.config import SawtoothConfig, MongoDBConfig
 
@@ -53,7 +69,8 @@ def parse_args(args):
         default='localhost:8000')
     parser.add_argument(
         '-C', '--connect',
-        help='specify URL to connect to a running validator',
+        help='specify URL to connect to a running validator, or a comma separated '
+             'list of URLs to spread submissions over several validators',
         default='tcp://localhost:4004')
     parser.add_argument(
         '-R', '--restapi',
@@ -63,6 +80,58 @@ def parse_args(args):
         '-t', '--timeout',
         help='set time (in seconds) to wait for a validator response',
         default=500)
+    parser.add_argument(
+        '--restapi-timeout',
+        help='set time (in seconds) to wait for a Sawtooth REST API response',
+        type=float,
+        default=DEFAULT_TIMEOUT)
+    parser.add_argument(
+        '--restapi-connections',
+        help='maximum number of open connections to the Sawtooth REST API',
+        type=int,
+        default=DEFAULT_CONNECTIONS)
+    parser.add_argument(
+        '--payload-cache-size',
+        help='number of decoded transaction payloads kept in memory',
+        type=int,
+        default=DEFAULT_PAYLOAD_CACHE_SIZE)
+    parser.add_argument(
+        '--payload-cache-path',
+        help='dbm file keeping the payloads evicted from memory, '
+             'by default they are dropped',
+        default='')
+    parser.add_argument(
+        '--state-cache-size',
+        help='number of decoded state entries kept between blocks',
+        type=int,
+        default=DEFAULT_STATE_CACHE_SIZE)
+    parser.add_argument(
+        '--block-index-size',
+        help='number of addresses indexed to the transaction writing them in '
+             'recent blocks, 0 only indexes blocks when they are looked up',
+        type=int,
+        default=DEFAULT_BLOCK_INDEX_SIZE)
+    parser.add_argument(
+        '--submit-window',
+        help='maximum number of batches in flight to the validator per bulk request',
+        type=int,
+        default=SawtoothConfig.SUBMIT_WINDOW)
+    parser.add_argument(
+        '--max-batch-size',
+        help='maximum number of transactions packed in one batch',
+        type=int,
+        default=SawtoothConfig.MAX_BATCH_SIZE)
+    parser.add_argument(
+        '--max-batch-bytes',
+        help='maximum size in bytes of the transactions packed in one batch',
+        type=int,
+        default=SawtoothConfig.MAX_BATCH_BYTES)
+    parser.add_argument(
+        '--signing-workers',
+        help='number of processes signing the transactions of bulk requests, '
+             'below 2 signs on the server process',
+        type=int,
+        default=multiprocessing.cpu_count())
     parser.add_argument(
         '--db-name',
         help='The name of the database',
@@ -92,20 +161,43 @@ def parse_args(args):
     return parser.parse_args(args)
 
 
-def start_rest_api(host, port, messenger, database):
+async def start_commit_tracker(app):
+    await app['messenger'].start_commit_tracker()
+
+
+async def stop_commit_tracker(app):
+    await app['messenger'].stop_commit_tracker()
+
+
+def start_rest_api(host, port, messenger, database, rest_client, payload_cache, state_cache, block_index):
     nest_asyncio.apply()
     loop = asyncio.get_event_loop()
     asyncio.ensure_future(database.connect())
 
-    app = web.Application(loop=loop)
+    app = web.Application(loop=loop, middlewares=[async_mode_middleware])
     # WARNING: UNSAFE KEY STORAGE
     # In a production application these keys should be passed in more securely
     app['aes_key'] = 'ffffffffffffffffffffffffffffffff'
     app['secret_key'] = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ1234567890'
 
+    app['sawtooth_rest'] = rest_client
+    app['payload_cache'] = payload_cache
+    app['state_cache'] = state_cache
+    app['block_index'] = block_index
+    app['async_jobs'] = AsyncJobStore()
+    app.on_startup.append(open_rest_client)
+    app.on_cleanup.append(close_rest_client)
+
     messenger.open_validator_connection()
     messenger.open_db_collection()
 
+    app['messenger'] = messenger
+    messenger.add_event_handler(state_cache.handle_events)
+    messenger.add_reset_handler(state_cache.reset)
+    messenger.add_event_handler(block_index.handle_events)
+    app.on_startup.append(start_commit_tracker)
+    app.on_cleanup.append(stop_commit_tracker)
+
     handler = RouteHandler(loop, messenger, database)
     actor_handler = ActorRouteHandler(loop, messenger, database)
     blockchain_handler = BlockchainRouteHandler(loop, messenger, database)
@@ -114,6 +206,7 @@ def start_rest_api(host, port, messenger, database):
     student_handler = StudentRouteHandler(loop, messenger, database)
     voting_handler = VotingRouteHandler(loop, messenger, database)
     job_handler = JobRouteHandler(loop, messenger, database)
+    async_job_handler = AsyncJobRouteHandler(loop, messenger, database)
 
     handler.add_route(app)
     actor_handler.add_route(app)
@@ -123,6 +216,7 @@ def start_rest_api(host, port, messenger, database):
     student_handler.add_route(app)
     voting_handler.add_route(app)
     job_handler.add_route(app)
+    async_job_handler.add_route(app)
 
     cors = aiohttp_cors.setup(app, defaults={
         "*": aiohttp_cors.ResourceOptions(
@@ -154,17 +248,29 @@ def main():
 
         init_console_logging(verbose_level=opts.verbose)
 
-        validator_url = opts.connect
-        if "tcp://" not in validator_url:
-            validator_url = "tcp://" + validator_url
+        validator_urls = []
+        for validator_url in opts.connect.split(','):
+            if "tcp://" not in validator_url:
+                validator_url = "tcp://" + validator_url
+            validator_urls.append(validator_url)
 
         restapi = opts.restapi
         if "http://" not in restapi:
             restapi = "http://" + restapi
 
         SawtoothConfig.REST_API = restapi
-
-        messenger = Messenger(validator_url)
+        SawtoothConfig.SUBMIT_WINDOW = opts.submit_window
+        SawtoothConfig.MAX_BATCH_SIZE = opts.max_batch_size
+        SawtoothConfig.MAX_BATCH_BYTES = opts.max_batch_bytes
+
+        messenger = Messenger(validator_urls)
+        rest_client = SawtoothRestClient(
+            restapi,
+            timeout=opts.restapi_timeout,
+            connections=opts.restapi_connections)
+        payload_cache = PayloadCache(opts.payload_cache_size, opts.payload_cache_path)
+        state_cache = StateCache(opts.state_cache_size)
+        block_index = BlockIndex(rest_client, opts.block_index_size)
 
         MongoDBConfig.USER_NAME = opts.db_user
         MongoDBConfig.PASSWORD = opts.db_password
@@ -186,13 +292,15 @@ def main():
                   " host:port".format(opts.bind))
             sys.exit(1)
 
-        start_rest_api(host, port, messenger, database)
+        signing.start_pool(opts.signing_workers)
+        start_rest_api(host, port, messenger, database, rest_client, payload_cache, state_cache, block_index)
     except Exception as err:  # pylint: disable=broad-except
         LOGGER.exception(err)
         sys.exit(1)
     finally:
         database.disconnect()
         messenger.close_validator_connection()
+        signing.stop_pool()
 
 
 if __name__ == '__main__':
@@ -206,6 +314,13 @@ if __name__ == '__main__':
 
         validator_url = 'tcp://0.0.0.0:4004'
         messenger = Messenger(validator_url)
+        rest_client = SawtoothRestClient(
+            SawtoothConfig.REST_API,
+            timeout=opts.restapi_timeout,
+            connections=opts.restapi_connections)
+        payload_cache = PayloadCache(opts.payload_cache_size, opts.payload_cache_path)
+        state_cache = StateCache(opts.state_cache_size)
+        block_index = BlockIndex(rest_client, opts.block_index_size)
 
         database = Database(
             opts.db_host,
@@ -223,10 +338,12 @@ if __name__ == '__main__':
                   " host:port".format(opts.bind))
             sys.exit(1)
 
-        start_rest_api(host, port, messenger, database)
+        signing.start_pool(opts.signing_workers)
+        start_rest_api(host, port, messenger, database, rest_client, payload_cache, state_cache, block_index)
     except Exception as err:  # pylint: disable=broad-except
         LOGGER.exception(err)
         sys.exit(1)
     finally:
         database.disconnect()
         messenger.close_validator_connection()
+        signing.stop_pool()
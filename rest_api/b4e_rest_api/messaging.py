@@ -13,16 +13,17 @@
 # limitations under the License.
 # ------------------------------------------------------------------------------
 
-from sawtooth_rest_api.messaging import Connection
 from sawtooth_rest_api.protobuf import client_batch_submit_pb2
-from sawtooth_rest_api.protobuf import validator_pb2
 
 from sawtooth_signing import create_context
 from sawtooth_signing import CryptoFactory
-from sawtooth_signing import secp256k1
 
+from rest_api.b4e_rest_api import async_jobs
+from rest_api.b4e_rest_api.commit_tracker import CommitTracker
 from rest_api.b4e_rest_api.errors import ApiBadRequest
+from rest_api.b4e_rest_api.errors import ApiCommitTimeout
 from rest_api.b4e_rest_api.errors import ApiInternalError
+from rest_api.b4e_rest_api.signer_cache import SignerCache
 from rest_api.b4e_rest_api.transaction_creation import transaction_creation
 from rest_api.b4e_rest_api.transaction_creation import actor_transaction
 from rest_api.b4e_rest_api.transaction_creation import b4e_enviroment_transaction
@@ -31,9 +32,13 @@ from rest_api.b4e_rest_api.transaction_creation import portfolio_transaction
 from rest_api.b4e_rest_api.transaction_creation import record_transaction
 from rest_api.b4e_rest_api.transaction_creation import voting_transaction
 from rest_api.b4e_rest_api.transaction_creation import job_transaction
+from rest_api.b4e_rest_api.validator_pool import ValidatorPool
+from rest_api.b4e_rest_api.validator_pool import ValidatorUnavailableError
 
 import logging
 import asyncio
+import collections
+import functools
 import time
 import datetime
 import uuid
@@ -43,6 +48,17 @@ import nest_asyncio
 
 LOGGER = logging.getLogger(__name__)
 
+# seconds a submitted batch may stay pending before the submission fails
+COMMIT_TIMEOUT = 300
+# times a batch dropped by the validator is submitted again
+MAX_RESUBMITS = 3
+
+# outcome of one submitted transaction, status being COMMITTED, INVALID,
+# TIMEOUT or FAILED, error set unless it is COMMITTED
+TransactionResult = collections.namedtuple('TransactionResult', ['transaction_id', 'status', 'error'])
+# seconds to back off when the validator queue is full and nothing is in flight
+QUEUE_FULL_DELAY = 0.5
+
 from pymongo import MongoClient
 
 import sys
@@ -57,18 +73,35 @@ sys.setrecursionlimit(10 ** 6)
 
 
 class Messenger(object):
-    def __init__(self, validator_url):
-        self._connection = Connection(validator_url)
+    def __init__(self, validator_urls):
+        if isinstance(validator_urls, str):
+            validator_urls = [validator_urls]
+        self._validators = ValidatorPool(validator_urls)
+        self._commit_tracker = CommitTracker(self._validators)
         self._context = create_context('secp256k1')
         self._crypto_factory = CryptoFactory(self._context)
+        self._signers = SignerCache(self._context)
         self._batch_signer = self._crypto_factory.new_signer(
             self._context.new_random_private_key())
 
     def open_validator_connection(self):
-        self._connection.open()
+        self._validators.open()
 
     def close_validator_connection(self):
-        self._connection.close()
+        self._validators.close()
+
+    async def start_commit_tracker(self):
+        self._validators.start_health_check()
+        await self._commit_tracker.start()
+
+    async def stop_commit_tracker(self):
+        await self._commit_tracker.stop()
+
+    def add_event_handler(self, handler):
+        self._commit_tracker.add_event_handler(handler)
+
+    def add_reset_handler(self, handler):
+        self._commit_tracker.add_reset_handler(handler)
 
     def open_db_collection(self):
         try:
@@ -100,8 +133,7 @@ class Messenger(object):
 
     async def send_set_b4e_environment(self, timestamp):
         public_key, private_key = self.get_new_key_pair()
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch = b4e_enviroment_transaction.make_set_b4e_environment(transaction_signer, timestamp)
 
         await self._send_and_wait_for_commit(batch)
@@ -110,8 +142,7 @@ class Messenger(object):
                                       profile,
                                       timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_create_institution(transaction_signer,
@@ -126,8 +157,7 @@ class Messenger(object):
                                   profile,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_create_teacher(transaction_signer,
@@ -142,23 +172,22 @@ class Messenger(object):
                                    profiles,
                                    timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
-        list_batches = actor_transaction.make_create_teachers(transaction_signer,
-                                                              batch_signer,
-                                                              profiles,
-                                                              timestamp)
+        list_batches, row_map = await self._build_batches(actor_transaction.make_create_teachers,
+                                                          transaction_signer,
+                                                          batch_signer,
+                                                          profiles,
+                                                          timestamp)
 
-        list_transaction_id = await self.submit_multi_batches(list_batches)
-        return list_transaction_id
+        results = await self.submit_multi_batches(list_batches)
+        return _row_results(results, row_map)
 
     async def send_update_profile(self, private_key,
                                   profile,
                                   timestamp):
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_update_profile(transaction_signer,
@@ -172,8 +201,7 @@ class Messenger(object):
     async def send_reject_institution(self, private_key,
                                       institution_public_key,
                                       timestamp):
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_reject_institution(transaction_signer,
@@ -187,8 +215,7 @@ class Messenger(object):
     async def send_active_institution(self, private_key,
                                       institution_public_key,
                                       timestamp):
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_active_institution(transaction_signer,
@@ -207,8 +234,7 @@ class Messenger(object):
                                 student_public_keys,
                                 timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = class_transaction.make_create_class(transaction_signer,
@@ -227,20 +253,19 @@ class Messenger(object):
                                   classes,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
-        list_batches = class_transaction.make_create_classes(transaction_signer,
-                                                             batch_signer,
-                                                             classes,
-                                                             timestamp)
-        list_transaction_id = await self.submit_multi_batches(list_batches)
-        return list_transaction_id
+        list_batches, row_map = await self._build_batches(class_transaction.make_create_classes,
+                                                          transaction_signer,
+                                                          batch_signer,
+                                                          classes,
+                                                          timestamp)
+        results = await self.submit_multi_batches(list_batches)
+        return _row_results(results, row_map)
 
     async def send_create_edu_program(self, private_key, student_public_key, edu_program, timestamp):
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = portfolio_transaction.make_create_edu_program(transaction_signer,
@@ -252,16 +277,15 @@ class Messenger(object):
         return list_transaction_id
 
     async def send_create_edu_programs(self, private_key, profiles, timestamp):
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key)
-        )
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
-        list_batches = portfolio_transaction.make_create_edu_programs(transaction_signer,
-                                                                      batch_signer,
-                                                                      profiles,
-                                                                      timestamp)
-        list_transaction_id = await self.submit_multi_batches(list_batches)
-        return list_transaction_id
+        list_batches, row_map = await self._build_batches(portfolio_transaction.make_create_edu_programs,
+                                                          transaction_signer,
+                                                          batch_signer,
+                                                          profiles,
+                                                          timestamp)
+        results = await self.submit_multi_batches(list_batches)
+        return _row_results(results, row_map)
 
     async def send_create_record(self, private_key,
                                  owner_public_key,
@@ -272,8 +296,7 @@ class Messenger(object):
                                  record_hash,
                                  timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_create_record(transaction_signer,
@@ -298,8 +321,7 @@ class Messenger(object):
                                   record_hash,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_create_subject(transaction_signer,
@@ -321,18 +343,18 @@ class Messenger(object):
                                    list_subjects,
                                    timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
-        list_batches = record_transaction.make_create_subjects(transaction_signer,
-                                                               batch_signer,
-                                                               manager_public_key,
-                                                               class_id,
-                                                               list_subjects,
-                                                               timestamp)
-        list_transaction_id = await self.submit_multi_batches(list_batches)
-        return list_transaction_id
+        list_batches, row_map = await self._build_batches(record_transaction.make_create_subjects,
+                                                          transaction_signer,
+                                                          batch_signer,
+                                                          manager_public_key,
+                                                          class_id,
+                                                          list_subjects,
+                                                          timestamp)
+        results = await self.submit_multi_batches(list_batches)
+        return _row_results(results, row_map)
 
     async def send_create_cert(self, private_key,
                                owner_public_key,
@@ -342,8 +364,7 @@ class Messenger(object):
                                record_hash,
                                timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_create_cert(transaction_signer,
@@ -362,17 +383,17 @@ class Messenger(object):
                                 certs,
                                 timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
-        list_batches = record_transaction.make_create_certs(transaction_signer,
-                                                            batch_signer,
-                                                            certs,
-                                                            timestamp)
+        list_batches, row_map = await self._build_batches(record_transaction.make_create_certs,
+                                                          transaction_signer,
+                                                          batch_signer,
+                                                          certs,
+                                                          timestamp)
 
-        list_transaction_id = await self.submit_multi_batches(list_batches)
-        return list_transaction_id
+        results = await self.submit_multi_batches(list_batches)
+        return _row_results(results, row_map)
 
     async def send_update_record(self, private_key,
                                  owner_public_key,
@@ -382,8 +403,7 @@ class Messenger(object):
                                  status,
                                  timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_update_record(transaction_signer,
@@ -406,8 +426,7 @@ class Messenger(object):
                                   record_hash,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_modify_subject(transaction_signer,
@@ -429,8 +448,7 @@ class Messenger(object):
                                record_hash,
                                timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_modify_cert(transaction_signer,
@@ -449,8 +467,7 @@ class Messenger(object):
                                record_id,
                                timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_revoke_cert(transaction_signer,
@@ -467,8 +484,7 @@ class Messenger(object):
                                  record_id,
                                  timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = record_transaction.make_reactive_cert(transaction_signer,
@@ -485,8 +501,7 @@ class Messenger(object):
                                decision,
                                timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = voting_transaction.make_create_vote(transaction_signer,
@@ -503,8 +518,7 @@ class Messenger(object):
                                  vote_type,
                                  timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = voting_transaction.make_create_voting(transaction_signer,
@@ -523,8 +537,7 @@ class Messenger(object):
                                      address,
                                      timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = transaction_creation.make_update_actor_info(transaction_signer,
@@ -542,8 +555,7 @@ class Messenger(object):
                                   profile,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = actor_transaction.make_create_company(transaction_signer,
@@ -562,8 +574,7 @@ class Messenger(object):
                               record_hash,
                               timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = job_transaction.make_create_job(transaction_signer,
@@ -584,8 +595,7 @@ class Messenger(object):
                                   job_id,
                                   timestamp):
 
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        transaction_signer = self._signers.get(private_key)
         batch_signer = transaction_signer
 
         batch = job_transaction.make_update_job_end(transaction_signer,
@@ -606,8 +616,7 @@ class Messenger(object):
 
         institution_private_key = Test.INSTITUTION_PRIVATE_KEY
         # make signer
-        transaction_signer = self._crypto_factory.new_signer(
-            secp256k1.Secp256k1PrivateKey.from_hex(institution_private_key))
+        transaction_signer = self._signers.get(institution_private_key)
         batch_signer = transaction_signer
         certs = []
 
@@ -622,10 +631,10 @@ class Messenger(object):
                 "hashData": Test.HASH_DATA
             })
 
-        list_batches = transaction_creation.make_create_certs(transaction_signer=transaction_signer,
-                                                              batch_signer=batch_signer,
-                                                              certs=certs,
-                                                              timestamp=self.get_time())
+        list_batches, _ = transaction_creation.make_create_certs(transaction_signer=transaction_signer,
+                                                                 batch_signer=batch_signer,
+                                                                 certs=certs,
+                                                                 timestamp=self.get_time())
         nest_asyncio.apply()
         loop = asyncio.get_event_loop()
         # futures = []
@@ -671,88 +680,139 @@ class Messenger(object):
         dts = datetime.datetime.utcnow()
         return round(time.mktime(dts.timetuple()) + dts.microsecond / 1e6)
 
-    async def submit_multi_batches(self, list_batches):
-        nest_asyncio.apply()
-        loop = asyncio.get_event_loop()
-        # futures = []
-        list_transaction_id = []
-
-        for batch in list_batches:
-            await self._send_and_wait_for_commit(batch)
-            # futures.append(self._send_and_wait_for_commit(batch))
-            for transaction in batch.transactions:
-                list_transaction_id.append(transaction.header_signature)
+    async def _build_batches(self, make_batches, *args):
+        # bulk builders sign thousands of transactions, keep that off the event loop
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(make_batches, *args))
+
+    async def submit_multi_batches(self, list_batches, window=None):
+        """Submits the batches keeping up to `window` of them in flight at
+        once, and waits until each one is committed, invalid, dropped or
+        timed out. A failed batch does not stop the others. Returns a
+        TransactionResult per transaction, in input order.
+        """
+        window = window or SawtoothConfig.SUBMIT_WINDOW
+        waiting = collections.deque(list_batches)
+        # batch id -> (batch, commit future, first submit time)
+        in_flight = collections.OrderedDict()
+        first_submitted = {}
+        resubmits = collections.Counter()
+        # batch id -> TransactionResult of each of its transactions
+        results = {}
+
+        while waiting or in_flight:
+            while waiting and len(in_flight) < window:
+                batch = waiting[0]
+                try:
+                    submit_response = await self._validators.submit_batch(batch)
+                except ValidatorUnavailableError as e:
+                    # nothing can be sent, fail the batches left
+                    while waiting:
+                        failed = waiting.popleft()
+                        results[failed.header_signature] = _batch_results(failed, async_jobs.FAILED, str(e))
+                    break
+                status = submit_response.status
+                if status == client_batch_submit_pb2.ClientBatchSubmitResponse.QUEUE_FULL:
+                    # validator queues are full, let in flight batches drain
+                    break
+                waiting.popleft()
+                if status == client_batch_submit_pb2.ClientBatchSubmitResponse.INVALID_BATCH:
+                    results[batch.header_signature] = _batch_results(
+                        batch, async_jobs.INVALID, 'Batch ' + batch.header_signature + ' is invalid')
+                elif status != client_batch_submit_pb2.ClientBatchSubmitResponse.OK:
+                    results[batch.header_signature] = _batch_results(
+                        batch, async_jobs.FAILED, 'Something went wrong. Try again later')
+                else:
+                    in_flight[batch.header_signature] = (
+                        batch, self._commit_tracker.track(batch.header_signature),
+                        first_submitted.setdefault(batch.header_signature, time.time()))
+            if not waiting and in_flight:
+                # every batch is with the validator, an async mode request
+                # can be answered now
+                async_jobs.mark_submitted()
+
+            if not in_flight:
+                if waiting:
+                    await asyncio.sleep(QUEUE_FULL_DELAY)
+                continue
 
-        # loop.run_until_complete(asyncio.wait(futures))
-        # loop.run_until_complete(asyncio.wait([self._send_and_wait_for_commit_multi_batches(list_batches)], timeout=None,
-        #                                      return_when=asyncio.ALL_COMPLETED))
-        return list_transaction_id
+            oldest = min(submitted for _, _, submitted in in_flight.values())
+            await asyncio.wait([waiter for _, waiter, _ in in_flight.values()],
+                               timeout=max(oldest + COMMIT_TIMEOUT - time.time(), 0),
+                               return_when=asyncio.FIRST_COMPLETED)
+
+            resubmit = []
+            for batch_id, (batch, waiter, submitted) in list(in_flight.items()):
+                if not waiter.done():
+                    if time.time() - submitted >= COMMIT_TIMEOUT:
+                        del in_flight[batch_id]
+                        self._commit_tracker.forget(batch_id)
+                        results[batch_id] = _batch_results(
+                            batch, async_jobs.TIMEOUT, 'Transaction submitted but timed out')
+                    continue
+                del in_flight[batch_id]
+                batch_status = waiter.result()
+                if batch_status.status == client_batch_submit_pb2.ClientBatchStatus.COMMITTED:
+                    results[batch_id] = _batch_results(batch, async_jobs.COMMITTED)
+                elif batch_status.status == client_batch_submit_pb2.ClientBatchStatus.INVALID:
+                    results[batch_id] = _invalid_batch_results(batch, batch_status)
+                elif resubmits[batch_id] < MAX_RESUBMITS:
+                    # dropped by the validator before it was committed
+                    resubmits[batch_id] += 1
+                    resubmit.append(batch)
+                else:
+                    results[batch_id] = _batch_results(
+                        batch, async_jobs.FAILED, 'Transaction dropped by the validator, try again later')
+            waiting.extendleft(reversed(resubmit))
+
+        return [result for batch in list_batches for result in results[batch.header_signature]]
 
     async def _send_and_wait_for_commit(self, batch):
-        # Send transaction to validator
-        while (True):
-            submit_request = client_batch_submit_pb2.ClientBatchSubmitRequest(
-                batches=[batch])
-            await self._connection.send(
-                validator_pb2.Message.CLIENT_BATCH_SUBMIT_REQUEST,
-                submit_request.SerializeToString())
-
-            # Send status request to validator
-            batch_id = batch.header_signature
-            status_request = client_batch_submit_pb2.ClientBatchStatusRequest(
-                batch_ids=[batch_id], wait=True)
-            validator_response = await self._connection.send(
-                validator_pb2.Message.CLIENT_BATCH_STATUS_REQUEST,
-                status_request.SerializeToString())
-
-            # Parse response
-            status_response = client_batch_submit_pb2.ClientBatchStatusResponse()
-            status_response.ParseFromString(validator_response.content)
-            status = status_response.batch_statuses[0].status
-            if status == client_batch_submit_pb2.ClientBatchStatus.INVALID:
-                error = status_response.batch_statuses[0].invalid_transactions[0]
-                raise ApiBadRequest(error.message)
-            elif status == client_batch_submit_pb2.ClientBatchStatus.PENDING:
-                raise ApiInternalError('Transaction submitted but timed out')
-            elif status == client_batch_submit_pb2.ClientBatchStatus.UNKNOWN:
-                # raise ApiInternalError('Something went wrong. Try again later')
-                continue
-            elif status == client_batch_submit_pb2.ClientBatchStatus.COMMITTED:
-                break
+        raise_for_results(await self.submit_multi_batches([batch], window=1))
 
     async def _send_and_wait_for_commit_multi_batches(self, batches):
-        # Send transaction to validator
-        while (True):
-            submit_request = client_batch_submit_pb2.ClientBatchSubmitRequest(
-                batches=batches)
-
-            response_submit = await self._connection.send(
-                validator_pb2.Message.CLIENT_BATCH_SUBMIT_REQUEST,
-                submit_request.SerializeToString())
-
-            # Send status request to validator
-            batch_ids = []
-            for batch in batches:
-                batch_ids.append(batch.header_signature)
-
-            status_request = client_batch_submit_pb2.ClientBatchStatusRequest(
-                batch_ids=batch_ids, wait=True)
-            validator_response = await self._connection.send(
-                validator_pb2.Message.CLIENT_BATCH_STATUS_REQUEST,
-                status_request.SerializeToString())
-
-            # Parse response
-            status_response = client_batch_submit_pb2.ClientBatchStatusResponse()
-            status_response.ParseFromString(validator_response.content)
-
-            status = status_response.batch_statuses[0].status
-            if status == client_batch_submit_pb2.ClientBatchStatus.INVALID:
-                error = status_response.batch_statuses[0].invalid_transactions[0]
-                raise ApiBadRequest(error.message)
-            elif status == client_batch_submit_pb2.ClientBatchStatus.PENDING:
-                raise ApiInternalError('Transaction submitted but timed out')
-            elif status == client_batch_submit_pb2.ClientBatchStatus.UNKNOWN:
-                # raise ApiInternalError('Something went wrong. Try again later')
-                continue
-            elif status == client_batch_submit_pb2.ClientBatchStatus.COMMITTED:
-                break
+        await self.submit_multi_batches(batches, window=len(batches))
+
+
+def raise_for_results(results):
+    """Raises the API error of the transactions not committed, if any. An
+    invalid transaction is reported first, then a timeout.
+    """
+    failed = [result for result in results if result.status != async_jobs.COMMITTED]
+    if not failed:
+        return
+    for status, error_class in ((async_jobs.INVALID, ApiBadRequest),
+                                (async_jobs.TIMEOUT, ApiCommitTimeout)):
+        for result in failed:
+            if result.status == status:
+                raise error_class(result.error)
+    raise ApiInternalError(failed[0].error)
+
+
+def _batch_results(batch, status, error=None):
+    return [TransactionResult(transaction.header_signature, status, error)
+            for transaction in batch.transactions]
+
+
+def _invalid_batch_results(batch, batch_status):
+    # the batch is rejected as a whole, only the transactions reported
+    # invalid are at fault
+    errors = {invalid.transaction_id: invalid.message for invalid in batch_status.invalid_transactions}
+    culprit = next(iter(errors), None)
+    results = []
+    for transaction in batch.transactions:
+        if transaction.header_signature in errors:
+            results.append(TransactionResult(transaction.header_signature, async_jobs.INVALID,
+                                             errors[transaction.header_signature] or 'Transaction is invalid'))
+        elif culprit is None:
+            results.append(TransactionResult(transaction.header_signature, async_jobs.INVALID,
+                                             'Batch ' + batch.header_signature + ' is invalid'))
+        else:
+            results.append(TransactionResult(transaction.header_signature, async_jobs.FAILED,
+                                             'Rejected with invalid transaction ' + culprit + ' of its batch'))
+    return results
+
+
+def _row_results(results, row_map):
+    by_transaction = {result.transaction_id: result for result in results}
+    return [by_transaction[transaction_id] for _, transaction_id in row_map]
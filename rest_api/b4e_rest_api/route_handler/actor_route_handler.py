@@ -2,9 +2,7 @@ import logging
 
 from aiohttp.web import json_response
 
-from config.config import SawtoothConfig
-from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, tolist, slice_per, \
-    get_time
+from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, get_time, bulk_response, stream_bulk
 
 LOGGER = logging.getLogger(__name__)
 
@@ -62,24 +60,29 @@ class ActorRouteHandler(object):
         for profile in profiles:
             validate_fields(required_fields, profile)
 
-        list_transaction_id = await self._messenger.send_create_teachers(private_key=body.get('privateKeyHex'),
-                                                                         profiles=profiles,
-                                                                         timestamp=get_time())
-        list_teachers = tolist(slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE))
+        results = await self._messenger.send_create_teachers(private_key=body.get('privateKeyHex'),
+                                                             profiles=profiles,
+                                                             timestamp=get_time())
+        list_teachers = profiles
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
-                "teacherId": list_teachers[i].get("teacherId"),
-                "transactionId": list_transaction_id[i]
+                "teacherId": list_teachers[i].get("teacherId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
+        return bulk_response(transactions, results)
 
-            })
+    async def create_teachers_stream(self, request):
+        return await stream_bulk(request,
+                                 envelope_fields=['privateKeyHex'],
+                                 row_fields=['teacherId', 'publicKey'],
+                                 result_fields=['teacherId'],
+                                 send_rows=self._send_teachers)
+
+    async def _send_teachers(self, envelope, profiles, timestamp):
+        return await self._messenger.send_create_teachers(private_key=envelope.get('privateKeyHex'),
+                                                          profiles=profiles,
+                                                          timestamp=timestamp)
 
     async def create_company(self, request):
         body = await decode_request(request)
@@ -105,4 +108,5 @@ class ActorRouteHandler(object):
         app.router.add_post('/staff/register', self.create_institution)
         app.router.add_post('/staff/create-teacher', self.create_teacher)
         app.router.add_post('/staff/create-teachers', self.create_teachers)
+        app.router.add_post('/staff/create-teachers/stream', self.create_teachers_stream)
         app.router.add_post('/company/register', self.create_company)
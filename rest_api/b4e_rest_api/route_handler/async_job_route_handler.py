@@ -0,0 +1,70 @@
+import asyncio
+import json
+import logging
+
+from aiohttp.web import json_response
+from aiohttp.web import StreamResponse
+
+from rest_api.b4e_rest_api.errors import ApiBadRequest
+from rest_api.b4e_rest_api.errors import ApiNotFound
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds between keep-alive comments on the event stream
+HEARTBEAT_INTERVAL = 15
+
+
+class AsyncJobRouteHandler(object):
+    def __init__(self, loop, messenger, database):
+        self._messenger = messenger
+        self._database = database
+
+    async def fetch_job(self, request):
+        job = request.app['async_jobs'].get(request.match_info.get('job_id', ''))
+        if job is None:
+            raise ApiNotFound('Job not found')
+        return json_response(job.to_dict())
+
+    async def job_events(self, request):
+        """Server-sent events stream of the jobs listed in `ids`. An event
+        named after its final status is sent as each job finishes, and the
+        stream ends once every job has.
+        """
+        job_ids = [job_id for job_id in request.query.get('ids', '').split(',') if job_id]
+        if not job_ids:
+            raise ApiBadRequest("'ids' parameter is required")
+
+        store = request.app['async_jobs']
+        response = StreamResponse(headers={'Content-Type': 'text/event-stream',
+                                           'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        waiting = {}
+        for job_id in job_ids:
+            job = store.get(job_id)
+            if job is None:
+                await _write_event(response, 'UNKNOWN', {'jobId': job_id})
+            elif job.finished.done():
+                await _write_event(response, job.status, job.to_dict())
+            else:
+                waiting[job.finished] = job
+
+        while waiting:
+            done, _ = await asyncio.wait(list(waiting), timeout=HEARTBEAT_INTERVAL,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                await response.write(b': keep-alive\n\n')
+            for finished in done:
+                job = waiting.pop(finished)
+                await _write_event(response, job.status, job.to_dict())
+
+        await response.write_eof()
+        return response
+
+    def add_route(self, app):
+        app.router.add_get('/jobs/events', self.job_events)
+        app.router.add_get('/jobs/{job_id}', self.fetch_job)
+
+
+async def _write_event(response, event, data):
+    await response.write('event: {}\ndata: {}\n\n'.format(event, json.dumps(data)).encode())
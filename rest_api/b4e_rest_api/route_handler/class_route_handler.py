@@ -2,9 +2,7 @@ import logging
 
 from aiohttp.web import json_response
 
-from config.config import SawtoothConfig
-from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, tolist, slice_per, \
-    get_time
+from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, get_time, bulk_response, stream_bulk
 
 LOGGER = logging.getLogger(__name__)
 
@@ -43,26 +41,32 @@ class ClassRouteHandler(object):
         for class_ in body.get('classes'):
             validate_fields(required_fields, class_)
 
-        list_transaction_id = await self._messenger.send_create_classes(private_key=body.get('privateKeyHex'),
-                                                                        classes=body.get('classes'),
-                                                                        timestamp=get_time())
+        results = await self._messenger.send_create_classes(private_key=body.get('privateKeyHex'),
+                                                            classes=body.get('classes'),
+                                                            timestamp=get_time())
 
-        list_classes = tolist(slice_per(body.get('classes'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_classes = body.get('classes')
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
-                "classId": list_classes[i].get("classId"),
-                "transactionId": list_transaction_id[i]
+                "classId": list_classes[i].get("classId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
+        return bulk_response(transactions, results)
 
-            })
+    async def create_classes_stream(self, request):
+        return await stream_bulk(request,
+                                 envelope_fields=['privateKeyHex'],
+                                 row_fields=['classId', 'subjectId', 'credit', 'teacherPublicKey', 'studentPublicKeys'],
+                                 result_fields=['classId'],
+                                 send_rows=self._send_classes)
+
+    async def _send_classes(self, envelope, classes, timestamp):
+        return await self._messenger.send_create_classes(private_key=envelope.get('privateKeyHex'),
+                                                         classes=classes,
+                                                         timestamp=timestamp)
 
     def add_route(self, app):
         app.router.add_post('/staff/create-class', self.create_class)
         app.router.add_post('/staff/create-classes', self.create_classes)
+        app.router.add_post('/staff/create-classes/stream', self.create_classes_stream)
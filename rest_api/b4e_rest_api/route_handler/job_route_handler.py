@@ -3,8 +3,7 @@ import logging
 from aiohttp.web import json_response
 
 from config.config import SawtoothConfig
-from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, tolist, slice_per, \
-    get_time
+from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, get_time
 
 LOGGER = logging.getLogger(__name__)
 
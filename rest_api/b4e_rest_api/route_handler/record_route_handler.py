@@ -2,9 +2,7 @@ import logging
 
 from aiohttp.web import json_response
 
-from config.config import SawtoothConfig
-from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, tolist, slice_per, \
-    get_time
+from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, get_time, bulk_response, stream_bulk
 
 LOGGER = logging.getLogger(__name__)
 
@@ -66,30 +64,37 @@ class RecordRouteHandler(object):
         for grade in grades:
             validate_fields(required_fields, grade)
 
-        list_transaction_id = await self._messenger.send_create_subjects(private_key=body.get('privateKeyHex'),
-                                                                         manager_public_key=body.get(
-                                                                             'universityPublicKey'),
-                                                                         class_id=body.get('classId'),
-                                                                         list_subjects=body.get('grades'),
-                                                                         timestamp=get_time())
+        results = await self._messenger.send_create_subjects(private_key=body.get('privateKeyHex'),
+                                                             manager_public_key=body.get(
+                                                                 'universityPublicKey'),
+                                                             class_id=body.get('classId'),
+                                                             list_subjects=body.get('grades'),
+                                                             timestamp=get_time())
 
-        list_subjects = tolist(slice_per(body.get('grades'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_subjects = body.get('grades')
         transactions = []
         class_id = body.get('classId')
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
                 "classId": class_id,
-                "studentPublicKey": list_subjects[i].get("studentPublicKey"),
-                "transactionId": list_transaction_id[i]
+                "studentPublicKey": list_subjects[i].get("studentPublicKey")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
+        return bulk_response(transactions, results)
 
-            })
+    async def create_subjects_stream(self, request):
+        return await stream_bulk(request,
+                                 envelope_fields=['privateKeyHex', 'universityPublicKey', 'classId'],
+                                 row_fields=['studentPublicKey', 'eduProgramId', 'cipher', 'hash'],
+                                 result_fields=['studentPublicKey'],
+                                 send_rows=self._send_subjects)
+
+    async def _send_subjects(self, envelope, grades, timestamp):
+        return await self._messenger.send_create_subjects(private_key=envelope.get('privateKeyHex'),
+                                                          manager_public_key=envelope.get('universityPublicKey'),
+                                                          class_id=envelope.get('classId'),
+                                                          list_subjects=grades,
+                                                          timestamp=timestamp)
 
     async def create_cert(self, request):
         body = await decode_request(request)
@@ -120,26 +125,31 @@ class RecordRouteHandler(object):
         for cert in certs:
             validate_fields(required_fields, cert)
 
-        list_transaction_id = await self._messenger.send_create_certs(private_key=body.get('privateKeyHex'),
-                                                                      certs=certs,
-                                                                      timestamp=get_time())
+        results = await self._messenger.send_create_certs(private_key=body.get('privateKeyHex'),
+                                                          certs=certs,
+                                                          timestamp=get_time())
 
-        list_certs = tolist(slice_per(body.get('certificates'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_certs = body.get('certificates')
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
                 "eduProgramId": list_certs[i].get("eduProgramId"),
-                "studentPublicKey": list_certs[i].get("studentPublicKey"),
-                "transactionId": list_transaction_id[i]
+                "studentPublicKey": list_certs[i].get("studentPublicKey")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
+        return bulk_response(transactions, results)
 
-            })
+    async def create_certs_stream(self, request):
+        return await stream_bulk(request,
+                                 envelope_fields=['privateKeyHex'],
+                                 row_fields=['school', 'eduProgramId', 'studentPublicKey', 'cipher', 'hash'],
+                                 result_fields=['eduProgramId', 'studentPublicKey'],
+                                 send_rows=self._send_certs)
+
+    async def _send_certs(self, envelope, certs, timestamp):
+        return await self._messenger.send_create_certs(private_key=envelope.get('privateKeyHex'),
+                                                       certs=certs,
+                                                       timestamp=timestamp)
 
     async def update_record(self, request):
         body = await decode_request(request)
@@ -234,8 +244,10 @@ class RecordRouteHandler(object):
         app.router.add_post('/create-record', self.create_record)
         app.router.add_post('/staff/create-subject', self.create_subject)
         app.router.add_post('/teacher/submit-grade', self.create_subjects)
+        app.router.add_post('/teacher/submit-grade/stream', self.create_subjects_stream)
         app.router.add_post('/staff/create-certificate', self.create_cert)
         app.router.add_post('/staff/create-certificates', self.create_certs)
+        app.router.add_post('/staff/create-certificates/stream', self.create_certs_stream)
         app.router.add_post('/staff/update-record', self.update_record)
         app.router.add_post('/teacher/edit-grade', self.modify_subject)
         app.router.add_post('/staff/modify-certificate', self.modify_cert)
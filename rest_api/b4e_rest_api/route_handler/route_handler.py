@@ -12,45 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ------------------------------------------------------------------------------
+import asyncio
+import collections
 import datetime
+import json
 from json.decoder import JSONDecodeError
 import logging
 import time
 
 from aiohttp.web import json_response
+from aiohttp.web import Response
+from aiohttp.web import StreamResponse
 import bcrypt
 from Crypto.Cipher import AES
 from itsdangerous import BadSignature
 from itsdangerous import TimedJSONWebSignatureSerializer as Serializer
 
+from rest_api.b4e_rest_api import async_jobs
 from rest_api.b4e_rest_api.errors import ApiBadRequest
+from rest_api.b4e_rest_api.errors import ApiInternalError
 from rest_api.b4e_rest_api.errors import ApiNotFound
 from rest_api.b4e_rest_api.errors import ApiUnauthorized
+from rest_api.b4e_rest_api.messaging import raise_for_results
 
 from rest_api.b4e_rest_api.blockchain_get_data import get_data_from_transaction
+from rest_api.b4e_rest_api.blockchain_get_data import get_data_from_transactions
+from rest_api.b4e_rest_api.blockchain_get_data import get_head
+from rest_api.b4e_rest_api.blockchain_get_data import get_payload_from_block
 from rest_api.b4e_rest_api.blockchain_get_data import get_state
+from rest_api.b4e_rest_api.blockchain_get_data import get_states
 from rest_api.b4e_rest_api.blockchain_get_data import get_student_data
 from rest_api.b4e_rest_api.blockchain_get_data import get_record_transaction
+from rest_api.b4e_rest_api.blockchain_get_data import MAX_BATCH_READ_ITEMS
 
 from config.config import SawtoothConfig
 
 LOGGER = logging.getLogger(__name__)
 
 
-def slice_per(source, step):
-    if len(source) < step:
-        return [source]
-    return [source[i::step] for i in range(step)]
-
-
-def tolist(source):
-    list_temp = []
-    for list_ in source:
-        for element in list_:
-            list_temp.append(element)
-    return list_temp
-
-
 class RouteHandler(object):
     def __init__(self, loop, messenger, database):
 
@@ -123,24 +122,17 @@ class RouteHandler(object):
         validate_fields(required_fields, body)
         profiles = body.get('profiles')
 
-        list_transaction_id = await self._messenger.send_create_teachers(private_key=body.get('privateKeyHex'),
-                                                                         profiles=profiles,
-                                                                         timestamp=get_time())
-        list_teachers = tolist(slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE))
+        results = await self._messenger.send_create_teachers(private_key=body.get('privateKeyHex'),
+                                                             profiles=profiles,
+                                                             timestamp=get_time())
+        list_teachers = profiles
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
-                "teacherId": list_teachers[i].get("teacherId"),
-                "transactionId": list_transaction_id[i]
+                "teacherId": list_teachers[i].get("teacherId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     async def create_edu_officer(self, request):
         body = await decode_request(request)
@@ -171,25 +163,18 @@ class RouteHandler(object):
         validate_fields(required_fields, body)
         profiles = body.get('profiles')
 
-        list_transaction_id = await self._messenger.send_create_edu_officers(private_key=body.get('privateKeyHex'),
-                                                                             profiles=profiles,
-                                                                             timestamp=get_time())
+        results = await self._messenger.send_create_edu_officers(private_key=body.get('privateKeyHex'),
+                                                                 profiles=profiles,
+                                                                 timestamp=get_time())
 
-        list_edu_officers = tolist(slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE))
+        list_edu_officers = profiles
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
-                "bureauId": list_edu_officers[i].get("bureauId"),
-                "transactionId": list_transaction_id[i]
+                "bureauId": list_edu_officers[i].get("bureauId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     async def create_vote(self, request):
         body = await decode_request(request)
@@ -236,25 +221,18 @@ class RouteHandler(object):
         required_fields = ['privateKeyHex', 'classes']
         validate_fields(required_fields, body)
 
-        list_transaction_id = await self._messenger.send_create_classes(private_key=body.get('privateKeyHex'),
-                                                                        classes=body.get('classes'),
-                                                                        timestamp=get_time())
+        results = await self._messenger.send_create_classes(private_key=body.get('privateKeyHex'),
+                                                            classes=body.get('classes'),
+                                                            timestamp=get_time())
 
-        list_classes = tolist(slice_per(body.get('classes'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_classes = body.get('classes')
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
-                "classId": list_classes[i].get("classId"),
-                "transactionId": list_transaction_id[i]
+                "classId": list_classes[i].get("classId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     async def create_subject(self, request):
         body = await decode_request(request)
@@ -281,30 +259,23 @@ class RouteHandler(object):
         required_fields = ['privateKeyHex', 'universityPublicKey', 'classId', 'points']
         validate_fields(required_fields, body)
 
-        list_transaction_id = await self._messenger.send_create_subjects(private_key=body.get('privateKeyHex'),
-                                                                         institution_public_key=body.get(
-                                                                             'universityPublicKey'),
-                                                                         class_id=body.get('classId'),
-                                                                         list_subjects=body.get('points'),
-                                                                         timestamp=get_time())
+        results = await self._messenger.send_create_subjects(private_key=body.get('privateKeyHex'),
+                                                             institution_public_key=body.get(
+                                                                 'universityPublicKey'),
+                                                             class_id=body.get('classId'),
+                                                             list_subjects=body.get('points'),
+                                                             timestamp=get_time())
 
-        list_subjects = tolist(slice_per(body.get('points'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_subjects = body.get('points')
         transactions = []
         class_id = body.get('classId')
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
                 "classId": class_id,
-                "studentPublicKey": list_subjects[i].get("studentPublicKey"),
-                "transactionId": list_transaction_id[i]
+                "studentPublicKey": list_subjects[i].get("studentPublicKey")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     async def create_cert(self, request):
         body = await decode_request(request)
@@ -330,26 +301,19 @@ class RouteHandler(object):
         required_fields = ['privateKeyHex', 'certificates']
         validate_fields(required_fields, body)
 
-        list_transaction_id = await self._messenger.send_create_certs(private_key=body.get('privateKeyHex'),
-                                                                      certs=body.get('certificates'),
-                                                                      timestamp=get_time())
+        results = await self._messenger.send_create_certs(private_key=body.get('privateKeyHex'),
+                                                          certs=body.get('certificates'),
+                                                          timestamp=get_time())
 
-        list_certs = tolist(slice_per(body.get('certificates'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_certs = body.get('certificates')
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
                 "globalregisno": list_certs[i].get("globalregisno"),
-                "studentPublicKey": list_certs[i].get("studentPublicKey"),
-                "transactionId": list_transaction_id[i]
+                "studentPublicKey": list_certs[i].get("studentPublicKey")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     async def update_record(self, request):
         body = await decode_request(request)
@@ -428,28 +392,72 @@ class RouteHandler(object):
     async def fetch_data_transaction(self, request):
         transaction_id = request.match_info.get('transaction_id', '')
         # transaction_id = request.rel_url.query['transaction_id']  # to get data from prams in get request
-        data = get_data_from_transaction(transaction_id)
+        data = await get_data_from_transaction(request.app['sawtooth_rest'],
+                                              request.app['payload_cache'],
+                                              transaction_id)
 
         return json_response(data)
 
+    async def fetch_data_transactions(self, request):
+        body = await decode_request(request)
+        transaction_ids = validate_batch_read(body, 'transactionIds')
+
+        found = await get_data_from_transactions(request.app['sawtooth_rest'],
+                                                 request.app['payload_cache'],
+                                                 transaction_ids)
+
+        return json_response(batch_read_response('transactionId', transaction_ids, found))
+
     async def fetch_record_transaction(self, request):
         transaction_id = request.match_info.get('transaction_id', '')
 
-        data = get_record_transaction(transaction_id)
+        data = await get_record_transaction(request.app['sawtooth_rest'],
+                                            request.app['payload_cache'],
+                                            transaction_id)
 
         return json_response(data)
 
+    async def fetch_payload_cache_stats(self, request):
+        return json_response(request.app['payload_cache'].stats())
+
     async def fetch_data_state(self, request):
         data_address = request.match_info.get('data_address', '')
 
-        data = get_state(data_address)
+        head = await get_head(request.app['sawtooth_rest'], request.app['state_cache'])
+        etag = '"{}"'.format(head) if head else None
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            return Response(status=304, headers={'ETag': etag})
 
-        return json_response(data)
+        data = await get_state(request.app['sawtooth_rest'], request.app['state_cache'], data_address, head)
+
+        response = json_response(data)
+        if etag is not None:
+            response.headers['ETag'] = etag
+        return response
+
+    async def fetch_data_states(self, request):
+        body = await decode_request(request)
+        addresses = validate_batch_read(body, 'addresses')
+
+        found = await get_states(request.app['sawtooth_rest'], request.app['state_cache'], addresses)
+
+        return json_response(batch_read_response('address', addresses, found))
+
+    async def fetch_block_payload(self, request):
+        block_id = request.match_info.get('block_id', '')
+        data_address = request.match_info.get('data_address', '')
+
+        payload = await get_payload_from_block(request.app['sawtooth_rest'], request.app['block_index'],
+                                               block_id, data_address)
+        if payload is None:
+            raise ApiNotFound('No transaction of the block writes this address')
+
+        return json_response({'payload': payload})
 
     async def fetch_data_student(self, request):
         student_public_key = request.match_info.get('student_public_key', '')
 
-        data = get_student_data(student_public_key)
+        data = await get_student_data(request.app['sawtooth_rest'], student_public_key)
 
         return json_response(data)
 
@@ -462,8 +470,12 @@ class RouteHandler(object):
 
         app.router.add_post('/get_new_key_pair', self.get_new_key_pair)
         app.router.add_get('/transaction/{transaction_id}', self.fetch_data_transaction)
+        app.router.add_post('/transaction/batch', self.fetch_data_transactions)
         app.router.add_get('/record/{transaction_id}', self.fetch_record_transaction)
+        app.router.add_get('/transaction-cache', self.fetch_payload_cache_stats)
         app.router.add_get('/state/{data_address}', self.fetch_data_state)
+        app.router.add_post('/state/batch', self.fetch_data_states)
+        app.router.add_get('/block/{block_id}/payload/{data_address}', self.fetch_block_payload)
         app.router.add_get('/student/data/{student_public_key}', self.fetch_data_student)
 
         app.router.add_post('/test_time_submit_transaction', self.test_time_create_transaction)
@@ -483,6 +495,197 @@ def validate_fields(required_fields, body):
                 "'{}' parameter is required".format(field))
 
 
+def validate_batch_read(body, field):
+    keys = body.get(field)
+    if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+        raise ApiBadRequest("'{}' must be a list of strings".format(field))
+    if len(keys) > MAX_BATCH_READ_ITEMS:
+        raise ApiBadRequest("'{}' holds more than {} items".format(field, MAX_BATCH_READ_ITEMS))
+    return keys
+
+
+def batch_read_response(key_name, keys, found):
+    """One result per requested key, in request order, with status
+    FOUND, NOT_FOUND or ERROR.
+    """
+    results = []
+    for key in keys:
+        data, error = found[key]
+        if error is not None:
+            results.append({key_name: key, 'status': 'ERROR', 'error': error})
+        elif data is None:
+            results.append({key_name: key, 'status': 'NOT_FOUND'})
+        else:
+            results.append({key_name: key, 'status': 'FOUND', 'data': data})
+    return {
+        'ok': all(result['status'] != 'ERROR' for result in results),
+        'found': sum(1 for result in results if result['status'] == 'FOUND'),
+        'results': results
+    }
+
+
+def bulk_response(transactions, results):
+    """Answers a bulk request with the fields of each row in `transactions`
+    completed with its transactionId, status, and error when it was not
+    committed. The answer is 200 when every row is committed and 207 when
+    only some are. When none is, the error of the rows is raised instead.
+    """
+    if not any(result.status == async_jobs.COMMITTED for result in results):
+        raise_for_results(results)
+
+    failed = 0
+    for transaction, result in zip(transactions, results):
+        transaction['transactionId'] = result.transaction_id
+        transaction['status'] = result.status
+        if result.error is not None:
+            transaction['error'] = result.error
+            failed += 1
+
+    if failed:
+        return json_response(
+            {
+                'ok': False,
+                'msg': '{} of {} transactions were not committed'.format(failed, len(results)),
+                'transactions': transactions
+            }, status=207)
+    return json_response(
+        {
+            'ok': True,
+            'msg': 'Transfer record transaction submitted',
+            'transactions': transactions
+        })
+
+
+async def stream_bulk(request, envelope_fields, row_fields, result_fields, send_rows):
+    """Handles a bulk request sent as NDJSON. The first line holds the
+    envelope (privateKeyHex and the fields shared by every row), each line
+    after it one row. Rows are validated and submitted in chunks of
+    STREAM_CHUNK_SIZE while the upload is still being read, and one result
+    line per row is streamed back in input order as its chunk commits,
+    followed by a summary line.
+
+    send_rows(envelope, rows, timestamp) submits a chunk and returns the
+    TransactionResult of every row.
+    """
+    if async_jobs.current_job.get() is not None:
+        raise ApiBadRequest('Streaming endpoints do not support async mode')
+    envelope = await _read_ndjson_line(request.content)
+    if not isinstance(envelope, dict):
+        raise ApiBadRequest('The first line must be a JSON object')
+    validate_fields(envelope_fields, envelope)
+    timestamp = get_time()
+
+    response = StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+    await response.prepare(request)
+
+    summary = {'ok': True, 'rows': 0, 'committed': 0, 'failed': 0}
+    # (chunk, submit task) in upload order
+    pending = collections.deque()
+    chunk = []
+    try:
+        while True:
+            row = None
+            try:
+                row = await _read_ndjson_line(request.content)
+                if row is None:
+                    break
+                if not isinstance(row, dict):
+                    raise ApiBadRequest('Each row must be a JSON object')
+                validate_fields(row_fields, row)
+                chunk.append((summary['rows'], row, None))
+            except ApiBadRequest as e:
+                chunk.append((summary['rows'], row if isinstance(row, dict) else None, e.message))
+            summary['rows'] += 1
+
+            if len(chunk) >= SawtoothConfig.STREAM_CHUNK_SIZE:
+                await _submit_chunk(response, pending, chunk, send_rows, envelope, timestamp,
+                                    result_fields, summary)
+                chunk = []
+        if chunk:
+            await _submit_chunk(response, pending, chunk, send_rows, envelope, timestamp,
+                                result_fields, summary)
+        while pending:
+            await _write_chunk(response, pending.popleft(), result_fields, summary)
+    finally:
+        for _, task in pending:
+            if task is not None:
+                task.cancel()
+
+    summary['ok'] = summary['failed'] == 0
+    await response.write((json.dumps(summary) + '\n').encode())
+    await response.write_eof()
+    return response
+
+
+async def _read_ndjson_line(content):
+    """Returns the next non blank line of an NDJSON body decoded, or None at
+    the end of the body.
+    """
+    while True:
+        try:
+            line = await content.readline()
+        except ValueError:
+            raise ApiBadRequest('Line too long')
+        if not line:
+            return None
+        line = line.strip()
+        if line:
+            break
+    try:
+        return json.loads(line)
+    except ValueError:
+        raise ApiBadRequest('Improper JSON format')
+
+
+async def _submit_chunk(response, pending, chunk, send_rows, envelope, timestamp, result_fields, summary):
+    # keep at most STREAM_CHUNKS_IN_FLIGHT chunks submitted, and report the
+    # ones that are already done
+    while pending and (len(pending) >= SawtoothConfig.STREAM_CHUNKS_IN_FLIGHT
+                       or pending[0][1] is None or pending[0][1].done()):
+        await _write_chunk(response, pending.popleft(), result_fields, summary)
+
+    rows = [row for _, row, error in chunk if error is None]
+    task = None
+    if rows:
+        task = asyncio.ensure_future(send_rows(envelope, rows, timestamp))
+    pending.append((chunk, task))
+
+
+async def _write_chunk(response, entry, result_fields, summary):
+    chunk, task = entry
+    transaction_results = None
+    chunk_error = None
+    if task is not None:
+        try:
+            transaction_results = iter(await task)
+        except (ApiBadRequest, ApiInternalError) as e:
+            # the chunk could not be built or sent, none of it was submitted
+            chunk_error = e
+
+    lines = []
+    for index, row, error in chunk:
+        result = {'index': index}
+        if row is not None:
+            for field in result_fields:
+                result[field] = row.get(field)
+        if error is not None:
+            result.update(status='INVALID', error=error)
+        elif chunk_error is not None:
+            result.update(status='INVALID' if isinstance(chunk_error, ApiBadRequest) else 'FAILED',
+                          error=chunk_error.message)
+        else:
+            transaction_result = next(transaction_results)
+            result.update(status=transaction_result.status, transactionId=transaction_result.transaction_id)
+            if transaction_result.error is not None:
+                result['error'] = transaction_result.error
+        if result['status'] == 'COMMITTED':
+            summary['committed'] += 1
+        else:
+            summary['failed'] += 1
+        lines.append(json.dumps(result) + '\n')
+    await response.write(''.join(lines).encode())
+
+
 def encrypt_private_key(aes_key, public_key, private_key):
     init_vector = bytes.fromhex(public_key[:32])
     cipher = AES.new(bytes.fromhex(aes_key), AES.MODE_CBC, init_vector)
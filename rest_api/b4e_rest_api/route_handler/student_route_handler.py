@@ -2,9 +2,7 @@ import logging
 
 from aiohttp.web import json_response
 
-from config.config import SawtoothConfig
-from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, tolist, slice_per, \
-    get_time
+from rest_api.b4e_rest_api.route_handler.route_handler import decode_request, validate_fields, get_time, bulk_response
 
 LOGGER = logging.getLogger(__name__)
 
@@ -44,26 +42,19 @@ class StudentRouteHandler(object):
             validate_fields(pre_required_fields, profile)
             validate_fields(required_fields, profile.get('eduProgram'))
 
-        list_transaction_id = await self._messenger.send_create_edu_programs(private_key=body.get('privateKeyHex'),
-                                                                             profiles=body.get('profiles'),
-                                                                             timestamp=get_time())
+        results = await self._messenger.send_create_edu_programs(private_key=body.get('privateKeyHex'),
+                                                                 profiles=body.get('profiles'),
+                                                                 timestamp=get_time())
 
-        list_classes = tolist(slice_per(body.get('profiles'), SawtoothConfig.MAX_BATCH_SIZE))
+        list_classes = body.get('profiles')
         transactions = []
-        for i in range(len(list_transaction_id)):
+        for i in range(len(results)):
             transactions.append({
                 "publicKey": list_classes[i].get("publicKey"),
-                "eduProgramId": list_classes[i].get("eduProgram").get("eduProgramId"),
-                "transactionId": list_transaction_id[i]
+                "eduProgramId": list_classes[i].get("eduProgram").get("eduProgramId")
             })
 
-        return json_response(
-            {
-                'ok': True,
-                'msg': 'Transfer record transaction submitted',
-                'transactions': transactions
-
-            })
+        return bulk_response(transactions, results)
 
     def add_route(self, app):
         app.router.add_post('/staff/create-student', self.create_student)
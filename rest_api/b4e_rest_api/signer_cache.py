@@ -0,0 +1,77 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import collections
+import hashlib
+import threading
+import time
+
+from sawtooth_signing import Signer
+from sawtooth_signing import secp256k1
+
+from addressing.b4e_addressing import addresser
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 3600
+
+
+class CachedSigner(Signer):
+    """A Signer that derives its public key, the key hex and the actor
+    address once. Transaction builders read them from here instead of
+    calling get_public_key().as_hex().
+    """
+
+    def __init__(self, context, private_key):
+        super(CachedSigner, self).__init__(context, private_key)
+        self.private_key_hex = private_key.as_hex()
+        self.public_key_hex = self.get_public_key().as_hex()
+        self.actor_address = addresser.get_actor_address(self.public_key_hex)
+
+
+class SignerCache(object):
+    """Bounded in memory cache of CachedSigner, keyed by a digest of the
+    private key. Entries expire `ttl` seconds after they were created and
+    the least recently used one is evicted once `max_size` is reached.
+    """
+
+    def __init__(self, context, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        self._context = context
+        self._max_size = max_size
+        self._ttl = ttl
+        # key digest -> (signer, expiry time)
+        self._signers = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, private_key):
+        """Returns the CachedSigner of a hex encoded private key."""
+        digest = hashlib.sha256(private_key.lower().encode('utf-8')).digest()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._signers.get(digest)
+            if entry is not None and entry[1] > now:
+                self._signers.move_to_end(digest)
+                return entry[0]
+
+        signer = CachedSigner(self._context, secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+        with self._lock:
+            self._signers[digest] = (signer, now + self._ttl)
+            self._signers.move_to_end(digest)
+            while len(self._signers) > self._max_size:
+                self._signers.popitem(last=False)
+        return signer
+
+    def clear(self):
+        with self._lock:
+            self._signers.clear()
@@ -3,15 +3,14 @@ import json
 from addressing.b4e_addressing import addresser
 from config.config import SawtoothConfig
 from protobuf.b4e_protobuf import payload_pb2
-from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_batch_multi_transactions, \
-    slice_per
+from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_packed_batches
 
 
 def make_create_actor(transaction_signer,
                       batch_signer,
                       profile,
                       timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -38,7 +37,7 @@ def make_create_company(transaction_signer,
                         batch_signer,
                         profile,
                         timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -65,8 +64,8 @@ def make_create_institution(transaction_signer,
                             batch_signer,
                             profile,
                             timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
-    voting_address = addresser.get_voting_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
+    voting_address = addresser.get_voting_address(transaction_signer.public_key_hex)
 
     inputs = [actor_address, voting_address]
 
@@ -93,7 +92,7 @@ def make_create_teacher(transaction_signer,
                         batch_signer,
                         profile,
                         timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    institution_address = transaction_signer.actor_address
     teacher_address = addresser.get_actor_address(profile['publicKey'])
 
     inputs = [institution_address, teacher_address]
@@ -122,50 +121,39 @@ def make_create_teachers(transaction_signer,
                          batch_signer,
                          profiles,
                          timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    institution_address = transaction_signer.actor_address
 
-    list_profiles = slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for profiles in list_profiles:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for profile in profiles:
-            teacher_address = addresser.get_actor_address(profile['publicKey'])
-            inputs = [institution_address, teacher_address]
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    for profile in profiles:
+        teacher_address = addresser.get_actor_address(profile['publicKey'])
+        inputs = [institution_address, teacher_address]
 
-            outputs = [teacher_address]
+        outputs = [teacher_address]
 
-            action = payload_pb2.CreateTeacherAction(data=json.dumps(profile),
-                                                     teacher_public_key=profile.get('publicKey'),
-                                                     id=profile.get('teacherId'))
+        action = payload_pb2.CreateTeacherAction(data=json.dumps(profile),
+                                                 teacher_public_key=profile.get('publicKey'),
+                                                 id=profile.get('teacherId'))
 
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_TEACHER,
-                create_teacher=action,
-                timestamp=timestamp)
-            payload_bytes = payload.SerializeToString()
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_TEACHER,
+            create_teacher=action,
+            timestamp=timestamp)
+        payload_bytes = payload.SerializeToString()
 
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
 
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
-
-    return list_batches
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_update_profile(transaction_signer,
                         batch_signer,
                         profile,
                         timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -192,7 +180,7 @@ def make_reject_institution(transaction_signer,
                             batch_signer,
                             institution_public_key,
                             timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -219,7 +207,7 @@ def make_active_institution(transaction_signer,
                             batch_signer,
                             institution_public_key,
                             timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
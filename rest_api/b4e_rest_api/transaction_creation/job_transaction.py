@@ -3,8 +3,7 @@ import logging
 from addressing.b4e_addressing import addresser
 from config.config import SawtoothConfig
 from protobuf.b4e_protobuf import payload_pb2
-from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_batch_multi_transactions, \
-    slice_per
+from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_batch_multi_transactions
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,7 +16,7 @@ def make_create_job(transaction_signer,
                     cipher,
                     record_hash,
                     timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     candidate_address = addresser.get_actor_address(candidate_public_key)
     company_address = addresser.get_actor_address(issuer_public_key)
     job_address = addresser.get_job_address(job_id, company_public_key, candidate_public_key)
@@ -60,7 +59,7 @@ def make_update_job_end(transaction_signer,
                         candidate_public_key,
                         job_id,
                         timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     candidate_address = addresser.get_actor_address(candidate_public_key)
     company_address = addresser.get_actor_address(issuer_public_key)
     job_address = addresser.get_job_address(job_id, company_public_key, candidate_public_key)
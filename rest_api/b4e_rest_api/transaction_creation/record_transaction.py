@@ -1,8 +1,12 @@
 from addressing.b4e_addressing import addresser
 from config.config import SawtoothConfig
 from protobuf.b4e_protobuf import payload_pb2
-from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_batch_multi_transactions, \
-    slice_per
+from rest_api.b4e_rest_api.transaction_creation.transaction_creation import _make_batch, _make_batches_multi_transactions, \
+    _make_packed_batches, pack_rows
+
+# bytes a grade adds to a CREATE_SUBJECTS transaction besides its cipher and
+# hash: its record and edu program addresses, owner key and edu program id
+SUBJECT_OVERHEAD = 512
 
 
 def make_create_record(transaction_signer,
@@ -14,7 +18,7 @@ def make_create_record(transaction_signer,
                        cipher,
                        record_hash,
                        timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
@@ -58,7 +62,7 @@ def make_create_subject(transaction_signer,
                         cipher,
                         record_hash,
                         timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
@@ -99,58 +103,54 @@ def make_create_subjects(transaction_signer,
                          class_id,
                          list_subjects,
                          timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    """Packs the grades, in order, into CREATE_SUBJECTS transactions with
+    pack_rows and makes one batch per transaction. Returns the batches and,
+    for every grade, the (batch id, transaction id) that holds it.
+    """
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     class_address = addresser.get_class_address(class_id, manager_public_key)
 
-    record_type = payload_pb2.SUBJECT
-
-    list_subjects = slice_per(list_subjects, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for subjects in list_subjects:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for subject in subjects:
-            subject_address = addresser.get_record_address(class_id,
-                                                           subject.get('studentPublicKey'),
+    ranges = pack_rows([len(subject.get('cipher')) + len(subject.get('hash')) + SUBJECT_OVERHEAD
+                        for subject in list_subjects])
+    list_slices = []
+    for start, end in ranges:
+        subjects = list_subjects[start:end]
+        student_public_keys = [subject.get('studentPublicKey') for subject in subjects]
+        subject_addresses = addresser.get_record_addresses([class_id] * len(subjects),
+                                                           student_public_keys,
                                                            manager_public_key)
-            edu_program_address = addresser.get_portfolio_address(subject.get("eduProgramId"),
-                                                                  subject.get("studentPublicKey"),
+        edu_program_addresses = addresser.get_portfolio_addresses([subject.get("eduProgramId") for subject in subjects],
+                                                                  student_public_keys,
                                                                   manager_public_key)
-            inputs = [manager_address, issuer_address, subject_address, class_address, edu_program_address]
-
-            outputs = [subject_address, edu_program_address]
+        inputs = [manager_address, issuer_address, class_address] + subject_addresses + edu_program_addresses
 
-            action = payload_pb2.CreateRecordAction(owner_public_key=subject.get("studentPublicKey"),
-                                                    manager_public_key=manager_public_key,
-                                                    record_id=class_id,
-                                                    record_type=record_type,
-                                                    portfolio_id=subject.get("eduProgramId"),
-                                                    cipher=subject.get("cipher"),
-                                                    hash=subject.get("hash"))
+        outputs = subject_addresses + edu_program_addresses
 
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_SUBJECT,
-                create_subject=action,
-                timestamp=timestamp)
+        action = payload_pb2.CreateSubjectsAction(
+            manager_public_key=manager_public_key,
+            class_id=class_id,
+            subjects=[payload_pb2.CreateSubjectsAction.Subject(owner_public_key=subject.get("studentPublicKey"),
+                                                               portfolio_id=subject.get("eduProgramId"),
+                                                               cipher=subject.get("cipher"),
+                                                               hash=subject.get("hash"))
+                      for subject in subjects])
 
-            payload_bytes = payload.SerializeToString()
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_SUBJECTS,
+            create_subjects=action,
+            timestamp=timestamp)
 
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
+        payload_bytes = payload.SerializeToString()
 
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
+        list_slices.append(([payload_bytes], [inputs], [outputs]))
 
-    return list_batches
+    list_batches = _make_batches_multi_transactions(list_slices, transaction_signer, batch_signer)
+    row_map = []
+    for (start, end), batch in zip(ranges, list_batches):
+        row_map.extend([(batch.header_signature, batch.transactions[0].header_signature)] * (end - start))
+    return list_batches, row_map
 
 
 def make_create_cert(transaction_signer,
@@ -161,7 +161,7 @@ def make_create_cert(transaction_signer,
                      cipher,
                      record_hash,
                      timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_public_key = owner_public_key
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
@@ -201,54 +201,41 @@ def make_create_certs(transaction_signer,
                       batch_signer,
                       certs,
                       timestamp):
-    manager_public_key = transaction_signer.get_public_key().as_hex()
+    manager_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     record_type = payload_pb2.CERTIFICATE
-    list_certs = slice_per(certs, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for certs in list_certs:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for cert in certs:
-            cert_id = cert.get('eduProgramId')
-            owner_public_key = cert.get('studentPublicKey')
-            edu_program_address = addresser.get_portfolio_address(cert_id, owner_public_key, manager_public_key)
-
-            cert_address = addresser.get_record_address(cert_id,
-                                                        owner_public_key,
-                                                        manager_public_key)
-            inputs = [manager_address, edu_program_address, cert_address]
-
-            outputs = [cert_address]
-
-            action = payload_pb2.CreateRecordAction(owner_public_key=cert.get("studentPublicKey"),
-                                                    manager_public_key=manager_public_key,
-                                                    record_id=cert.get("eduProgramId"),
-                                                    record_type=record_type,
-                                                    portfolio_id=cert.get("eduProgramId"),
-                                                    cipher=cert.get("cipher"),
-                                                    hash=cert.get("hash"))
-
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_CERT,
-                create_cert=action,
-                timestamp=timestamp)
-
-            payload_bytes = payload.SerializeToString()
-
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
-
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
-    return list_batches
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    cert_ids = [cert.get('eduProgramId') for cert in certs]
+    owner_public_keys = [cert.get('studentPublicKey') for cert in certs]
+    edu_program_addresses = addresser.get_portfolio_addresses(cert_ids, owner_public_keys, manager_public_key)
+    cert_addresses = addresser.get_record_addresses(cert_ids, owner_public_keys, manager_public_key)
+    for cert, edu_program_address, cert_address in zip(certs, edu_program_addresses, cert_addresses):
+        inputs = [manager_address, edu_program_address, cert_address]
+
+        outputs = [cert_address]
+
+        action = payload_pb2.CreateRecordAction(owner_public_key=cert.get("studentPublicKey"),
+                                                manager_public_key=manager_public_key,
+                                                record_id=cert.get("eduProgramId"),
+                                                record_type=record_type,
+                                                portfolio_id=cert.get("eduProgramId"),
+                                                cipher=cert.get("cipher"),
+                                                hash=cert.get("hash"))
+
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_CERT,
+            create_cert=action,
+            timestamp=timestamp)
+
+        payload_bytes = payload.SerializeToString()
+
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
+
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def _get_record_status(i):
@@ -268,13 +255,14 @@ def make_update_record(transaction_signer,
                        record_hash,
                        status,
                        timestamp):
-    manager_public_key = transaction_signer.get_public_key().as_hex()
+    manager_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key, )
+    archive_prefix = addresser.get_record_archive_prefix(record_id, owner_public_key, manager_public_key)
 
     inputs = [manager_address, record_address]
 
-    outputs = [record_address]
+    outputs = [record_address, archive_prefix]
     action = payload_pb2.UpdateRecordAction(record_id=record_id,
                                             cipher=cipher,
                                             hash=record_hash,
@@ -305,14 +293,15 @@ def _modify_record(transaction_signer,
                    record_hash,
                    modify_action,
                    timestamp):
-    modifier_public_key = transaction_signer.get_public_key().as_hex()
+    modifier_public_key = transaction_signer.public_key_hex
     modifier_address = addresser.get_actor_address(modifier_public_key)
     manager_address = addresser.get_actor_address(manager_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key, )
+    archive_prefix = addresser.get_record_archive_prefix(record_id, owner_public_key, manager_public_key)
 
     inputs = [modifier_address, manager_address, record_address]
 
-    outputs = [record_address]
+    outputs = [record_address, archive_prefix]
     action = payload_pb2.ModifyRecordAction(record_id=record_id,
                                             cipher=cipher,
                                             hash=record_hash,
@@ -362,7 +351,7 @@ def make_modify_cert(transaction_signer,
                      cipher,
                      record_hash,
                      timestamp):
-    manager_public_key = transaction_signer.get_public_key().as_hex()
+    manager_public_key = transaction_signer.public_key_hex
     return _modify_record(transaction_signer, batch_signer,
                           owner_public_key, manager_public_key, record_id, cipher,
                           record_hash, payload_pb2.B4EPayload.MODIFY_CERT, timestamp)
@@ -374,13 +363,14 @@ def _status_change(transaction_signer,
                    record_id,
                    action_name,
                    timestamp):
-    manager_public_key = transaction_signer.get_public_key().as_hex()
+    manager_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key, )
+    archive_prefix = addresser.get_record_archive_prefix(record_id, owner_public_key, manager_public_key)
 
     inputs = [manager_address, record_address]
 
-    outputs = [record_address]
+    outputs = [record_address, archive_prefix]
     action = payload_pb2.ChangeStatusCertAction(record_id=record_id,
                                                 owner_public_key=owner_public_key)
     payload = None
@@ -0,0 +1,196 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Builds and signs transaction headers, either in process or spread over a
+pool of worker processes for large bulk requests.
+
+secp256k1 signatures are deterministic, so both paths produce identical
+transactions.
+"""
+
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from sawtooth_rest_api.protobuf import batch_pb2
+from sawtooth_rest_api.protobuf import transaction_pb2
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+from sawtooth_signing import secp256k1
+
+from addressing.b4e_addressing import addresser
+
+LOGGER = logging.getLogger(__name__)
+
+# fewer headers than this are signed in process
+MIN_POOL_ITEMS = 64
+# headers signed per task sent to a worker
+CHUNK_SIZE = 128
+
+_pool = None
+_pool_workers = 0
+
+
+def start_pool(workers):
+    """Starts the signing processes. With fewer than two workers every
+    batch is signed in process.
+    """
+    global _pool, _pool_workers
+    stop_pool()
+    if workers < 2:
+        return
+    _pool = ProcessPoolExecutor(max_workers=workers,
+                                mp_context=multiprocessing.get_context('spawn'))
+    _pool_workers = workers
+    LOGGER.info("Signing transactions with %s worker processes", workers)
+
+
+def stop_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+    _pool = None
+    _pool_workers = 0
+
+
+# wire tags of the length delimited TransactionHeader and BatchHeader fields
+_INPUTS_TAG = b'\x2a'
+_NONCE_TAG = b'\x32'
+_OUTPUTS_TAG = b'\x3a'
+_PAYLOAD_SHA512_TAG = b'\x4a'
+_TRANSACTION_IDS_TAG = b'\x12'
+
+
+class HeaderTemplate(object):
+    """Serializes the transaction and batch headers of one signer and
+    batcher pair. The fields shared by every transaction are serialized
+    once, each header then only encodes its inputs, nonce, outputs and
+    payload hash around them. Protobuf writes fields in field number order,
+    so the bytes are the same as TransactionHeader(...).SerializeToString().
+    """
+
+    def __init__(self, signer_public_key, batcher_public_key):
+        self.signer_public_key = signer_public_key
+        self.batcher_public_key = batcher_public_key
+        # batcher_public_key (1), family_name (3), family_version (4)
+        self._prefix = transaction_pb2.TransactionHeader(
+            batcher_public_key=batcher_public_key,
+            family_name=addresser.FAMILY_NAME,
+            family_version=addresser.FAMILY_VERSION).SerializeToString()
+        # signer_public_key (10)
+        self._suffix = transaction_pb2.TransactionHeader(
+            signer_public_key=signer_public_key).SerializeToString()
+        # signer_public_key (1) of the batch header
+        self._batch_prefix = batch_pb2.BatchHeader(
+            signer_public_key=batcher_public_key).SerializeToString()
+
+    def transaction_header(self, inputs, outputs, payload_sha512, nonce=''):
+        parts = [self._prefix]
+        for address in inputs:
+            parts.append(_encode_string(_INPUTS_TAG, address))
+        if nonce:
+            parts.append(_encode_string(_NONCE_TAG, nonce))
+        for address in outputs:
+            parts.append(_encode_string(_OUTPUTS_TAG, address))
+        if payload_sha512:
+            parts.append(_encode_string(_PAYLOAD_SHA512_TAG, payload_sha512))
+        parts.append(self._suffix)
+        return b''.join(parts)
+
+    def batch_header(self, transaction_ids):
+        parts = [self._batch_prefix]
+        for transaction_id in transaction_ids:
+            parts.append(_encode_string(_TRANSACTION_IDS_TAG, transaction_id))
+        return b''.join(parts)
+
+
+def _encode_string(tag, value):
+    data = value.encode('utf-8')
+    length = len(data)
+    if length < 0x80:
+        return tag + bytes((length,)) + data
+    varint = bytearray()
+    while length >= 0x80:
+        varint.append((length & 0x7f) | 0x80)
+        length >>= 7
+    varint.append(length)
+    return tag + bytes(varint) + data
+
+
+@functools.lru_cache(maxsize=256)
+def get_header_template(signer_public_key, batcher_public_key):
+    return HeaderTemplate(signer_public_key, batcher_public_key)
+
+
+def make_transaction_header(inputs, outputs, payload_sha512, signer_public_key, batcher_public_key):
+    return get_header_template(signer_public_key, batcher_public_key).transaction_header(
+        inputs, outputs, payload_sha512)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_signer(private_key):
+    context = create_context('secp256k1')
+    return CryptoFactory(context).new_signer(secp256k1.Secp256k1PrivateKey.from_hex(private_key))
+
+
+def _sign_headers(private_key, signer_public_key, batcher_public_key, rows):
+    # runs in a worker process, the signer of each key is built once per worker
+    signer = _get_signer(private_key)
+    template = get_header_template(signer_public_key, batcher_public_key)
+    signed = []
+    for inputs, outputs, payload_sha512 in rows:
+        header = template.transaction_header(inputs, outputs, payload_sha512)
+        signed.append((header, signer.sign(header)))
+    return signed
+
+
+def _sign_messages(private_key, messages):
+    # runs in a worker process
+    signer = _get_signer(private_key)
+    return [signer.sign(message) for message in messages]
+
+
+def _map_chunks(function, signer, items, *args):
+    private_key = signer.private_key_hex
+    chunk_size = max(min(CHUNK_SIZE, len(items) // _pool_workers), 1)
+    futures = [_pool.submit(function, private_key, *(args + (items[i:i + chunk_size],)))
+               for i in range(0, len(items), chunk_size)]
+    return [result for future in futures for result in future.result()]
+
+
+def sign_transaction_headers(transaction_signer, batcher_public_key, rows):
+    """Returns (header bytes, header signature) for each (inputs, outputs,
+    payload_sha512) row, in order.
+    """
+    signer_public_key = transaction_signer.public_key_hex
+    if _pool is not None and len(rows) >= MIN_POOL_ITEMS:
+        return _map_chunks(_sign_headers, transaction_signer, rows,
+                           signer_public_key, batcher_public_key)
+
+    template = get_header_template(signer_public_key, batcher_public_key)
+    signed = []
+    for inputs, outputs, payload_sha512 in rows:
+        header = template.transaction_header(inputs, outputs, payload_sha512)
+        signed.append((header, transaction_signer.sign(header)))
+    return signed
+
+
+def sign_messages(signer, messages):
+    """Returns the signature of each message, in order."""
+    if _pool is not None and len(messages) >= MIN_POOL_ITEMS:
+        return _map_chunks(_sign_messages, signer, messages)
+    return [signer.sign(message) for message in messages]
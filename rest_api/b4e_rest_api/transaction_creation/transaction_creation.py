@@ -20,6 +20,8 @@ from sawtooth_rest_api.protobuf import transaction_pb2
 
 from addressing.b4e_addressing import addresser
 
+from rest_api.b4e_rest_api.transaction_creation import signing
+
 from protobuf.b4e_protobuf import payload_pb2
 
 from config.config import SawtoothConfig
@@ -30,10 +32,35 @@ import time
 LOGGER = logging.getLogger(__name__)
 
 
-def slice_per(source, step):
-    if len(source) < step:
-        return [source]
-    return [source[i::step] for i in range(step)]
+# bytes of a transaction besides its payload and addresses: header fields,
+# keys and signature
+TRANSACTION_OVERHEAD = 512
+
+
+def pack_rows(sizes, max_count=None, max_bytes=None):
+    """Splits rows into consecutive (start, end) ranges, in row order, each
+    holding at most `max_count` rows and `max_bytes` bytes. A row larger
+    than `max_bytes` gets a range of its own.
+    """
+    max_count = max_count or SawtoothConfig.MAX_BATCH_SIZE
+    max_bytes = max_bytes or SawtoothConfig.MAX_BATCH_BYTES
+    ranges = []
+    start = 0
+    total = 0
+    for i, size in enumerate(sizes):
+        if i > start and (i - start >= max_count or total + size > max_bytes):
+            ranges.append((start, i))
+            start = i
+            total = 0
+        total += size
+    if start < len(sizes):
+        ranges.append((start, len(sizes)))
+    return ranges
+
+
+def transaction_size(payload_bytes, inputs, outputs):
+    return (len(payload_bytes) + sum(len(address) for address in inputs) +
+            sum(len(address) for address in outputs) + TRANSACTION_OVERHEAD)
 
 
 def make_set_b4e_environment(signer, timestamp):
@@ -63,8 +90,8 @@ def make_create_institution(transaction_signer,
                             batch_signer,
                             profile,
                             timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
-    voting_address = addresser.get_voting_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
+    voting_address = addresser.get_voting_address(transaction_signer.public_key_hex)
 
     inputs = [actor_address, voting_address]
 
@@ -93,7 +120,7 @@ def make_create_teacher(transaction_signer,
                         batch_signer,
                         profile,
                         timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    institution_address = transaction_signer.actor_address
     teacher_address = addresser.get_actor_address(profile['publicKey'])
 
     inputs = [institution_address, teacher_address]
@@ -124,49 +151,38 @@ def make_create_teachers(transaction_signer,
                          batch_signer,
                          profiles,
                          timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
-
-    list_profiles = slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for profiles in list_profiles:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for profile in profiles:
-            teacher_address = addresser.get_actor_address(profile['publicKey'])
-            inputs = [institution_address, teacher_address]
-
-            outputs = [teacher_address]
-            info = payload_pb2.Info(data=str(profiles))
-            action = payload_pb2.CreateTeacherAction(info=info, teacher_public_key=profile.get('publicKey'),
-                                                     id=profile.get('teacherId'))
-
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_TEACHER,
-                create_teacher=action,
-                timestamp=timestamp)
-            payload_bytes = payload.SerializeToString()
-
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
-
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
-
-    return list_batches
+    institution_address = transaction_signer.actor_address
+
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    for profile in profiles:
+        teacher_address = addresser.get_actor_address(profile['publicKey'])
+        inputs = [institution_address, teacher_address]
+
+        outputs = [teacher_address]
+        info = payload_pb2.Info(data=str(profile))
+        action = payload_pb2.CreateTeacherAction(info=info, teacher_public_key=profile.get('publicKey'),
+                                                 id=profile.get('teacherId'))
+
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_TEACHER,
+            create_teacher=action,
+            timestamp=timestamp)
+        payload_bytes = payload.SerializeToString()
+
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
+
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_create_edu_officer(transaction_signer,
                             batch_signer,
                             profile,
                             timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    institution_address = transaction_signer.actor_address
     edu_officer_address = addresser.get_actor_address(profile.get('publicKey'))
 
     inputs = [institution_address, edu_officer_address]
@@ -197,45 +213,34 @@ def make_create_edu_officers(transaction_signer,
                              batch_signer,
                              profiles,
                              timestamp):
-    institution_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
-
-    list_profiles = slice_per(profiles, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for profiles in list_profiles:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for profile in profiles:
-            edu_officer_address = addresser.get_actor_address(profile.get('publicKey'))
+    institution_address = transaction_signer.actor_address
 
-            inputs = [institution_address, edu_officer_address]
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    for profile in profiles:
+        edu_officer_address = addresser.get_actor_address(profile.get('publicKey'))
 
-            outputs = [edu_officer_address]
+        inputs = [institution_address, edu_officer_address]
 
-            info = payload_pb2.Info(data=str(profile))
+        outputs = [edu_officer_address]
 
-            action = payload_pb2.CreateEduOfficerAction(info=info, edu_officer_public_key=profile.get('publicKey'),
-                                                        id=profile.get('bureauId'))
+        info = payload_pb2.Info(data=str(profile))
 
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_EDU_OFFICER,
-                create_edu_officer=action,
-                timestamp=timestamp)
-            payload_bytes = payload.SerializeToString()
+        action = payload_pb2.CreateEduOfficerAction(info=info, edu_officer_public_key=profile.get('publicKey'),
+                                                    id=profile.get('bureauId'))
 
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_EDU_OFFICER,
+            create_edu_officer=action,
+            timestamp=timestamp)
+        payload_bytes = payload.SerializeToString()
 
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
 
-    return list_batches
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_create_vote(transaction_signer,
@@ -277,7 +282,7 @@ def make_create_class(transaction_signer,
                       edu_officer_public_key,
                       class_id,
                       timestamp):
-    institution_public_key = transaction_signer.get_public_key().as_hex()
+    institution_public_key = transaction_signer.public_key_hex
     class_address = addresser.get_class_address(class_id, institution_public_key)
     teacher_address = addresser.get_actor_address(teacher_public_key)
     edu_officer_address = addresser.get_actor_address(edu_officer_public_key)
@@ -310,49 +315,38 @@ def make_create_classes(transaction_signer,
                         batch_signer,
                         classes,
                         timestamp):
-    institution_public_key = transaction_signer.get_public_key().as_hex()
+    institution_public_key = transaction_signer.public_key_hex
     institution_address = addresser.get_actor_address(institution_public_key)
 
-    list_classes = slice_per(classes, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for classes in list_classes:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for class_ in classes:
-            class_address = addresser.get_class_address(class_.get('classId'), institution_public_key)
-            teacher_address = addresser.get_actor_address(class_.get('teacherPublicKey'))
-            edu_officer_address = addresser.get_actor_address(class_.get('bureauPublicKey'))
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    for class_ in classes:
+        class_address = addresser.get_class_address(class_.get('classId'), institution_public_key)
+        teacher_address = addresser.get_actor_address(class_.get('teacherPublicKey'))
+        edu_officer_address = addresser.get_actor_address(class_.get('bureauPublicKey'))
 
-            inputs = [class_address, teacher_address, edu_officer_address, institution_address]
+        inputs = [class_address, teacher_address, edu_officer_address, institution_address]
 
-            outputs = [class_address]
+        outputs = [class_address]
 
-            action = payload_pb2.CreateClassAction(class_id=class_.get('classId'),
-                                                   teacher_public_key=class_.get('teacherPublicKey'),
-                                                   edu_officer_public_key=class_.get('bureauPublicKey'),
-                                                   timestamp=timestamp)
+        action = payload_pb2.CreateClassAction(class_id=class_.get('classId'),
+                                               teacher_public_key=class_.get('teacherPublicKey'),
+                                               edu_officer_public_key=class_.get('bureauPublicKey'),
+                                               timestamp=timestamp)
 
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_CLASS,
-                create_class=action,
-                timestamp=timestamp)
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_CLASS,
+            create_class=action,
+            timestamp=timestamp)
 
-            payload_bytes = payload.SerializeToString()
+        payload_bytes = payload.SerializeToString()
 
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
 
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
-
-    return list_batches
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_create_record(transaction_signer,
@@ -363,7 +357,7 @@ def make_create_record(transaction_signer,
                        record_type,
                        record_data,
                        timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
@@ -408,7 +402,7 @@ def make_create_subject(transaction_signer,
                         record_data,
                         record_hash,
                         timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
@@ -446,51 +440,41 @@ def make_create_subjects(transaction_signer,
                          class_id,
                          list_subjects,
                          timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(institution_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     class_address = addresser.get_class_address(class_id, institution_public_key)
 
-    list_subjects = slice_per(list_subjects, SawtoothConfig.MAX_BATCH_SIZE)
-    list_batches = []
-    for subjects in list_subjects:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for subject in subjects:
-            subject_address = addresser.get_record_address(class_id, subject.get('studentPublicKey'),
-                                                           institution_public_key)
-            inputs = [manager_address, issuer_address, subject_address, class_address]
-
-            outputs = [subject_address]
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    subject_addresses = addresser.get_record_addresses([class_id] * len(list_subjects),
+                                                       [subject.get('studentPublicKey') for subject in list_subjects],
+                                                       institution_public_key)
+    for subject, subject_address in zip(list_subjects, subject_addresses):
+        inputs = [manager_address, issuer_address, subject_address, class_address]
 
-            action = payload_pb2.CreateSubjectAction(owner_public_key=subject.get('studentPublicKey'),
-                                                     manager_public_key=institution_public_key,
-                                                     issuer_public_key=issuer_public_key,
-                                                     record_id=class_id,
-                                                     record_data=subject.get('cipher'),
-                                                     record_hash=subject.get('hashData'))
+        outputs = [subject_address]
 
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_SUBJECT,
-                create_subject=action,
-                timestamp=timestamp)
+        action = payload_pb2.CreateSubjectAction(owner_public_key=subject.get('studentPublicKey'),
+                                                 manager_public_key=institution_public_key,
+                                                 issuer_public_key=issuer_public_key,
+                                                 record_id=class_id,
+                                                 record_data=subject.get('cipher'),
+                                                 record_hash=subject.get('hashData'))
 
-            payload_bytes = payload.SerializeToString()
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_SUBJECT,
+            create_subject=action,
+            timestamp=timestamp)
 
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
+        payload_bytes = payload.SerializeToString()
 
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
 
-    return list_batches
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_create_cert(transaction_signer,
@@ -501,7 +485,7 @@ def make_create_cert(transaction_signer,
                      record_data,
                      record_hash,
                      timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     manager_address = addresser.get_actor_address(manager_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key)
@@ -537,53 +521,42 @@ def make_create_certs(transaction_signer,
                       batch_signer,
                       certs,
                       timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     institution_public_key = issuer_public_key
     manager_address = addresser.get_actor_address(institution_public_key)
     issuer_address = addresser.get_actor_address(issuer_public_key)
 
-    list_certs = slice_per(certs, SawtoothConfig.MAX_BATCH_SIZE)
-    # list_certs = [certs]
-    list_batches = []
-    # LOGGER.warning("slice to  ---------------- " + str(len(list_certs)))
-    for certs in list_certs:
-        list_inputs = []
-        list_outputs = []
-        list_payload_bytes = []
-        for cert in certs:
-            cert_id = cert.get('globalregisno')
-            cert_address = addresser.get_record_address(cert_id, cert.get('studentPublicKey'),
-                                                        institution_public_key)
-            inputs = [manager_address, issuer_address, cert_address]
-
-            outputs = [cert_address]
-
-            action = payload_pb2.CreateCertAction(owner_public_key=cert.get('studentPublicKey'),
-                                                  manager_public_key=institution_public_key,
-                                                  issuer_public_key=issuer_public_key,
-                                                  record_id=cert_id,
-                                                  record_data=cert.get('cipher'),
-                                                  record_hash=cert.get('hashData'))
-
-            payload = payload_pb2.B4EPayload(
-                action=payload_pb2.B4EPayload.CREATE_CERT,
-                create_cert=action,
-                timestamp=timestamp)
-
-            payload_bytes = payload.SerializeToString()
-
-            list_inputs.append(inputs)
-            list_outputs.append(outputs)
-            list_payload_bytes.append(payload_bytes)
-
-        batch = _make_batch_multi_transactions(
-            list_payload_bytes=list_payload_bytes,
-            list_inputs=list_inputs,
-            list_outputs=list_outputs,
-            transaction_signer=transaction_signer,
-            batch_signer=batch_signer)
-        list_batches.append(batch)
-    return list_batches
+    list_inputs = []
+    list_outputs = []
+    list_payload_bytes = []
+    cert_addresses = addresser.get_record_addresses([cert.get('globalregisno') for cert in certs],
+                                                    [cert.get('studentPublicKey') for cert in certs],
+                                                    institution_public_key)
+    for cert, cert_address in zip(certs, cert_addresses):
+        cert_id = cert.get('globalregisno')
+        inputs = [manager_address, issuer_address, cert_address]
+
+        outputs = [cert_address]
+
+        action = payload_pb2.CreateCertAction(owner_public_key=cert.get('studentPublicKey'),
+                                              manager_public_key=institution_public_key,
+                                              issuer_public_key=issuer_public_key,
+                                              record_id=cert_id,
+                                              record_data=cert.get('cipher'),
+                                              record_hash=cert.get('hashData'))
+
+        payload = payload_pb2.B4EPayload(
+            action=payload_pb2.B4EPayload.CREATE_CERT,
+            create_cert=action,
+            timestamp=timestamp)
+
+        payload_bytes = payload.SerializeToString()
+
+        list_inputs.append(inputs)
+        list_outputs.append(outputs)
+        list_payload_bytes.append(payload_bytes)
+
+    return _make_packed_batches(list_payload_bytes, list_inputs, list_outputs, transaction_signer, batch_signer)
 
 
 def make_update_record(transaction_signer,
@@ -595,7 +568,7 @@ def make_update_record(transaction_signer,
                        record_hash,
                        active,
                        timestamp):
-    manager_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    manager_address = transaction_signer.actor_address
     record_address = addresser.get_record_address(record_id, owner_public_key, manager_public_key, )
 
     inputs = [manager_address, record_address]
@@ -631,7 +604,7 @@ def make_update_actor_info(transaction_signer,
                            email,
                            address,
                            timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -659,7 +632,7 @@ def make_reject_institution(transaction_signer,
                             batch_signer,
                             institution_public_key,
                             timestamp):
-    actor_address = addresser.get_actor_address(transaction_signer.get_public_key().as_hex())
+    actor_address = transaction_signer.actor_address
 
     inputs = [actor_address]
 
@@ -687,26 +660,16 @@ def _make_batch(payload_bytes,
                 outputs,
                 transaction_signer,
                 batch_signer):
-    transaction_header = transaction_pb2.TransactionHeader(
-        family_name=addresser.FAMILY_NAME,
-        family_version=addresser.FAMILY_VERSION,
-        inputs=inputs,
-        outputs=outputs,
-        signer_public_key=transaction_signer.get_public_key().as_hex(),
-        batcher_public_key=batch_signer.get_public_key().as_hex(),
-        dependencies=[],
-        payload_sha512=hashlib.sha512(payload_bytes).hexdigest())
-    transaction_header_bytes = transaction_header.SerializeToString()
+    template = signing.get_header_template(transaction_signer.public_key_hex, batch_signer.public_key_hex)
+    transaction_header_bytes = template.transaction_header(inputs, outputs,
+                                                           hashlib.sha512(payload_bytes).hexdigest())
 
     transaction = transaction_pb2.Transaction(
         header=transaction_header_bytes,
         header_signature=transaction_signer.sign(transaction_header_bytes),
         payload=payload_bytes)
 
-    batch_header = batch_pb2.BatchHeader(
-        signer_public_key=batch_signer.get_public_key().as_hex(),
-        transaction_ids=[transaction.header_signature])
-    batch_header_bytes = batch_header.SerializeToString()
+    batch_header_bytes = template.batch_header([transaction.header_signature])
 
     batch = batch_pb2.Batch(
         header=batch_header_bytes,
@@ -721,37 +684,64 @@ def _make_batch_multi_transactions(list_payload_bytes,
                                    list_outputs,
                                    transaction_signer,
                                    batch_signer):
-    list_transactions = []
-    list_transaction_ids = []
-    for i in range(len(list_inputs)):
-        transaction_header = transaction_pb2.TransactionHeader(
-            family_name=addresser.FAMILY_NAME,
-            family_version=addresser.FAMILY_VERSION,
-            inputs=list_inputs[i],
-            outputs=list_outputs[i],
-            signer_public_key=transaction_signer.get_public_key().as_hex(),
-            batcher_public_key=batch_signer.get_public_key().as_hex(),
-            dependencies=[],
-            payload_sha512=hashlib.sha512(list_payload_bytes[i]).hexdigest())
-
-        transaction_header_bytes = transaction_header.SerializeToString()
-
-        transaction = transaction_pb2.Transaction(
-            header=transaction_header_bytes,
-            header_signature=transaction_signer.sign(transaction_header_bytes),
-            payload=list_payload_bytes[i])
-        list_transactions.append(transaction)
-        list_transaction_ids.append(transaction.header_signature)
-
-    batch_header = batch_pb2.BatchHeader(
-        signer_public_key=batch_signer.get_public_key().as_hex(),
-        transaction_ids=list_transaction_ids)
-
-    batch_header_bytes = batch_header.SerializeToString()
-
-    batch = batch_pb2.Batch(
-        header=batch_header_bytes,
-        header_signature=batch_signer.sign(batch_header_bytes),
-        transactions=list_transactions)
-
-    return batch
+    return _make_batches_multi_transactions([(list_payload_bytes, list_inputs, list_outputs)],
+                                            transaction_signer,
+                                            batch_signer)[0]
+
+
+def _make_batches_multi_transactions(list_slices,
+                                     transaction_signer,
+                                     batch_signer):
+    """Returns one batch per (list_payload_bytes, list_inputs, list_outputs)
+    slice. The headers of every slice are signed together, so large requests
+    can be spread over the signing pool.
+    """
+    batcher_public_key = batch_signer.public_key_hex
+    template = signing.get_header_template(transaction_signer.public_key_hex, batcher_public_key)
+    rows = [(inputs, outputs, hashlib.sha512(payload_bytes).hexdigest())
+            for list_payload_bytes, list_inputs, list_outputs in list_slices
+            for payload_bytes, inputs, outputs in zip(list_payload_bytes, list_inputs, list_outputs)]
+    signed_headers = iter(signing.sign_transaction_headers(transaction_signer, batcher_public_key, rows))
+
+    list_transactions_per_batch = []
+    list_batch_header_bytes = []
+    for list_payload_bytes, _, _ in list_slices:
+        list_transactions = []
+        for payload_bytes in list_payload_bytes:
+            transaction_header_bytes, header_signature = next(signed_headers)
+            list_transactions.append(transaction_pb2.Transaction(
+                header=transaction_header_bytes,
+                header_signature=header_signature,
+                payload=payload_bytes))
+
+        list_transactions_per_batch.append(list_transactions)
+        list_batch_header_bytes.append(template.batch_header(
+            [transaction.header_signature for transaction in list_transactions]))
+
+    batch_signatures = signing.sign_messages(batch_signer, list_batch_header_bytes)
+    return [batch_pb2.Batch(header=batch_header_bytes,
+                            header_signature=header_signature,
+                            transactions=list_transactions)
+            for batch_header_bytes, header_signature, list_transactions
+            in zip(list_batch_header_bytes, batch_signatures, list_transactions_per_batch)]
+
+
+def _make_packed_batches(list_payload_bytes,
+                         list_inputs,
+                         list_outputs,
+                         transaction_signer,
+                         batch_signer):
+    """Makes one transaction per row and packs them into batches with
+    pack_rows. Returns the batches and, for every row, the (batch id,
+    transaction id) it ended up in.
+    """
+    ranges = pack_rows([transaction_size(payload_bytes, inputs, outputs)
+                        for payload_bytes, inputs, outputs
+                        in zip(list_payload_bytes, list_inputs, list_outputs)])
+    list_slices = [(list_payload_bytes[start:end], list_inputs[start:end], list_outputs[start:end])
+                   for start, end in ranges]
+    list_batches = _make_batches_multi_transactions(list_slices, transaction_signer, batch_signer)
+    row_map = [(batch.header_signature, transaction.header_signature)
+               for batch in list_batches
+               for transaction in batch.transactions]
+    return list_batches, row_map
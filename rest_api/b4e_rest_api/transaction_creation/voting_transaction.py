@@ -8,7 +8,7 @@ def make_create_vote(transaction_signer,
                      elector_public_key,
                      decision,
                      timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     environment_address = addresser.ENVIRONMENT_ADDRESS
     voting_address = addresser.get_voting_address(elector_public_key)
     issuer_vote_address = addresser.get_actor_address(issuer_public_key)
@@ -57,7 +57,7 @@ def make_create_voting(transaction_signer,
                        elector_public_key,
                        vote_type,
                        timestamp):
-    issuer_public_key = transaction_signer.get_public_key().as_hex()
+    issuer_public_key = transaction_signer.public_key_hex
     issuer_address = addresser.get_actor_address(issuer_public_key)
     elector_address = addresser.get_actor_address(elector_public_key)
     voting_address = addresser.get_voting_address(elector_public_key)
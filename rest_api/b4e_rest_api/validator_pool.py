@@ -0,0 +1,230 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import asyncio
+import collections
+import logging
+import time
+
+from sawtooth_rest_api.messaging import Connection
+from sawtooth_rest_api.messaging import DisconnectError
+from sawtooth_rest_api.messaging import SendBackoffTimeoutError
+from sawtooth_rest_api.protobuf import client_batch_submit_pb2
+from sawtooth_rest_api.protobuf import client_status_pb2
+from sawtooth_rest_api.protobuf import validator_pb2
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds between two health checks of every validator
+HEALTH_CHECK_INTERVAL = 5
+# seconds a validator has to answer a health check or a request
+REQUEST_TIMEOUT = 10
+HEALTH_CHECK_TIMEOUT = 2
+# seconds a validator that answered QUEUE_FULL is passed over
+BUSY_DELAY = 1
+# batches remembered for routing their status requests
+MAX_ROUTED_BATCHES = 100000
+
+SEND_ERRORS = (DisconnectError, SendBackoffTimeoutError, asyncio.TimeoutError)
+
+
+class ValidatorUnavailableError(Exception):
+    pass
+
+
+class ValidatorNode(object):
+    def __init__(self, url):
+        self.url = url
+        self.connection = Connection(url)
+        self.healthy = True
+        self.busy_until = 0
+        # requests being sent, and submitted batches not yet final
+        self.sending = 0
+        self.pending_batches = 0
+
+    @property
+    def outstanding(self):
+        return self.sending + self.pending_batches
+
+    async def send(self, message_type, content, timeout=REQUEST_TIMEOUT):
+        self.sending += 1
+        try:
+            return await asyncio.wait_for(
+                self.connection.send(message_type, content), timeout)
+        finally:
+            self.sending -= 1
+
+
+class ValidatorPool(object):
+    """Connections to one or more validators of the network.
+
+    Batches are submitted to the healthy validator with the fewest
+    outstanding requests, moving on to the next one if it fails or its
+    queue is full. Status requests of a batch go to the validator it was
+    submitted to. Every validator is health checked in the background, and
+    the one carrying the event subscription is replaced when it goes down.
+    """
+
+    def __init__(self, validator_urls):
+        self._nodes = [ValidatorNode(url) for url in validator_urls]
+        self._event_node = self._nodes[0]
+        # batch id -> node it was submitted to
+        self._batch_nodes = collections.OrderedDict()
+        self._failover_handlers = []
+        self._health_check = None
+
+    @property
+    def event_connection(self):
+        """Connection carrying the event subscription."""
+        return self._event_node.connection
+
+    def add_failover_handler(self, handler):
+        """Adds a coroutine function called after the event connection went
+        down, once it moved to another validator if one is healthy.
+        """
+        self._failover_handlers.append(handler)
+
+    def open(self):
+        for node in self._nodes:
+            node.connection.open()
+
+    def close(self):
+        if self._health_check is not None:
+            self._health_check.cancel()
+            self._health_check = None
+        for node in self._nodes:
+            node.connection.close()
+
+    def start_health_check(self):
+        if self._health_check is None:
+            self._health_check = asyncio.ensure_future(self._check_health())
+
+    async def submit_batch(self, batch):
+        """Submits one batch and returns the ClientBatchSubmitResponse. A
+        QUEUE_FULL response is only returned if every validator is full.
+        """
+        request = client_batch_submit_pb2.ClientBatchSubmitRequest(
+            batches=[batch]).SerializeToString()
+        response = None
+        for node in self._ranked_nodes():
+            try:
+                validator_response = await node.send(
+                    validator_pb2.Message.CLIENT_BATCH_SUBMIT_REQUEST, request)
+            except SEND_ERRORS as e:
+                self._mark_down(node, e)
+                continue
+
+            response = client_batch_submit_pb2.ClientBatchSubmitResponse()
+            response.ParseFromString(validator_response.content)
+            if response.status == client_batch_submit_pb2.ClientBatchSubmitResponse.QUEUE_FULL:
+                node.busy_until = time.monotonic() + BUSY_DELAY
+                continue
+            if response.status == client_batch_submit_pb2.ClientBatchSubmitResponse.OK:
+                self._route(batch.header_signature, node)
+            return response
+
+        if response is None:
+            raise ValidatorUnavailableError('No validator is reachable')
+        return response
+
+    async def batch_statuses(self, batch_ids):
+        """Returns the ClientBatchStatus of the batches, asking each
+        validator about the batches submitted to it.
+        """
+        by_node = collections.OrderedDict()
+        for batch_id in batch_ids:
+            node = self._batch_nodes.get(batch_id)
+            if node is None or not node.healthy:
+                node = self._ranked_nodes()[0]
+            by_node.setdefault(node, []).append(batch_id)
+
+        results = await asyncio.gather(
+            *[self._batch_statuses(node, ids) for node, ids in by_node.items()])
+        return [batch_status for statuses in results for batch_status in statuses]
+
+    def forget(self, batch_id):
+        """Stops routing a batch that reached a final status."""
+        node = self._batch_nodes.pop(batch_id, None)
+        if node is not None:
+            node.pending_batches -= 1
+
+    async def _batch_statuses(self, node, batch_ids):
+        request = client_batch_submit_pb2.ClientBatchStatusRequest(batch_ids=batch_ids)
+        try:
+            validator_response = await node.send(
+                validator_pb2.Message.CLIENT_BATCH_STATUS_REQUEST,
+                request.SerializeToString())
+        except SEND_ERRORS as e:
+            self._mark_down(node, e)
+            return []
+
+        response = client_batch_submit_pb2.ClientBatchStatusResponse()
+        response.ParseFromString(validator_response.content)
+        if response.status != client_batch_submit_pb2.ClientBatchStatusResponse.OK:
+            LOGGER.warning('Batch status request to %s failed with status %s', node.url,
+                           client_batch_submit_pb2.ClientBatchStatusResponse.Status.Name(response.status))
+            return []
+        return list(response.batch_statuses)
+
+    def _ranked_nodes(self):
+        """Nodes to try, healthy and not busy ones first, each group by
+        fewest outstanding requests.
+        """
+        now = time.monotonic()
+        return sorted(self._nodes,
+                      key=lambda node: (not node.healthy, node.busy_until > now, node.outstanding))
+
+    def _route(self, batch_id, node):
+        self.forget(batch_id)
+        self._batch_nodes[batch_id] = node
+        node.pending_batches += 1
+        while len(self._batch_nodes) > MAX_ROUTED_BATCHES:
+            self.forget(next(iter(self._batch_nodes)))
+
+    def _mark_down(self, node, error):
+        if not node.healthy:
+            return
+        LOGGER.warning('Validator %s is unavailable: %s', node.url, str(error) or type(error).__name__)
+        node.healthy = False
+        if node is self._event_node:
+            self._fail_over()
+
+    def _fail_over(self):
+        # the handlers are told even when no validator is left, the
+        # subscription is lost either way
+        candidates = [node for node in self._nodes if node.healthy]
+        if candidates:
+            self._event_node = candidates[0]
+            LOGGER.info('Receiving events from validator %s', self._event_node.url)
+        for handler in self._failover_handlers:
+            asyncio.ensure_future(handler())
+
+    async def _check_health(self):
+        request = client_status_pb2.ClientStatusGetRequest().SerializeToString()
+        while True:
+            for node in self._nodes:
+                try:
+                    await node.send(validator_pb2.Message.CLIENT_STATUS_GET_REQUEST, request,
+                                    timeout=HEALTH_CHECK_TIMEOUT)
+                except SEND_ERRORS as e:
+                    self._mark_down(node, e)
+                    continue
+                if not node.healthy:
+                    LOGGER.info('Validator %s is back', node.url)
+                    node.healthy = True
+                    # subscribe again, on this validator if events came from it
+                    if node is self._event_node or not self._event_node.healthy:
+                        self._fail_over()
+            await asyncio.sleep(HEALTH_CHECK_INTERVAL)
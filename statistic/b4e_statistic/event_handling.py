@@ -94,6 +94,9 @@ def _apply_state_changes(database, events, block_num, block_id):
             _apply_class_change(database, block_num, resources)
         elif data_type == AddressSpace.PORTFOLIO:
             _apply_portfolio_change(database, block_num, resources)
+        elif data_type == AddressSpace.RECORD_ARCHIVE:
+            # archived versions were already seen on the record itself
+            pass
         else:
             LOGGER.warning('Unsupported data type: %s', data_type)
 
@@ -85,6 +85,8 @@ def _apply_state_changes(database, events, block_num, block_id):
             _apply_actor_change(database, block_num, resources)
         elif data_type == AddressSpace.RECORD:
             _apply_record_change(database, block_num, resources)
+        elif data_type == AddressSpace.RECORD_ARCHIVE:
+            _apply_record_archive_change(database, block_num, resources)
         elif data_type == AddressSpace.VOTING:
             _apply_voting_change(database, block_num, resources)
         elif data_type == AddressSpace.ENVIRONMENT:
@@ -124,6 +126,12 @@ def _apply_record_change(database, block_num, records):
         database.insert_record(record)
 
 
+def _apply_record_archive_change(database, block_num, archives):
+    for archive in archives:
+        archive['block_num'] = block_num
+        database.insert_record_archive(archive)
+
+
 def _apply_voting_change(database, block_num, votings):
     for voting in votings:
         voting['block_num'] = block_num
@@ -148,6 +148,30 @@ class Database(object):
             print(e)
             return None
 
+    def insert_record_archive(self, archive_dict):
+        """Adds the archived versions missing from the stored record, for
+        records whose history started before this subscriber did.
+        """
+        try:
+            key = {'owner_public_key': archive_dict['owner_public_key'],
+                   'manager_public_key': archive_dict['manager_public_key'],
+                   'record_id': archive_dict['record_id']}
+            old_record = self.b4e_record_collection.find_one(key)
+            if not old_record:
+                return None
+            versions = old_record.get("versions")
+            known = set(version.get('transaction_id') for version in versions)
+            missing = [version for version in archive_dict['versions'] if version['transaction_id'] not in known]
+            if not missing:
+                return None
+            versions = sorted(missing + versions, key=lambda version: version.get('timestamp'))
+            data = {"$set": {"versions": versions}}
+            res = self.b4e_record_collection.update_one(key, data)
+            return res
+        except Exception as e:
+            print(e)
+            return None
+
     def insert_voting(self, voting_dict):
         try:
             key = {'elector_public_key': voting_dict['elector_public_key']}